@@ -0,0 +1,265 @@
+"""
+Headless benchmark of the pathfinding engine on the saved maps.
+Runs without pygame, e.g.:
+
+    python benchmark.py                          # every search, every map
+    python benchmark.py --maps sparse --search A*
+    python benchmark.py --maps sparse --tie-breaks
+    python benchmark.py --maps weighted --frontiers
+    python benchmark.py --layouts 4096 --search A*
+    python benchmark.py --maps sparse --sparse
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from array import array
+
+from src.pathfinder.main import PathFinder
+from src.pathfinder.models.arena import SearchArena
+from src.pathfinder.models.grid import BaseGrid, Grid
+from src.pathfinder.models.morton_grid import MortonGrid
+from src.pathfinder.models.sparse_grid import SparseGrid
+from src.pathfinder.models.search_types import (
+    FrontierKind, Search, TieBreak, TraceLevel)
+
+MAPS_DIR = "maps"
+
+# Wall density and seed of the synthetic maps of the layout benchmark
+WALL_DENSITY = 0.25
+SEED = 1
+
+
+def load_grids(
+    prefix: str = "",
+    layout: type[Grid] | type[SparseGrid] = Grid
+) -> list[tuple[str, BaseGrid]]:
+    """Load every saved map whose name starts with a prefix
+
+    Args:
+        prefix (str, optional): Map name prefix (e.g. a category).
+        Defaults to "".
+        layout (type[Grid] | type[SparseGrid], optional): Grid class to
+        load the maps as. Defaults to Grid.
+
+    Returns:
+        list[tuple[str, BaseGrid]]: (map name, grid) pairs
+    """
+    grids: list[tuple[str, BaseGrid]] = []
+    for filename in sorted(os.listdir(MAPS_DIR)):
+        if not filename.endswith(".json") or not filename.startswith(prefix):
+            continue
+
+        with open(os.path.join(MAPS_DIR, filename)) as f:
+            grids.append((filename[:-5], layout.from_map_data(json.load(f))))
+
+    return grids
+
+
+def run(grid: BaseGrid, search: Search, repeat: int, **options) -> dict:
+    """Run a search several times on one grid
+
+    Args:
+        grid (BaseGrid): Grid to search
+        search (Search): Search algorithm
+        repeat (int): Number of runs, the median time is reported
+        **options: Options for PathFinder.find_path
+
+    Returns:
+        dict: Explored, pushed and popped cells, peak frontier size,
+        path cost and median time of the runs
+    """
+    arena = SearchArena.prepare(grid)
+    solutions = [
+        PathFinder.find_path(
+            grid, search, arena=arena, trace=TraceLevel.COUNTS, **options)
+        for _ in range(repeat)
+    ]
+    solution = solutions[-1]
+    times = [found.time for found in solutions]
+
+    return {
+        "explored": solution.explored_length,
+        "pushed": solution.pushed,
+        "popped": solution.popped,
+        "peak": solution.peak_frontier,
+        "path_cost": solution.path_cost if solution.path_length else None,
+        "time": statistics.median(times),
+    }
+
+
+def print_row(*columns) -> None:
+    widths = (30, 36, 10, 10, 10, 10, 10)
+    print("".join(str(col).ljust(width)
+                  for col, width in zip(columns, widths)))
+
+
+def benchmark_searches(grids, searches, repeat, specialised) -> None:
+    """Print explored and pushed cells, path cost and time for every
+    search and map"""
+    print_row("map", "search", "explored", "pushed", "cost", "time(ms)")
+    for name, grid in grids:
+        for search in searches:
+            result = run(grid, search, repeat, specialised=specialised)
+            print_row(name, search.name, result["explored"],
+                      result["pushed"], result["path_cost"],
+                      f"{result['time']:.2f}")
+
+
+def benchmark_tie_breaks(grids, repeat) -> None:
+    """Compare A* tie-breaking policies against the cell index order"""
+    print_row("map", "tie-break", "explored", "cost", "time(ms)", "saved")
+    totals = dict.fromkeys(TieBreak, 0)
+
+    for name, grid in grids:
+        results = {
+            tie_break: run(grid, Search.ASTAR_SEARCH, repeat,
+                           tie_break=tie_break)
+            for tie_break in TieBreak
+        }
+        baseline = results[TieBreak.INDEX]["explored"]
+
+        for tie_break, result in results.items():
+            totals[tie_break] += result["explored"]
+            saved = 1 - result["explored"] / baseline if baseline else 0
+            print_row(name, tie_break.value, result["explored"],
+                      result["path_cost"], f"{result['time']:.2f}",
+                      f"{saved:.0%}")
+
+    print()
+    print_row("TOTAL", "tie-break", "explored", "", "", "saved")
+    for tie_break, total in totals.items():
+        saved = 1 - total / totals[TieBreak.INDEX] \
+            if totals[TieBreak.INDEX] else 0
+        print_row("", tie_break.value, total, "", "", f"{saved:.0%}")
+
+
+def benchmark_frontiers(grids, searches, repeat) -> None:
+    """Compare the priority queues of the frontier against the binary
+    heap"""
+    print_row("map", "search / frontier", "explored", "popped", "peak",
+              "time(ms)", "speedup")
+
+    # Greedy Best First Search has no monotone priorities, so it only
+    # runs on the heaps
+    heaps = (FrontierKind.BINARY_HEAP, FrontierKind.INDEXED_HEAP)
+
+    for name, grid in grids:
+        for search in searches:
+            kinds = heaps if search is Search.GREEDY_BEST_FIRST_SEARCH \
+                else tuple(FrontierKind)
+            results = {
+                kind: run(grid, search, repeat, frontier_kind=kind)
+                for kind in kinds
+            }
+            baseline = results[FrontierKind.BINARY_HEAP]["time"]
+
+            for kind, result in results.items():
+                speedup = baseline / result["time"] if result["time"] else 0
+                print_row(name, f"{search.value} / {kind.value}",
+                          result["explored"], result["popped"],
+                          result["peak"], f"{result['time']:.2f}",
+                          f"{speedup:.2f}x")
+
+
+def random_costs(size: int) -> array:
+    """Generate the costs of a square map with random walls
+
+    Args:
+        size (int): Side of the map
+
+    Returns:
+        array: Row-major costs, start and goal in opposite corners
+    """
+    rng = random.Random(SEED)
+    threshold = int(256 * WALL_DENSITY)
+
+    # Random bytes below the threshold become walls (-1), the rest cost 1
+    table = bytes(0xFF if byte < threshold else 1 for byte in range(256))
+    costs = array("b", rng.randbytes(size * size).translate(table))
+
+    # Keep the corners open
+    for index in (0, 1, size, size * size - 1, size * size - 2,
+                  size * size - 1 - size):
+        costs[index] = 1
+    costs[0] = 0
+
+    return costs
+
+
+def benchmark_layouts(size, searches, repeat) -> None:
+    """Compare row-major and Z-order grids on a synthetic square map"""
+    costs = random_costs(size)
+    start, end = (0, 0), (size - 1, size - 1)
+
+    print_row("layout", "search", "explored", "cost", "time(ms)")
+    for layout in (Grid, MortonGrid):
+        build_time = time.perf_counter()
+        grid = layout(size, size, array("b", costs), start, end)
+        build_time = (time.perf_counter() - build_time) * 1000
+        print_row(layout.__name__, "(build)", "", "", f"{build_time:.2f}")
+
+        for search in searches:
+            result = run(grid, search, repeat)
+            print_row(layout.__name__, search.name, result["explored"],
+                      result["path_cost"], f"{result['time']:.2f}")
+
+
+def main() -> None:
+    summary = (__doc__ or "").strip().split("\n")[0]
+    parser = argparse.ArgumentParser(description=summary)
+    parser.add_argument("--maps", default="",
+                        help="only maps whose name starts with this prefix")
+    parser.add_argument("--search", action="append",
+                        choices=[search.value for search in Search],
+                        help="search to run (repeatable, default: all)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="runs per measurement")
+    parser.add_argument("--specialised", action="store_true",
+                        help="use grid-specialised search kernels")
+    parser.add_argument("--tie-breaks", action="store_true",
+                        help="compare A* tie-breaking policies")
+    parser.add_argument("--frontiers", action="store_true",
+                        help="compare the priority queues of A* and"
+                        " Dijkstra's Search")
+    parser.add_argument("--layouts", type=int, nargs="?", const=4096,
+                        metavar="SIZE",
+                        help="compare row-major and Z-order grids on a"
+                        " random SIZE x SIZE map (default: 4096)")
+    parser.add_argument("--sparse", action="store_true",
+                        help="load the maps as sparse obstacle-set grids")
+    args = parser.parse_args()
+
+    if args.layouts:
+        searches = [Search(value) for value in args.search] \
+            if args.search else [Search.ASTAR_SEARCH,
+                                 Search.DIJKSTRAS_SEARCH,
+                                 Search.BREADTH_FIRST_SEARCH]
+        benchmark_layouts(args.layouts, searches, args.repeat)
+        return
+
+    grids = load_grids(args.maps, SparseGrid if args.sparse else Grid)
+    if not grids:
+        print(f"No maps matching '{args.maps}' in {MAPS_DIR}/")
+        return
+
+    if args.tie_breaks:
+        benchmark_tie_breaks(grids, args.repeat)
+        return
+
+    if args.frontiers:
+        searches = [Search(value) for value in args.search] \
+            if args.search else [Search.ASTAR_SEARCH, Search.DIJKSTRAS_SEARCH]
+        benchmark_frontiers(grids, searches, args.repeat)
+        return
+
+    searches = [Search(value) for value in args.search] \
+        if args.search else list(Search)
+    benchmark_searches(grids, searches, args.repeat, args.specialised)
+
+
+if __name__ == "__main__":
+    main()
@@ -62,6 +62,9 @@ MAZE_HEIGHT = HEIGHT - HEADER_HEIGHT - REMAINDER_H
 FPS = 60
 CLOCK = pygame.time.Clock()
 
+# Search expansions run per frame while solving step by step
+EXPANSIONS_PER_FRAME = 64
+
 # Images and fonts
 WEIGHT = pygame.image.load("assets/images/weight.png")
 START = pygame.image.load("assets/images/triangle.png")
@@ -9,6 +9,7 @@ from .state import State
 from .generate import MazeGenerator
 from .animations import Animation, Animator, AnimatingNode
 from .maze import GOAL, START, Maze, WEIGHT
+from .pathfinder.models.solution import Solution
 
 from .widgets import (
     Alignment,
@@ -138,6 +139,105 @@ algo_menu = Menu(
             foreground_color=pygame.Color(*WHITE),
             font_size=20, outline=False
         ),
+        Button(
+            surface=WINDOW,
+            text="Bitboard BFS",
+            x=algorithm_btn.rect.x - 40,
+            y=algorithm_btn.rect.y + algorithm_btn.height * 5,
+            background_color=pygame.Color(*DARK_BLUE),
+            foreground_color=pygame.Color(*WHITE),
+            font_size=20, outline=False
+        ),
+        Button(
+            surface=WINDOW,
+            text="Bucketed Dijkstra's",
+            x=algorithm_btn.rect.x - 40,
+            y=algorithm_btn.rect.y + algorithm_btn.height * 6,
+            background_color=pygame.Color(*DARK_BLUE),
+            foreground_color=pygame.Color(*WHITE),
+            font_size=20, outline=False
+        ),
+        Button(
+            surface=WINDOW,
+            text="Bidirectional A*",
+            x=algorithm_btn.rect.x - 40,
+            y=algorithm_btn.rect.y + algorithm_btn.height * 7,
+            background_color=pygame.Color(*DARK_BLUE),
+            foreground_color=pygame.Color(*WHITE),
+            font_size=20, outline=False
+        ),
+        Button(
+            surface=WINDOW,
+            text="Bidirectional Dijkstra's",
+            x=algorithm_btn.rect.x - 40,
+            y=algorithm_btn.rect.y + algorithm_btn.height * 8,
+            background_color=pygame.Color(*DARK_BLUE),
+            foreground_color=pygame.Color(*WHITE),
+            font_size=20, outline=False
+        ),
+        Button(
+            surface=WINDOW,
+            text="Bidirectional BFS",
+            x=algorithm_btn.rect.x - 40,
+            y=algorithm_btn.rect.y + algorithm_btn.height * 9,
+            background_color=pygame.Color(*DARK_BLUE),
+            foreground_color=pygame.Color(*WHITE),
+            font_size=20, outline=False
+        ),
+        Button(
+            surface=WINDOW,
+            text="Jump Point Search",
+            x=algorithm_btn.rect.x - 40,
+            y=algorithm_btn.rect.y + algorithm_btn.height * 10,
+            background_color=pygame.Color(*DARK_BLUE),
+            foreground_color=pygame.Color(*WHITE),
+            font_size=20, outline=False
+        ),
+        Button(
+            surface=WINDOW,
+            text="JPS+",
+            x=algorithm_btn.rect.x - 40,
+            y=algorithm_btn.rect.y + algorithm_btn.height * 11,
+            background_color=pygame.Color(*DARK_BLUE),
+            foreground_color=pygame.Color(*WHITE),
+            font_size=20, outline=False
+        ),
+        Button(
+            surface=WINDOW,
+            text="Fringe Search",
+            x=algorithm_btn.rect.x - 40,
+            y=algorithm_btn.rect.y + algorithm_btn.height * 12,
+            background_color=pygame.Color(*DARK_BLUE),
+            foreground_color=pygame.Color(*WHITE),
+            font_size=20, outline=False
+        ),
+        Button(
+            surface=WINDOW,
+            text="IDA*",
+            x=algorithm_btn.rect.x - 40,
+            y=algorithm_btn.rect.y + algorithm_btn.height * 13,
+            background_color=pygame.Color(*DARK_BLUE),
+            foreground_color=pygame.Color(*WHITE),
+            font_size=20, outline=False
+        ),
+        Button(
+            surface=WINDOW,
+            text="SMA*",
+            x=algorithm_btn.rect.x - 40,
+            y=algorithm_btn.rect.y + algorithm_btn.height * 14,
+            background_color=pygame.Color(*DARK_BLUE),
+            foreground_color=pygame.Color(*WHITE),
+            font_size=20, outline=False
+        ),
+        Button(
+            surface=WINDOW,
+            text="Partial Expansion A*",
+            x=algorithm_btn.rect.x - 40,
+            y=algorithm_btn.rect.y + algorithm_btn.height * 15,
+            background_color=pygame.Color(*DARK_BLUE),
+            foreground_color=pygame.Color(*WHITE),
+            font_size=20, outline=False
+        ),
     ]
 )
 
@@ -656,6 +756,10 @@ def main() -> None:
 
                     cell_under_mouse = (row, col)
 
+        # Advance a running search by one batch of expansions
+        if maze.solving:
+            maze.advance_solving()
+
         # Animate nodes
         if animator.nodes_to_animate and state.need_update:
             animator.animating = True
@@ -1032,9 +1136,8 @@ def run_single(idx: int) -> None:
     """
     maze.clear_visited()
     text = algo_menu.children[idx].text
-    solution = maze.solve(text)
 
-    def callback():
+    def callback(solution: Solution):
         state.done_visualising = True
         path_cost = solution.path_cost if solution.path_cost else max(solution.path_length - 1, 0)
         path_found = "Yes" if solution.path_length > 0 else "No"
@@ -1055,7 +1158,7 @@ def run_single(idx: int) -> None:
         save_run_result(text, solution, map_name)
         save_screenshot(text, map_name)
 
-    maze.visualize(solution=solution, after_animation=callback)
+    maze.start_solving(text, after_animation=callback)
 
     state.label = Label(
         f"Running {text}", "center", 0,
@@ -1145,7 +1248,23 @@ def run_all(
     text = algo_menu.children[algo_idx].text
     display_map = current_map.replace(".json", "")
 
-    def callback():
+    def callback(solution: Solution):
+        summary = {
+            "explored_length": solution.explored_length,
+            "path_length": solution.path_length,
+            "path_cost": solution.path_cost or solution.path_length,
+            "time": solution.time,
+        }
+
+        if text not in state.results:
+            state.results[text] = summary
+        else:
+            results = state.results[text]
+            results["explored_length"] += summary["explored_length"]
+            results["path_length"] += summary["path_length"]
+            results["path_cost"] += summary["path_cost"]
+            results["time"] += summary["time"]
+
         map_name = getattr(maze, "current_map_name", None)
         path_cost = solution.path_cost if solution.path_cost else max(solution.path_length - 1, 0)
         path_found = "Yes" if solution.path_length > 0 else "No"
@@ -1169,24 +1288,7 @@ def run_all(
         else:
             run_all(0, map_idx + 1, saved_maps)
 
-    solution = maze.solve(text)
-
-    summary = {
-        "explored_length": solution.explored_length,
-        "path_length": solution.path_length,
-        "path_cost": solution.path_cost if solution.path_cost else solution.path_length,
-        "time": solution.time,
-    }
-
-    if text not in state.results:
-        state.results[text] = summary
-    else:
-        state.results[text]["explored_length"] += summary["explored_length"]
-        state.results[text]["path_length"] += summary["path_length"]
-        state.results[text]["path_cost"] += summary["path_cost"]
-        state.results[text]["time"] += summary["time"]
-
-    maze.visualize(solution=solution, after_animation=callback)
+    maze.start_solving(text, after_animation=callback)
 
     state.label = Label(
         f"Running {text} on {display_map}", "center", 0,
@@ -1340,7 +1442,7 @@ def show_results(results: list[tuple[str, dict[str, float]]]) -> None:
             Table(
                 x=0,
                 y=0,
-                rows=6,
+                rows=len(results) + 1,
                 columns=5,
                 padding=20,
                 color=DARK,
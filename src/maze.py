@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Callable, Generator, Iterable, Optional
 import pygame
 import json
 import os
@@ -8,13 +8,16 @@ from datetime import datetime
 from .generate import GenerationCallback, MazeGenerator
 from .animations import AnimatingNode, Animation, AnimationCallback, Animator
 from .pathfinder.models.node import Node
-from .pathfinder.models.solution import Solution
+from .pathfinder.models.solution import CellView, Solution
 from .pathfinder.main import PathFinder
+from .pathfinder.models.arena import SearchArena
 from .pathfinder.models.grid import Grid
-from .pathfinder.models.search_types import Search
+from .pathfinder.models.search_types import Search, TraceLevel
+from .pathfinder.search.jps_plus import JumpPointPlusSearch
 
 from .constants import (
     DARK_BLUE_2,
+    EXPANSIONS_PER_FRAME,
     GOAL,
     HEIGHT,
     MIN_SIZE,
@@ -79,6 +82,16 @@ class Maze:
         self.maze[self.goal[0]][self.goal[1]].value = "B"
         self.maze[self.goal[0]][self.goal[1]].cost = 1
 
+        # Array-backed grid for the PathFinder, built on first solve, and
+        # the search state reused by every query on it
+        self.grid: Grid | None = None
+        self.arena: SearchArena | None = None
+
+        # Search started by start_solving, advanced once per frame
+        self.search_stream: Generator[CellView, None, Solution] | None = None
+        self.after_solving: Optional[Callable[[Solution], None]] = None
+        self.last_explored: AnimatingNode | None = None
+
         # Generate screen coordinates for maze
         self.coords = self._generate_coordinates()
 
@@ -177,6 +190,10 @@ class Maze:
         self.maze[pos[0]][pos[1]].cost = cost
         self.maze[pos[0]][pos[1]].color = color
 
+        # Keep the PathFinder grid in sync
+        if self.grid:
+            self.grid.set_cost(pos, cost)
+
     def set_speed(self, speed_str: str) -> None:
         """Set visualisation speed
 
@@ -194,6 +211,8 @@ class Maze:
         self.maze = [[MazeNode("1", (rowIdx, colIdx), 1)
                       for colIdx in range(self.width)]
                      for rowIdx in range(self.height)]
+        self.grid = None
+        self.search_stream = None
 
         self.set_cell(self.start, "A", forced=True)
         self.set_cell(self.goal, "B", forced=True)
@@ -201,17 +220,12 @@ class Maze:
     def clear_visited(self) -> None:
         """Clear visited nodes
         """
-        for rowIdx in range(self.height):
-            for colIdx in range(self.width):
-                node = self.maze[rowIdx][colIdx]
-                self.maze[rowIdx][colIdx] = MazeNode(
-                    str(node.cost) if node.value in ("V", "*") else node.value,
-                    (rowIdx, colIdx),
-                    node.cost
-                )
-
-                self.set_cell((rowIdx, colIdx),
-                              self.maze[rowIdx][colIdx].value)
+        # Searches keep their state outside the maze, so only the cells
+        # painted by the last visualisation need to be reset
+        for row in self.maze:
+            for node in row:
+                if node.value in ("V", "*"):
+                    self.set_cell(node.state, str(node.cost))
 
         self.set_cell(self.start, "A", forced=True)
         self.set_cell(self.goal, "B", forced=True)
@@ -370,6 +384,82 @@ class Maze:
         Args:
             algo_name (str): Name of algorithm
         """
+        search = self._prepare_search(algo_name)
+
+        # Solve the maze
+        solution = PathFinder.find_path(
+            grid=self.grid,  # type: ignore
+            search=search,
+            arena=self.arena,
+            trace=TraceLevel.FULL,
+        )
+
+        return solution
+
+    def start_solving(
+        self,
+        algo_name: str,
+        after_animation: Optional[Callable[[Solution], None]] = None,
+    ) -> None:
+        """Start solving the maze step by step, see advance_solving
+
+        Args:
+            algo_name (str): Name of algorithm
+            after_animation (Optional[Callable[[Solution], None]], optional):
+            Called with the solution after its animation. Defaults to None.
+        """
+        search = self._prepare_search(algo_name)
+
+        self.search_stream = PathFinder.stream(
+            grid=self.grid,  # type: ignore
+            search=search,
+            arena=self.arena,
+            batch_size=EXPANSIONS_PER_FRAME,
+        )
+        self.after_solving = after_animation
+        self.last_explored = None
+
+    @property
+    def solving(self) -> bool:
+        """Whether a search started by start_solving is still running"""
+        return self.search_stream is not None
+
+    def advance_solving(self) -> Solution | None:
+        """Run the next batch of expansions of the running search and
+        animate them
+
+        Returns:
+            Solution | None: Solution once the search is done
+        """
+        if self.search_stream is None:
+            return None
+
+        try:
+            self.visualize_explored(next(self.search_stream))
+            return None
+        except StopIteration as stop:
+            solution: Solution = stop.value
+
+        self.search_stream = None
+        after_solving = self.after_solving
+
+        def after_animation() -> None:
+            if after_solving:
+                after_solving(solution)
+
+        self.visualize_path(solution, after_animation=after_animation)
+
+        return solution
+
+    def _prepare_search(self, algo_name: str) -> Search:
+        """Bring the PathFinder grid up to date for a search
+
+        Args:
+            algo_name (str): Name of algorithm
+
+        Returns:
+            Search: Search algorithm
+        """
         # String -> Search Algorithm
         mapper: dict[str, Search] = {
             "A* Search": Search.ASTAR_SEARCH,
@@ -377,18 +467,30 @@ class Maze:
             "Greedy Best First Search": Search.GREEDY_BEST_FIRST_SEARCH,
             "Breadth First Search": Search.BREADTH_FIRST_SEARCH,
             "Depth First Search": Search.DEPTH_FIRST_SEARCH,
+            "Bitboard BFS": Search.BITBOARD_BREADTH_FIRST_SEARCH,
+            "Bucketed Dijkstra's": Search.BUCKETED_DIJKSTRAS_SEARCH,
+            "Bidirectional A*": Search.BIDIRECTIONAL_ASTAR_SEARCH,
+            "Bidirectional Dijkstra's":
+                Search.BIDIRECTIONAL_DIJKSTRAS_SEARCH,
+            "Bidirectional BFS": Search.BIDIRECTIONAL_BREADTH_FIRST_SEARCH,
+            "Jump Point Search": Search.JUMP_POINT_SEARCH,
+            "JPS+": Search.JUMP_POINT_PLUS_SEARCH,
+            "Fringe Search": Search.FRINGE_SEARCH,
+            "IDA*": Search.ITERATIVE_DEEPENING_ASTAR_SEARCH,
+            "SMA*": Search.SIMPLIFIED_MEMORY_BOUNDED_ASTAR_SEARCH,
+            "Partial Expansion A*": Search.PARTIAL_EXPANSION_ASTAR_SEARCH,
         }
 
-        # Instantiate Grid for PathFinder
-        grid = Grid(self.maze, self.start, self.goal)  # type: ignore
+        # Instantiate Grid for PathFinder once, set_cell keeps it updated
+        if not self.grid:
+            self.grid = Grid.from_nodes(
+                self.maze, self.start, self.goal)
+            self.arena = SearchArena(self.grid.size)
 
-        # Solve the maze
-        solution = PathFinder.find_path(
-            grid=grid,
-            search=mapper[algo_name.strip()],
-        )
+        self.grid.start = self.start
+        self.grid.end = self.goal
 
-        return solution
+        return mapper[algo_name.strip()]
 
     def visualize(
         self,
@@ -401,10 +503,19 @@ class Maze:
             solution (Solution): Solution object
             after_animation (Optional[AnimationCallback], optional): Called after animation. Defaults to None.
         """
+        self.visualize_explored(solution.explored)
+        self.visualize_path(solution, after_animation)
+
+    def visualize_explored(self, cells: Iterable[tuple[int, int]]) -> None:
+        """Animate explored cells after the ones already animating
+
+        Args:
+            cells (Iterable[tuple[int, int]]): Explored cells in order
+        """
 
         # Animate solution nodes
         nodes = []
-        for cell in solution.explored:
+        for cell in cells:
             x, y = self.coords[cell[0]][cell[1]]
             nodes.append(
                 AnimatingNode(
@@ -419,6 +530,9 @@ class Maze:
                 )
             )
 
+        if not nodes:
+            return
+
         match self.speed:
             case "Fast":
                 gap = 5
@@ -430,9 +544,30 @@ class Maze:
                 gap = 5
 
         self.animator.add_nodes_to_animate(nodes, gap=gap)
+        self.last_explored = nodes[-1]
 
+    def visualize_path(
+        self,
+        solution: Solution,
+        after_animation: Optional[AnimationCallback] = None,
+    ) -> None:
+        """Animate the path of a solution after the explored cells
+
+        Args:
+            solution (Solution): Solution object
+            after_animation (Optional[AnimationCallback], optional): Called
+            after animation. Defaults to None.
+        """
         if not solution.path:
-            nodes[-1].after_animation = after_animation
+            node = self.last_explored
+
+            # Nothing left to wait for
+            if node is None or node.progress >= node.duration:
+                if after_animation:
+                    after_animation()
+                return
+
+            node.after_animation = after_animation
             return
 
         # Color the shortest path in yellowd
@@ -450,13 +585,11 @@ class Maze:
                 )
             )
 
-        match gap:
-            case 5:
-                gap = 30
-            case 30:
-                gap = 50
-            case 1000:
+        match self.speed:
+            case "Medium" | "Slow":
                 gap = 50
+            case _:
+                gap = 30
 
         self.animator.add_nodes_to_animate(nodes, delay=600, gap=gap)
         nodes[-1].after_animation = after_animation
@@ -611,6 +744,12 @@ class Maze:
                 value = cell_data["value"]
                 self.set_cell((row, col), value)
 
+            # Build the grid of the map now, with the jump tables of JPS+
+            # that every query reuses until a wall is edited
+            self.grid = Grid.from_nodes(self.maze, self.start, self.goal)
+            self.arena = SearchArena(self.grid.size)
+            JumpPointPlusSearch.jump_tables(self.grid)
+
             self.current_map_name = os.path.splitext(os.path.basename(filepath))[0]
             return True
 
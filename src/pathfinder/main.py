@@ -1,17 +1,36 @@
 import time
-from typing import Callable
+from functools import partial
+from typing import Any, Callable, Generator
 
 from .search.astar import AStarSearch
 from .search.gbfs import GreedyBestFirstSearch
 from .search.bfs import BreadthFirstSearch
+from .search.bidirectional import (
+    BidirectionalAStarSearch,
+    BidirectionalBreadthFirstSearch,
+    BidirectionalDijkstrasSearch,
+)
+from .search.bitboard_bfs import BitboardBreadthFirstSearch
+from .search.bucketed_dijkstras import BucketedDijkstrasSearch
 from .search.dfs import DepthFirstSearch
 from .search.dijkstras import DijkstrasSearch
-from .models.grid import Grid
-from .models.solution import Solution
-from .models.search_types import Search
-from .models.search_types import Search
+from .search.fringe import FringeSearch
+from .search.jps import JumpPointSearch
+from .search.jps_plus import JumpPointPlusSearch
+from .search.kernels import GridKernels
+from .search.memory_bounded import (
+    IterativeDeepeningAStarSearch,
+    PartialExpansionAStarSearch,
+    SimplifiedMemoryBoundedAStarSearch,
+)
+from .models.arena import SearchArena
+from .models.budget import SearchBudget
+from .models.grid import BaseGrid
+from .models.solution import CellView, Solution, SolutionStream
+from .models.search_types import Search, TraceLevel
 
-SearchFunction = Callable[[Grid], Solution]
+SearchFunction = Callable[..., Solution]
+StreamFunction = Callable[..., SolutionStream]
 
 SEARCH: dict[Search, SearchFunction] = {
     Search.ASTAR_SEARCH: AStarSearch.search,
@@ -19,18 +38,145 @@ SEARCH: dict[Search, SearchFunction] = {
     Search.BREADTH_FIRST_SEARCH: BreadthFirstSearch.search,
     Search.GREEDY_BEST_FIRST_SEARCH: GreedyBestFirstSearch.search,
     Search.DEPTH_FIRST_SEARCH: DepthFirstSearch.search,
+    Search.BITBOARD_BREADTH_FIRST_SEARCH: BitboardBreadthFirstSearch.search,
+    Search.BUCKETED_DIJKSTRAS_SEARCH: BucketedDijkstrasSearch.search,
+    Search.BIDIRECTIONAL_ASTAR_SEARCH: BidirectionalAStarSearch.search,
+    Search.BIDIRECTIONAL_DIJKSTRAS_SEARCH:
+        BidirectionalDijkstrasSearch.search,
+    Search.BIDIRECTIONAL_BREADTH_FIRST_SEARCH:
+        BidirectionalBreadthFirstSearch.search,
+    Search.JUMP_POINT_SEARCH: JumpPointSearch.search,
+    Search.JUMP_POINT_PLUS_SEARCH: JumpPointPlusSearch.search,
+    Search.FRINGE_SEARCH: FringeSearch.search,
+    Search.ITERATIVE_DEEPENING_ASTAR_SEARCH:
+        IterativeDeepeningAStarSearch.search,
+    Search.SIMPLIFIED_MEMORY_BOUNDED_ASTAR_SEARCH:
+        SimplifiedMemoryBoundedAStarSearch.search,
+    Search.PARTIAL_EXPANSION_ASTAR_SEARCH: PartialExpansionAStarSearch.search,
+}
+
+STREAM: dict[Search, StreamFunction] = {
+    Search.ASTAR_SEARCH: AStarSearch.stream,
+    Search.DIJKSTRAS_SEARCH: DijkstrasSearch.stream,
+    Search.BREADTH_FIRST_SEARCH: BreadthFirstSearch.stream,
+    Search.GREEDY_BEST_FIRST_SEARCH: GreedyBestFirstSearch.stream,
+    Search.DEPTH_FIRST_SEARCH: DepthFirstSearch.stream,
+    Search.BITBOARD_BREADTH_FIRST_SEARCH: BitboardBreadthFirstSearch.stream,
+    Search.BUCKETED_DIJKSTRAS_SEARCH: BucketedDijkstrasSearch.stream,
+    Search.BIDIRECTIONAL_ASTAR_SEARCH: BidirectionalAStarSearch.stream,
+    Search.BIDIRECTIONAL_DIJKSTRAS_SEARCH:
+        BidirectionalDijkstrasSearch.stream,
+    Search.BIDIRECTIONAL_BREADTH_FIRST_SEARCH:
+        BidirectionalBreadthFirstSearch.stream,
+    Search.JUMP_POINT_SEARCH: JumpPointSearch.stream,
+    Search.JUMP_POINT_PLUS_SEARCH: JumpPointPlusSearch.stream,
+    Search.FRINGE_SEARCH: FringeSearch.stream,
+    Search.ITERATIVE_DEEPENING_ASTAR_SEARCH:
+        IterativeDeepeningAStarSearch.stream,
+    Search.SIMPLIFIED_MEMORY_BOUNDED_ASTAR_SEARCH:
+        SimplifiedMemoryBoundedAStarSearch.stream,
+    Search.PARTIAL_EXPANSION_ASTAR_SEARCH: PartialExpansionAStarSearch.stream,
 }
 
 
 class PathFinder:
     @staticmethod
     def find_path(
-        grid: Grid,
+        grid: BaseGrid,
         search: Search,
+        arena: SearchArena | None = None,
+        specialised: bool = False,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        **options: Any,
     ) -> Solution:
+        """Find a path between the start and end of a grid
+
+        Args:
+            grid (BaseGrid): Grid to search
+            search (Search): Search algorithm
+            arena (SearchArena | None, optional): Search state to reuse for
+            consecutive queries on the same grid. Defaults to None.
+            specialised (bool, optional): Run a search kernel generated for
+            the grid's shape when one is available. Defaults to False.
+            trace (TraceLevel, optional): What to record of the explored
+            cells, only a full trace keeps their order for visualisation.
+            Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Deadline, expansion and
+            frontier limits. A search reaching one returns BudgetExceeded.
+            Defaults to None.
+            **options: Search specific options, e.g. `tie_break` for A*
+
+        Returns:
+            Solution: Solution found
+        """
+        if specialised and not options and budget is None \
+                and GridKernels.supports(grid, search):
+            function = partial(GridKernels.get(grid, search, trace), grid)
+        else:
+            function = partial(
+                SEARCH[search], grid, trace=trace, budget=budget, **options)
+
         start_time = time.perf_counter()
-        solution = SEARCH[search](grid)
+        solution = function(arena)
         time_taken = (time.perf_counter() - start_time) * 1000
         solution.time = time_taken
 
         return solution
+
+    @staticmethod
+    def stream(
+        grid: BaseGrid,
+        search: Search,
+        arena: SearchArena | None = None,
+        batch_size: int = 64,
+        **options: Any,
+    ) -> Generator[CellView, None, Solution]:
+        """Find a path step by step, yielding the explored cells as the
+        search goes
+
+        The grid and arena must not change until the stream is exhausted.
+
+        Args:
+            grid (BaseGrid): Grid to search
+            search (Search): Search algorithm
+            arena (SearchArena | None, optional): Search state to reuse for
+            consecutive queries on the same grid. Defaults to None.
+            batch_size (int, optional): Expansions per yielded batch.
+            Defaults to 64.
+            **options: Search specific options, e.g. `tie_break` for A*, or
+            a `budget`
+
+        Yields:
+            CellView: Positions expanded since the previous batch
+
+        Returns:
+            Solution: Solution found, timed without the caller's work
+            between batches
+        """
+        steps = STREAM[search](
+            grid, arena, trace=TraceLevel.FULL, batch_size=batch_size,
+            **options)
+        time_taken = 0.0
+        streamed = 0
+
+        while True:
+            start_time = time.perf_counter()
+            try:
+                batch = next(steps)
+            except StopIteration as stop:
+                solution: Solution = stop.value
+                break
+            finally:
+                time_taken += time.perf_counter() - start_time
+
+            streamed += len(batch)
+            yield CellView(batch, grid.pos)
+
+        solution.time = time_taken * 1000
+
+        # Expansions after the last full batch
+        if streamed < solution.explored_length:
+            yield CellView(solution.explored.cells[streamed:], grid.pos)
+
+        return solution
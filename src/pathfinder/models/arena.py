@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from array import array
+
+from .grid import BaseGrid
+
+# Generations are stored as unsigned 32-bit stamps
+MAX_GENERATION = 2 ** 32 - 1
+
+
+class SearchArena:
+    """Preallocated per-cell search state, reusable across queries
+
+    Every query bumps the generation counter instead of clearing the
+    arrays. A g-score or parent is only meaningful for cells whose `seen`
+    stamp equals the current generation, and a cell is closed when its
+    `closed` stamp does, so resetting is O(1).
+
+    An arena must not be shared by queries running at the same time.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.generation = 0
+
+        self.g = array("q", bytes(8 * size))
+        self.parents = bytearray(size)
+        self.seen = array("I", bytes(4 * size))
+        self.closed = array("I", bytes(4 * size))
+
+        # Second arena of searches growing two trees, see `pair`
+        self.partner: SearchArena | None = None
+
+    @staticmethod
+    def prepare(
+        grid: BaseGrid,
+        arena: SearchArena | None = None
+    ) -> SearchArena:
+        """Get an arena for a query on a grid
+
+        Args:
+            grid (BaseGrid): Grid to search
+            arena (SearchArena | None, optional): Arena to reuse. A new one
+            is allocated when not provided. Defaults to None.
+
+        Raises:
+            ValueError: The arena was built for a different grid size
+
+        Returns:
+            SearchArena: Arena for the query
+        """
+        if arena is None:
+            return SparseArena(grid.size) if grid.sparse \
+                else SearchArena(grid.size)
+
+        if arena.size != grid.size:
+            raise ValueError(
+                f"Arena for {arena.size} cells used on a grid of {grid.size}")
+
+        return arena
+
+    def pair(self) -> SearchArena:
+        """Get the arena of the second tree of a bidirectional search
+
+        It is allocated on first use and kept, so reusing this arena for
+        consecutive queries reuses both.
+
+        Returns:
+            SearchArena: Arena of the same kind and size
+        """
+        if self.partner is None:
+            self.partner = type(self)(self.size)
+
+        return self.partner
+
+    def reset(self) -> int:
+        """Start a new query
+
+        Returns:
+            int: Generation stamp of the new query
+        """
+        self.generation += 1
+
+        # Stamps are about to wrap around, clear them once
+        if self.generation > MAX_GENERATION:
+            self.seen = array("I", bytes(4 * self.size))
+            self.closed = array("I", bytes(4 * self.size))
+            self.generation = 1
+
+        return self.generation
+
+    def __repr__(self) -> str:
+        return f"SearchArena({self.size}, generation={self.generation})"
+
+
+class Stamps(dict):
+    """Per-cell values defaulting to 0 for cells never written"""
+
+    def __missing__(self, key: int) -> int:
+        return 0
+
+
+class SparseArena(SearchArena):
+    """Search state for grids too large to allocate per-cell arrays
+
+    Only the cells a query touches are stored. Reading a cell it did not
+    write gives 0, like the zeroed arrays of a SearchArena, and the
+    dictionaries are emptied between queries so memory follows the size
+    of the last search rather than the grid.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.generation = 0
+
+        self.g = Stamps()
+        self.parents = Stamps()
+        self.seen = Stamps()
+        self.closed = Stamps()
+
+        self.partner: SearchArena | None = None
+
+    def reset(self) -> int:
+        """Start a new query
+
+        Returns:
+            int: Generation stamp of the new query
+        """
+        self.generation += 1
+
+        for values in (self.g, self.parents, self.seen, self.closed):
+            values.clear()
+
+        return self.generation
+
+    def __repr__(self) -> str:
+        return f"SparseArena({self.size}, generation={self.generation})"
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import time
+
+from .search_types import BudgetLimit
+
+
+class SearchBudget:
+    """Resource limits of a single query
+
+    Searches check the budget every `interval` expansions, so a query can
+    run up to `interval` expansions past its deadline or frontier limit,
+    or a whole level or bucket for the searches expanding them at once.
+    The expansion limit is exact, those stop partway through a level.
+    """
+
+    def __init__(
+        self,
+        deadline: float | None = None,
+        max_expansions: int | None = None,
+        max_frontier: int | None = None,
+        interval: int = 256
+    ) -> None:
+        # `time.perf_counter()` value to stop at
+        self.deadline = deadline
+
+        # Most cells to expand and frontier entries to hold
+        self.max_expansions = max_expansions
+        self.max_frontier = max_frontier
+
+        # Expansions between checks
+        self.interval = interval
+
+    @staticmethod
+    def within(
+        milliseconds: float,
+        max_expansions: int | None = None,
+        max_frontier: int | None = None
+    ) -> SearchBudget:
+        """Create a budget with a deadline relative to now
+
+        Args:
+            milliseconds (float): Time from now until the deadline
+            max_expansions (int | None, optional): Number of cells to expand
+            at most. Defaults to None.
+            max_frontier (int | None, optional): Number of frontier entries
+            to hold at most. Defaults to None.
+
+        Returns:
+            SearchBudget: Budget
+        """
+        return SearchBudget(
+            time.perf_counter() + milliseconds / 1000,
+            max_expansions,
+            max_frontier
+        )
+
+    def next_check(self, expanded: int) -> int:
+        """Number of expansions at which to check the budget next
+
+        Args:
+            expanded (int): Number of cells expanded so far
+
+        Returns:
+            int: Expansion count of the next check
+        """
+        check = expanded + self.interval
+        if self.max_expansions is not None:
+            check = min(check, max(self.max_expansions, expanded + 1))
+
+        return check
+
+    def exceeded(
+        self,
+        expanded: int,
+        frontier_size: int
+    ) -> BudgetLimit | None:
+        """Check whether a search has used up its budget
+
+        Args:
+            expanded (int): Number of cells expanded so far
+            frontier_size (int): Number of entries in the frontier
+
+        Returns:
+            BudgetLimit | None: Limit reached, None if within budget
+        """
+        if self.max_expansions is not None \
+                and expanded >= self.max_expansions:
+            return BudgetLimit.EXPANSIONS
+
+        if self.max_frontier is not None \
+                and frontier_size > self.max_frontier:
+            return BudgetLimit.FRONTIER
+
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            return BudgetLimit.TIME
+
+        return None
+
+    def __repr__(self) -> str:
+        return (f"SearchBudget({self.deadline}, {self.max_expansions},"
+                f" {self.max_frontier})")
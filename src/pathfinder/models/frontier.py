@@ -1,32 +1,66 @@
-from heapq import heappush, heappop
+from array import array
+from collections import deque
+from heapq import heapify, heappush, heappop
 
-from .node import Node
+from .search_types import FrontierKind
+
+# Widest span of priorities kept in buckets by FrontierKind.AUTO, wider
+# spans leave too many empty buckets to step over
+MAX_BUCKET_SPAN = 16
 
 
 class Frontier:
-    """Model a frontier for managing nodes"""
+    """Model a frontier for managing cells (by grid index)
+
+    Membership is tracked next to the container, in a bitmap when the
+    number of cells is known and in a set otherwise, so `contains_state`
+    is O(1). A cell is expected to be in the frontier at most once.
+
+    Cells are held in a deque, popped from the right by StackFrontier and
+    from the left by QueueFrontier. The priority frontiers have no
+    membership index and are not Frontiers, see PriorityQueueFrontier.
+    """
 
-    def __init__(self) -> None:
-        self.frontier: list[Node] = []
+    def __init__(self, size: int | None = None) -> None:
+        self.frontier: deque[int] = deque()
+        self.members: bytearray | set[int] = \
+            bytearray(size) if size is not None else set()
 
-    def add(self, node: Node) -> None:
-        """Add a new node to the frontier
+    def add(self, node: int) -> None:
+        """Add a new cell to the frontier
 
         Args:
-            node (Node): Maze node
+            node (int): Cell index
         """
         self.frontier.append(node)
 
-    def contains_state(self, state: tuple[int, int]) -> bool:
-        """Check if a state exists in the frontier
+        if isinstance(self.members, bytearray):
+            self.members[node] = 1
+        else:
+            self.members.add(node)
+
+    def discard(self, node: int) -> None:
+        """Drop a cell from the membership index
+
+        Args:
+            node (int): Cell index
+        """
+        if isinstance(self.members, bytearray):
+            self.members[node] = 0
+        else:
+            self.members.discard(node)
+
+    def contains_state(self, state: int) -> bool:
+        """Check if a cell exists in the frontier
 
         Args:
-            state (tuple[int, int]): Postion of a node
+            state (int): Cell index
 
         Returns:
-            bool: Whether the provided state exists
+            bool: Whether the provided cell exists
         """
-        return any(node.state == state for node in self.frontier)
+        return state in self.members if isinstance(self.members, set) \
+            else self.members[state] == 1
 
     def is_empty(self) -> bool:
         """Check if the frontier is empty
@@ -36,6 +70,9 @@ class Frontier:
         """
         return len(self.frontier) == 0
 
+    def __len__(self) -> int:
+        return len(self.frontier)
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}()"
 
@@ -44,70 +81,483 @@ class Frontier:
 
 
 class StackFrontier(Frontier):
-    def remove(self) -> Node:
+    def remove(self) -> int:
         """Remove element from the stack
 
         Raises:
             Exception: Empty Frontier
 
         Returns:
-            Node: Cell (Node) in a matrix
+            int: Cell index
         """
         if self.is_empty():
             raise Exception("Empty Frontier")
-        else:
-            return self.frontier.pop()
+
+        node = self.frontier.pop()
+        self.discard(node)
+
+        return node
 
 
 class QueueFrontier(Frontier):
-    def remove(self) -> Node:
+    def remove(self) -> int:
         """Remove element from the queue
 
         Raises:
             Exception: Empty Frontier
 
         Returns:
-            Node: Cell (Node) in a matrix
+            int: Cell index
         """
         if self.is_empty():
             raise Exception("Empty Frontier")
-        else:
-            return self.frontier.pop(0)
+
+        node = self.frontier.popleft()
+        self.discard(node)
+
+        return node
 
 
-class PriorityQueueFrontier(Frontier):
-    def __init__(self):
-        self.frontier: list[tuple[int, Node]] = []
+class PriorityQueueFrontier:
+    """Binary heap of cells keyed by (priority, tie, cell index)
 
-    def add(self, node: Node, priority: int = 0) -> None:
-        """Add a new node into the frontier
+    The three fields are packed into a single int, so heap comparisons
+    never leave C and pushing does not allocate a tuple.
+
+    Cells are not indexed: a cell is pushed again when its priority
+    improves and searches skip the stale entries by their own state. An
+    index kept in sync with every push and pop slowed A* and Dijkstra's
+    by a fifth for lookups no search makes, so there is no
+    `contains_state` or `get`. IndexedHeapFrontier has both.
+    """
+
+    def __init__(self, size: int, tie_bits: int = 0) -> None:
+        self.frontier: list[int] = []
+
+        # Bit layout of a key: priority | tie | cell index
+        self.index_bits = max(size - 1, 1).bit_length()
+        self.index_mask = (1 << self.index_bits) - 1
+        self.tie_bits = tie_bits
+
+        # Cells popped, stale copies included, and most cells queued at
+        # once. Cells are only added between pops, so the size is checked
+        # by pop
+        self.pops = 0
+        self.peak = 0
+
+    def add(self, node: int, priority: int = 0, tie: int = 0) -> None:
+        """Add a new cell into the frontier
 
         Args:
-            node (AStarNode): Maze node
-            priority (int, optional): Node priority. Defaults to 0.
+            node (int): Cell index
+            priority (int, optional): Cell priority, must not be negative.
+            Defaults to 0.
+            tie (int, optional): Secondary priority for equal priorities,
+            must fit in `tie_bits`. Defaults to 0.
+        """
+        heappush(
+            self.frontier,
+            ((priority << self.tie_bits | tie) << self.index_bits) | node
+        )
+
+    def peek(self) -> int:
+        """Get the lowest priority in the frontier
+
+        Returns:
+            int: Priority of the first cell to pop
+        """
+        return self.frontier[0] >> (self.index_bits + self.tie_bits)
+
+    def pop(self) -> int:
+        """Remove a cell from the frontier
+
+        Returns:
+            int: Cell index with the lowest priority
+        """
+        if len(self.frontier) > self.peak:
+            self.peak = len(self.frontier)
+        key = heappop(self.frontier)
+        self.pops += 1
+
+        return key & self.index_mask
+
+    def is_empty(self) -> bool:
+        """Check if the frontier is empty
+
+        Returns:
+            bool: Whether the frontier is empty
         """
-        heappush(self.frontier, (priority, node))
+        return not self.frontier
+
+    def __len__(self) -> int:
+        return len(self.frontier)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} => {self.frontier}"
+
 
-    def get(self, state: tuple[int, int]) -> Node | None:
-        """Get node by state. Create new if not found
+class BucketQueueFrontier(PriorityQueueFrontier):
+    """Circular bucket queue (Dial's algorithm) for monotone priorities
+
+    Priorities added must lie between the lowest priority queued, or the
+    last popped, and that plus `span`: true of Dijkstra's Search when no
+    move costs more than `span`, and of A* with a consistent heuristic
+    when no move costs more than `span - 1`. Then `span + 1` buckets
+    indexed by priority modulo their number hold every queued cell, and
+    popping steps over at most `span` empty buckets.
+
+    The cells of a bucket are in a heap of packed (tie, cell index) keys,
+    so cells pop in the same order as from a PriorityQueueFrontier.
+    """
+
+    def __init__(self, size: int, span: int, tie_bits: int = 0) -> None:
+        super().__init__(size, tie_bits)
+        self.buckets: list[list[int]] = [[] for _ in range(span + 1)]
+
+        # Priority of the bucket the next cell pops from. Pops only raise
+        # it, cells added once the frontier ran empty may lower it
+        self.current = 0
+        self.count = 0
+
+    def add(self, node: int, priority: int = 0, tie: int = 0) -> None:
+        """Add a new cell into the frontier
 
         Args:
-            state (tuple[int, int]): State
+            node (int): Cell index
+            priority (int, optional): Cell priority, within `span` of the
+            lowest queued priority. Defaults to 0.
+            tie (int, optional): Secondary priority for equal priorities,
+            must fit in `tie_bits`. Defaults to 0.
+        """
+        if not self.count or priority < self.current:
+            self.current = priority
+        self.count += 1
+
+        heappush(self.buckets[priority % len(self.buckets)],
+                 tie << self.index_bits | node)
+
+    def _first(self) -> list[int]:
+        """Step to the first non-empty bucket
+
+        Raises:
+            IndexError: Empty frontier
 
         Returns:
-            Node: Required node
+            list[int]: Heap of the bucket
         """
-        for _, node in self.frontier:
-            if node.state == state:
-                return node
+        if not self.count:
+            raise IndexError("pop from an empty frontier")
+
+        buckets, current = self.buckets, self.current
+        while not buckets[current % len(buckets)]:
+            current += 1
 
-        return None
+        self.current = current
+        return buckets[current % len(buckets)]
 
-    def pop(self) -> Node:
-        """Remove a node from the frontier
+    def peek(self) -> int:
+        """Get the lowest priority in the frontier
 
         Returns:
-            AStarNode: Node to be removed
+            int: Priority of the first cell to pop
         """
-        _, node = heappop(self.frontier)
-        return node
+        self._first()
+        return self.current
+
+    def pop(self) -> int:
+        """Remove a cell from the frontier
+
+        Returns:
+            int: Cell index with the lowest priority
+        """
+        # Most pops find a cell in the current bucket
+        bucket = self.buckets[self.current % len(self.buckets)]
+        if not bucket:
+            bucket = self._first()
+
+        self.pops += 1
+        if self.count > self.peak:
+            self.peak = self.count
+        self.count -= 1
+
+        return heappop(bucket) & self.index_mask
+
+    def is_empty(self) -> bool:
+        """Check if the frontier is empty
+
+        Returns:
+            bool: Whether the frontier is empty
+        """
+        return not self.count
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class RadixHeapFrontier(PriorityQueueFrontier):
+    """Radix heap for monotone integer priorities
+
+    Priorities added must not be lower than the last popped one, `last`.
+    Cells are kept in buckets by the highest bit where their priority
+    differs from `last`. When bucket 0, the cells at `last`, runs out,
+    the next non-empty bucket is spread over the lower ones around its
+    lowest priority. Each cell moves down at most once per bit of the
+    priorities, whatever their range.
+
+    Bucket 0 is a heap of packed (tie, cell index) keys, so cells pop in
+    the same order as from a PriorityQueueFrontier.
+    """
+
+    def __init__(self, size: int, tie_bits: int = 0) -> None:
+        super().__init__(size, tie_bits)
+        self.buckets: list[list[int]] = [[]]
+
+        # Offset of the priority in the packed keys of buckets 1 and up
+        self.shift = self.index_bits + tie_bits
+        self.last = 0
+        self.count = 0
+
+    def add(self, node: int, priority: int = 0, tie: int = 0) -> None:
+        """Add a new cell into the frontier
+
+        Args:
+            node (int): Cell index
+            priority (int, optional): Cell priority, not lower than the
+            last popped. Defaults to 0.
+            tie (int, optional): Secondary priority for equal priorities,
+            must fit in `tie_bits`. Defaults to 0.
+        """
+        self.count += 1
+
+        bucket = (priority ^ self.last).bit_length()
+        if not bucket:
+            heappush(self.buckets[0], tie << self.index_bits | node)
+            return
+
+        buckets = self.buckets
+        while len(buckets) <= bucket:
+            buckets.append([])
+        buckets[bucket].append(
+            ((priority << self.tie_bits | tie) << self.index_bits) | node)
+
+    def _first(self) -> list[int]:
+        """Refill bucket 0 from the next non-empty bucket if needed
+
+        Raises:
+            IndexError: Empty frontier
+
+        Returns:
+            list[int]: Heap of bucket 0
+        """
+        buckets = self.buckets
+        if buckets[0]:
+            return buckets[0]
+        if not self.count:
+            raise IndexError("pop from an empty frontier")
+
+        bucket = 1
+        while not buckets[bucket]:
+            bucket += 1
+        keys, buckets[bucket] = buckets[bucket], []
+
+        shift = self.shift
+        last = self.last = min(keys) >> shift
+        low = (1 << shift) - 1
+        first = buckets[0]
+        for key in keys:
+            bucket = (key >> shift ^ last).bit_length()
+            if bucket:
+                buckets[bucket].append(key)
+            else:
+                first.append(key & low)
+
+        heapify(first)
+        return first
+
+    def peek(self) -> int:
+        """Get the lowest priority in the frontier
+
+        Returns:
+            int: Priority of the first cell to pop
+        """
+        self._first()
+        return self.last
+
+    def pop(self) -> int:
+        """Remove a cell from the frontier
+
+        Returns:
+            int: Cell index with the lowest priority
+        """
+        bucket = self.buckets[0] or self._first()
+
+        self.pops += 1
+        if self.count > self.peak:
+            self.peak = self.count
+        self.count -= 1
+
+        return heappop(bucket) & self.index_mask
+
+    def is_empty(self) -> bool:
+        """Check if the frontier is empty
+
+        Returns:
+            bool: Whether the frontier is empty
+        """
+        return not self.count
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class IndexedHeapFrontier(PriorityQueueFrontier):
+    """4-ary heap of cells with decrease-key
+
+    `where` holds the heap slot of every queued cell, -1 for the others.
+    Adding a queued cell again with a lower key moves its entry up in
+    place instead of pushing a copy, so the heap holds each cell once,
+    no stale entry is ever popped, and `get` and `contains_state` are
+    O(1). Four children per entry make the heap half as deep as a binary
+    one, which shortens the moves up of decrease-key and push.
+
+    Keys are packed like those of PriorityQueueFrontier, and a cell only
+    keeps its lowest key, so cells pop in the same order as the first,
+    non-stale, pops of a PriorityQueueFrontier.
+    """
+
+    def __init__(self, size: int, tie_bits: int = 0) -> None:
+        super().__init__(size, tie_bits)
+        self.where = array("i" if size < 1 << 31 else "q", [-1]) * size
+
+    def add(self, node: int, priority: int = 0, tie: int = 0) -> None:
+        """Add a new cell into the frontier, or lower the key of a queued
+        cell
+
+        Args:
+            node (int): Cell index
+            priority (int, optional): Cell priority, must not be negative.
+            Defaults to 0.
+            tie (int, optional): Secondary priority for equal priorities,
+            must fit in `tie_bits`. Defaults to 0.
+        """
+        heap, where, mask = self.frontier, self.where, self.index_mask
+        key = ((priority << self.tie_bits | tie) << self.index_bits) | node
+
+        slot = where[node]
+        if slot < 0:
+            slot = len(heap)
+            heap.append(key)
+        elif key >= heap[slot]:
+            return
+
+        # Move the parents of a lower key down until its slot is found
+        while slot:
+            parent = (slot - 1) >> 2
+            above = heap[parent]
+            if above <= key:
+                break
+            heap[slot] = above
+            where[above & mask] = slot
+            slot = parent
+
+        heap[slot] = key
+        where[node] = slot
+
+    def contains_state(self, state: int) -> bool:
+        """Check if a cell exists in the frontier
+
+        Args:
+            state (int): Cell index
+
+        Returns:
+            bool: Whether the provided cell exists
+        """
+        return self.where[state] >= 0
+
+    def get(self, state: int) -> int | None:
+        """Get the priority of a cell in the frontier
+
+        Args:
+            state (int): Cell index
+
+        Returns:
+            int | None: Priority of the cell, None if not found
+        """
+        slot = self.where[state]
+        if slot < 0:
+            return None
+
+        return self.frontier[slot] >> (self.index_bits + self.tie_bits)
+
+    def pop(self) -> int:
+        """Remove a cell from the frontier
+
+        Returns:
+            int: Cell index with the lowest priority
+        """
+        heap, where, mask = self.frontier, self.where, self.index_mask
+
+        top = heap[0]
+        self.pops += 1
+        if len(heap) > self.peak:
+            self.peak = len(heap)
+
+        where[top & mask] = -1
+        last = heap.pop()
+        if not heap:
+            return top & mask
+
+        # Move the lowest children up until the last entry fits
+        size = len(heap)
+        slot = 0
+        child = 1
+        while child < size:
+            lowest = min(heap[child:child + 4])
+            if lowest >= last:
+                break
+            child = heap.index(lowest, child, child + 4)
+            heap[slot] = lowest
+            where[lowest & mask] = slot
+            slot = child
+            child = 4 * slot + 1
+
+        heap[slot] = last
+        where[last & mask] = slot
+
+        return top & mask
+
+
+def priority_frontier(
+    kind: FrontierKind,
+    size: int,
+    span: int,
+    tie_bits: int = 0
+) -> PriorityQueueFrontier:
+    """Build a priority frontier of any kind
+
+    Args:
+        kind (FrontierKind): Priority queue to use
+        size (int): Number of cells of the grid
+        span (int): Largest increase of priority from a cell to the
+        cells it adds, see BucketQueueFrontier
+        tie_bits (int, optional): Width of the tie field. Defaults to 0.
+
+    Returns:
+        PriorityQueueFrontier: Empty frontier
+    """
+    if kind is FrontierKind.AUTO:
+        kind = FrontierKind.BUCKET_QUEUE if span <= MAX_BUCKET_SPAN \
+            else FrontierKind.RADIX_HEAP
+
+    match kind:
+        case FrontierKind.BUCKET_QUEUE:
+            return BucketQueueFrontier(size, span, tie_bits)
+        case FrontierKind.RADIX_HEAP:
+            return RadixHeapFrontier(size, tie_bits)
+        case FrontierKind.INDEXED_HEAP:
+            return IndexedHeapFrontier(size, tie_bits)
+        case _:
+            return PriorityQueueFrontier(size, tie_bits)
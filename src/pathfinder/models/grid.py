@@ -1,31 +1,127 @@
+from abc import ABC, abstractmethod
+from array import array
+from typing import TYPE_CHECKING, Generic, Protocol, Sequence, TypeVar
+
 from src.pathfinder.models.node import Node
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+# Movement directions, each one is a bit in a cell's move mask
+UP, DOWN, LEFT, RIGHT = range(4)
+ACTIONS = ("up", "down", "left", "right")
+
+# Byte translation tables (signed cost byte -> wall flag, flag -> inverse)
+_WALL_TABLE = bytes(int(byte >= 0x80) for byte in range(256))
+_NOT_TABLE = bytes(int(byte == 0) for byte in range(256))
+
+
+class CostStore(Protocol):
+    """Cell costs by row-major index, -1 for walls"""
+
+    def __getitem__(self, index: int, /) -> int: ...
+
+    def __setitem__(self, index: int, cost: int, /) -> None: ...
+
+
+Costs = TypeVar("Costs", bound=CostStore)
+
+
+class BaseGrid(ABC, Generic[Costs]):
+    """Model a grid of cells indexed row-major, whatever stores their
+    costs
+
+    Cell (row, col) has index ``row * width + col``. This is all the
+    searches need: positions, costs and the moves out of a cell. Grid
+    keeps every cell in flat arrays, the other grids only store some.
+    """
+
+    # Whether per-cell search state should be kept in dicts rather than
+    # arrays sized for every cell, see SearchArena.prepare
+    sparse = False
+
+    # Cost of entering each cell, -1 for walls
+    costs: Costs
 
-class Grid:
     def __init__(
         self,
-        grid: list[list[Node]],
+        width: int,
+        height: int,
         start: tuple[int, int],
         end: tuple[int, int]
     ) -> None:
-        self.grid: list[list[Node]] = grid
+        self.width = width
+        self.height = height
+        self.size = width * height
         self.start = start
         self.end = end
 
-        # Calculate grid dimensions
-        self.width = max(len(row) for row in grid)
-        self.height = len(grid)
+        # (direction, index delta) pairs for every possible move mask
+        self.deltas = (-width, width, -1, 1)
+        self.steps: tuple[tuple[tuple[int, int], ...], ...] = tuple(
+            tuple((d, self.deltas[d]) for d in range(4) if mask >> d & 1)
+            for mask in range(16)
+        )
+
+    @property
+    @abstractmethod
+    def max_cost(self) -> int:
+        """Highest cost of entering a cell"""
+
+    @abstractmethod
+    def set_cost(self, pos: tuple[int, int], cost: int) -> None:
+        """Update the weight of a cell
+
+        Args:
+            pos (tuple[int, int]): Cell position
+            cost (int): New weight, -1 for walls
+        """
+
+    @property
+    def index_typecode(self) -> str:
+        """Array typecode able to hold every cell index"""
+        return "I" if self.size <= 1 << 32 else "Q"
+
+    def index(self, pos: tuple[int, int]) -> int:
+        """Get the array index of a cell
+
+        Args:
+            pos (tuple[int, int]): Cell position
+
+        Returns:
+            int: Index into the backing arrays
+        """
+        return pos[0] * self.width + pos[1]
+
+    def pos(self, index: int) -> tuple[int, int]:
+        """Get the position of a cell from its array index
+
+        Args:
+            index (int): Index into the backing arrays
+
+        Returns:
+            tuple[int, int]: Cell position
+        """
+        return divmod(index, self.width)
 
     def get_node(self, pos: tuple[int, int]) -> Node:
         """Get node by position
 
+        Nodes are not stored by the grid, a new one is created on every call.
+
         Args:
             pos (tuple[int, int]): Cell position
 
         Returns:
-            int: Weight
+            Node: Node for the cell
         """
-        return self.grid[pos[0]][pos[1]]
+        cost = self.costs[self.index(pos)]
+        return Node("#" if cost < 0 else str(cost), pos, cost)
 
     def get_cost(self, pos: tuple[int, int]) -> int:
         """Get weight of a node
@@ -36,7 +132,53 @@ class Grid:
         Returns:
             int: Weight
         """
-        return self.grid[pos[0]][pos[1]].cost
+        return self.costs[self.index(pos)]
+
+    def neighbours(self, index: int) -> tuple[tuple[int, int], ...]:
+        """Get the possible moves out of a cell, looking its neighbours'
+        costs up
+
+        Args:
+            index (int): Cell index
+
+        Returns:
+            tuple[tuple[int, int], ...]: (direction, index delta) pairs
+        """
+        width, costs = self.width, self.costs
+        row, col = divmod(index, width)
+
+        mask = 0
+        if row > 0 and costs[index - width] >= 0:
+            mask |= 1 << UP
+        if row < self.height - 1 and costs[index + width] >= 0:
+            mask |= 1 << DOWN
+        if col > 0 and costs[index - 1] >= 0:
+            mask |= 1 << LEFT
+        if col < width - 1 and costs[index + 1] >= 0:
+            mask |= 1 << RIGHT
+
+        return self.steps[mask]
+
+    def trace_path(self, parents: bytearray, index: int) -> list[int]:
+        """Follow parent directions back from a cell to the search root
+
+        Args:
+            parents (bytearray): Direction (plus one) used to enter each
+            cell, 0 for the root
+            index (int): Last cell of the path
+
+        Returns:
+            list[int]: Cell indices from the root to ``index``
+        """
+        deltas = self.deltas
+        path = [index]
+
+        while parents[index]:
+            index -= deltas[parents[index] - 1]
+            path.append(index)
+
+        path.reverse()
+        return path
 
     def get_neighbours(
         self,
@@ -51,33 +193,246 @@ class Grid:
             dict[str, tuple[int, int]]: Action - Position Mapper
         """
 
-        row, col = pos
+        idx = self.index(pos)
 
-        # Map actions with resulting cell positions
-        action_pos_mapper = {
-            "up": (row - 1, col),
-            "down": (row + 1, col),
-            "left": (row, col - 1),
-            "right": (row, col + 1),
-            # "upleft": (row - 1, col - 1),
-            # "upright": (row - 1, col + 1),
-            # "downleft": (row + 1, col - 1),
-            # "downright": (row + 1, col + 1),
+        return {
+            ACTIONS[direction]: self.pos(idx + delta)
+            for direction, delta in self.neighbours(idx)
         }
 
-        # Determine possilbe actions
-        possible_actions = {}
 
-        for action, (r, c) in action_pos_mapper.items():
-            if not (0 <= r < self.height and 0 <= c < self.width):
-                continue
+class Grid(BaseGrid[array]):
+    """Model a grid of cells backed by flat arrays
+
+    Cells are stored row-major, i.e. cell (row, col) lives at index
+    ``row * width + col`` of the backing arrays.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        costs: array,
+        start: tuple[int, int],
+        end: tuple[int, int]
+    ) -> None:
+        super().__init__(width, height, start, end)
+
+        # Cost of entering each cell (-1 for walls) and a wall bitmap
+        self.costs = costs
+        self.walls = bytearray(costs.tobytes().translate(_WALL_TABLE))
+
+        # Number of open cells of every cost, kept up to date by set_cost
+        # so searches need not scan the costs, see `weighted`/`max_cost`
+        data = costs.tobytes()
+        self.cost_counts = [0] * 128
+        for cost in set(data):
+            if cost < 0x80:
+                self.cost_counts[cost] = data.count(cost)
+
+        # Per-cell bitmask of passable moves
+        self.moves = self._build_moves()
 
-            if self.grid[r][c].value == "#":
-                continue
+        # Jump distances of JumpPointPlusSearch, built on first use and
+        # dropped whenever a wall changes
+        self.jump_tables: tuple[array, array, array, array] | None = None
+
+    def _build_moves(self) -> bytearray:
+        """Compute the move mask of every cell
+
+        Returns:
+            bytearray: Move masks
+        """
+        width, size = self.width, self.size
+        passable = self.walls.translate(_NOT_TABLE)
+
+        # Passability of the neighbour in each direction, per cell
+        empty = bytes(width)
+        up = empty + passable[:size - width]
+        down = passable[width:] + empty
+
+        left = bytearray(1) + passable[:-1]
+        left[::width] = bytes(self.height)
+        right = passable[1:] + bytearray(1)
+        right[width - 1::width] = bytes(self.height)
+
+        # Every byte is 0 or 1, so the bitmasks can be combined without
+        # carries using big integer arithmetic
+        masks = (
+            int.from_bytes(up, "little") << UP
+            | int.from_bytes(down, "little") << DOWN
+            | int.from_bytes(left, "little") << LEFT
+            | int.from_bytes(right, "little") << RIGHT
+        )
+
+        return bytearray(masks.to_bytes(size, "little"))
+
+    def _update_moves(self, index: int) -> None:
+        """Recompute the move mask of a single cell
+
+        Args:
+            index (int): Cell index
+        """
+        width, walls = self.width, self.walls
+        row, col = divmod(index, width)
+
+        mask = 0
+        if row > 0 and not walls[index - width]:
+            mask |= 1 << UP
+        if row < self.height - 1 and not walls[index + width]:
+            mask |= 1 << DOWN
+        if col > 0 and not walls[index - 1]:
+            mask |= 1 << LEFT
+        if col < width - 1 and not walls[index + 1]:
+            mask |= 1 << RIGHT
+
+        self.moves[index] = mask
+
+    @classmethod
+    def from_nodes(
+        cls,
+        grid: Sequence[Sequence[Node]],
+        start: tuple[int, int],
+        end: tuple[int, int]
+    ) -> "Grid":
+        """Build a grid from a matrix of nodes (e.g. ``Maze.maze``)
+
+        Args:
+            grid (Sequence[Sequence[Node]]): Node matrix
+            start (tuple[int, int]): Start position
+            end (tuple[int, int]): Goal position
+
+        Returns:
+            Grid: Array-backed grid
+        """
+        width = max(len(row) for row in grid)
+        height = len(grid)
+
+        # Missing cells of ragged rows are treated as walls
+        costs = array("b", [-1]) * (width * height)
+        for rowIdx, row in enumerate(grid):
+            offset = rowIdx * width
+            for colIdx, node in enumerate(row):
+                costs[offset + colIdx] = -1 if node.value == "#" else node.cost
+
+        return cls(width, height, costs, start, end)
+
+    @classmethod
+    def from_map_data(cls, map_data: dict) -> "Grid":
+        """Build a grid from saved map data (see ``Maze.save_map``)
+
+        Args:
+            map_data (dict): Parsed map JSON
+
+        Returns:
+            Grid: Array-backed grid
+        """
+        width, height = map_data["width"], map_data["height"]
+        start, end = tuple(map_data["start"]), tuple(map_data["goal"])
+
+        costs = array("b", [1]) * (width * height)
+        for cell in map_data["cells"]:
+            value = cell["value"]
+            costs[cell["row"] * width + cell["col"]] = \
+                -1 if value == "#" else int(value)
+
+        # Same costs as Maze.set_cell gives the start and goal cells
+        costs[start[0] * width + start[1]] = 0
+        costs[end[0] * width + end[1]] = 1
+
+        return cls(width, height, costs, start, end)
+
+    @property
+    def weighted(self) -> int:
+        """Number of cells costing more than 1"""
+        return sum(self.cost_counts[2:])
+
+    @property
+    def max_cost(self) -> int:
+        """Highest cost of entering a cell, 0 without open cells"""
+        for cost in range(127, -1, -1):
+            if self.cost_counts[cost]:
+                return cost
+        return 0
+
+    def set_cost(self, pos: tuple[int, int], cost: int) -> None:
+        """Update the weight of a cell
+
+        Args:
+            pos (tuple[int, int]): Cell position
+            cost (int): New weight, -1 for walls
+        """
+        idx = self.index(pos)
+        if self.costs[idx] >= 0:
+            self.cost_counts[self.costs[idx]] -= 1
+        if cost >= 0:
+            self.cost_counts[cost] += 1
+        self.costs[idx] = cost
+
+        if self.walls[idx] == (cost < 0):
+            return
+
+        # Wall added or removed, refresh the moves into this cell
+        self.walls[idx] = cost < 0
+        self.jump_tables = None
+        for neighbour in self._adjacent(idx):
+            self._update_moves(neighbour)
+
+    def _adjacent(self, index: int) -> list[int]:
+        """Get the cells next to a cell, walls included
+
+        Args:
+            index (int): Cell index
+
+        Returns:
+            list[int]: Indices of the adjacent cells
+        """
+        row, col = self.pos(index)
+        adjacent = []
+
+        if row > 0:
+            adjacent.append(index - self.width)
+        if row < self.height - 1:
+            adjacent.append(index + self.width)
+        if col > 0:
+            adjacent.append(index - 1)
+        if col < self.width - 1:
+            adjacent.append(index + 1)
+
+        return adjacent
+
+    def neighbours(self, index: int) -> tuple[tuple[int, int], ...]:
+        """Get the possible moves out of a cell
+
+        The returned tuple is shared, precomputed data, so iterating it
+        does not allocate.
+
+        Args:
+            index (int): Cell index
+
+        Returns:
+            tuple[tuple[int, int], ...]: (direction, index delta) pairs
+        """
+        return self.steps[self.moves[index]]
+
+    def as_numpy(self) -> tuple["ndarray", "ndarray"]:
+        """Zero-copy NumPy views of the cost and wall buffers
+
+        Raises:
+            ImportError: NumPy is not installed
+
+        Returns:
+            tuple[ndarray, ndarray]: (costs, walls), shaped
+            (height, width)
+        """
+        if np is None:
+            raise ImportError("NumPy is required for Grid.as_numpy()")
 
-            possible_actions[action] = (r, c)
+        shape = (self.height, self.width)
+        costs = np.frombuffer(self.costs, dtype=np.int8).reshape(shape)
+        walls = np.frombuffer(self.walls, dtype=np.uint8).reshape(shape)
 
-        return possible_actions
+        return costs, walls
 
     def __repr__(self) -> str:
-        return f"Grid([[...], ...], {self.start}, {self.end})"
+        return f"Grid({self.width}x{self.height}, {self.start}, {self.end})"
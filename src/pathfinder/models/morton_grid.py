@@ -0,0 +1,306 @@
+from array import array
+from typing import TYPE_CHECKING
+
+from .grid import DOWN, LEFT, RIGHT, UP, Grid
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+# Bits of a Morton index holding the column (even) and the row (odd)
+_COLS = 0x55555555
+_ROWS = 0xAAAAAAAA
+
+# Largest side supported by 32-bit Morton indices
+MAX_SIDE = 1 << 16
+
+# Array typecodes by item size, for interleaving small runs in C
+_TYPECODES = {2: "H", 8: "Q"}
+
+
+def _dilate(n: int) -> int:
+    """Spread the bits of a 16-bit number to the even bits of 32"""
+    n = (n | n << 8) & 0x00FF00FF
+    n = (n | n << 4) & 0x0F0F0F0F
+    n = (n | n << 2) & 0x33333333
+    return (n | n << 1) & 0x55555555
+
+
+def _compact(n: int) -> int:
+    """Gather the even bits of a 32-bit number, inverse of _dilate"""
+    n &= 0x55555555
+    n = (n | n >> 1) & 0x33333333
+    n = (n | n >> 2) & 0x0F0F0F0F
+    n = (n | n >> 4) & 0x00FF00FF
+    return (n | n >> 8) & 0x0000FFFF
+
+
+def _interleave(
+    a: bytes | bytearray,
+    b: bytes | bytearray,
+    unit: int
+) -> bytes:
+    """Alternate runs of `unit` bytes taken from two equally long buffers
+
+    Args:
+        a (bytes | bytearray): Buffer of the first runs
+        b (bytes | bytearray): Buffer of the second runs
+        unit (int): Run length
+
+    Returns:
+        bytes: a[:unit] + b[:unit] + a[unit:2 * unit] + ...
+    """
+    if unit in _TYPECODES:
+        code = _TYPECODES[unit]
+        out = array(code, bytes(2 * len(a)))
+        out[0::2] = array(code, a)
+        out[1::2] = array(code, b)
+        return out.tobytes()
+
+    return b"".join(
+        run
+        for i in range(0, len(a), unit)
+        for run in (a[i:i + unit], b[i:i + unit])
+    )
+
+
+def to_morton(
+    data: bytes | bytearray,
+    width: int,
+    height: int,
+    side: int,
+    fill: int
+) -> bytearray:
+    """Reorder a row-major byte buffer into Z-order
+
+    Args:
+        data (bytes | bytearray): Row-major buffer of width * height
+        bytes
+        width (int): Grid width
+        height (int): Grid height
+        side (int): Power of two side of the Z-order square
+        fill (int): Byte value of the padding cells
+
+    Returns:
+        bytearray: Buffer of side * side bytes in Z-order
+    """
+    padding = bytes([fill]) * (side - width)
+    rows = [data[r * width:(r + 1) * width] + padding for r in range(height)]
+    rows += [bytes([fill]) * side] * (side - height)
+
+    # Every row is a strip of aligned square tiles, each in Z-order.
+    # Merging a pair of strips doubles the tile side: a new tile is the
+    # top-left, top-right, bottom-left and bottom-right old tiles
+    tile = 1
+    while len(rows) > 1:
+        rows = [
+            _interleave(top, bottom, 2 * tile)
+            for top, bottom in zip(rows[0::2], rows[1::2])
+        ]
+        tile *= 4
+
+    return bytearray(rows[0])
+
+
+class MortonGrid(Grid):
+    """Grid whose backing arrays are laid out in Z-order (Morton order)
+
+    Cell (row, col) lives at the index interleaving the bits of col (even
+    bits) and row (odd bits), so the cells of every aligned square block
+    are contiguous and neighbours are mostly close in memory. The arrays
+    cover the smallest power of two square holding the grid, cells past
+    its width or height are walls.
+
+    Neighbour offsets depend on the cell, `neighbours` computes them on
+    every call. Grid kernels only support row-major grids.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        costs: array,
+        start: tuple[int, int],
+        end: tuple[int, int]
+    ) -> None:
+        side = 1 << max(width - 1, height - 1).bit_length()
+        if side > MAX_SIDE:
+            raise ValueError(f"Morton grids are limited to {MAX_SIDE} cells"
+                             f" per side, got {width}x{height}")
+
+        # Build the row-major arrays, then reorder them
+        super().__init__(width, height, costs, start, end)
+        self.side = side
+        self.size = side * side
+
+        self.costs = array("b", to_morton(
+            self.costs.tobytes(), width, height, side, 0xFF))
+        self.walls = to_morton(self.walls, width, height, side, 1)
+        self.moves = to_morton(self.moves, width, height, side, 0)
+
+    def _update_moves(self, index: int) -> None:
+        """Recompute the move mask of a single cell
+
+        Args:
+            index (int): Cell index
+        """
+        walls = self.walls
+        mask = 0
+        for neighbour in self._adjacent(index):
+            if not walls[neighbour]:
+                mask |= 1 << self._direction(index, neighbour)
+
+        self.moves[index] = mask
+
+    def _adjacent(self, index: int) -> list[int]:
+        """Get the cells next to a cell, walls included
+
+        Args:
+            index (int): Cell index
+
+        Returns:
+            list[int]: Indices of the adjacent cells
+        """
+        row, col = self.pos(index)
+        if row >= self.height or col >= self.width:
+            return []
+
+        directions = []
+        if row > 0:
+            directions.append(UP)
+        if row < self.height - 1:
+            directions.append(DOWN)
+        if col > 0:
+            directions.append(LEFT)
+        if col < self.width - 1:
+            directions.append(RIGHT)
+
+        return [self.step(index, direction) for direction in directions]
+
+    def _direction(self, index: int, neighbour: int) -> int:
+        """Get the direction of the move between two adjacent cells"""
+        (r1, c1), (r2, c2) = self.pos(index), self.pos(neighbour)
+
+        if r2 != r1:
+            return UP if r2 < r1 else DOWN
+        return LEFT if c2 < c1 else RIGHT
+
+    @staticmethod
+    def step(index: int, direction: int) -> int:
+        """Get the index of the cell one move away
+
+        Args:
+            index (int): Cell index
+            direction (int): Direction of the move
+
+        Returns:
+            int: Index of the cell moved to, only valid inside the grid
+        """
+        cols, rows = index & _COLS, index & _ROWS
+
+        if direction == UP:
+            return (rows - 1) & _ROWS | cols
+        if direction == DOWN:
+            return ((rows | _COLS) + 1) & _ROWS | cols
+        if direction == LEFT:
+            return (cols - 1) & _COLS | rows
+        return ((cols | _ROWS) + 1) & _COLS | rows
+
+    def index(self, pos: tuple[int, int]) -> int:
+        """Get the array index of a cell
+
+        Args:
+            pos (tuple[int, int]): Cell position
+
+        Returns:
+            int: Index into the backing arrays
+        """
+        return _dilate(pos[0]) << 1 | _dilate(pos[1])
+
+    def pos(self, index: int) -> tuple[int, int]:
+        """Get the position of a cell from its array index
+
+        Args:
+            index (int): Index into the backing arrays
+
+        Returns:
+            tuple[int, int]: Cell position
+        """
+        return _compact(index >> 1), _compact(index)
+
+    def neighbours(self, index: int) -> tuple[tuple[int, int], ...]:
+        """Get the possible moves out of a cell
+
+        Args:
+            index (int): Cell index
+
+        Returns:
+            tuple[tuple[int, int], ...]: (direction, index delta) pairs
+        """
+        mask = self.moves[index]
+        if not mask:
+            return ()
+
+        cols, rows = index & _COLS, index & _ROWS
+        steps = []
+
+        # Dilated integer arithmetic: carries skip the other coordinate
+        if mask & 1 << UP:
+            steps.append((UP, ((rows - 1) & _ROWS | cols) - index))
+        if mask & 1 << DOWN:
+            below = ((rows | _COLS) + 1) & _ROWS
+            steps.append((DOWN, (below | cols) - index))
+        if mask & 1 << LEFT:
+            steps.append((LEFT, ((cols - 1) & _COLS | rows) - index))
+        if mask & 1 << RIGHT:
+            right = ((cols | _ROWS) + 1) & _COLS
+            steps.append((RIGHT, (right | rows) - index))
+
+        return tuple(steps)
+
+    def trace_path(self, parents: bytearray, index: int) -> list[int]:
+        """Follow parent directions back from a cell to the search root
+
+        Args:
+            parents (bytearray): Direction (plus one) used to enter each
+            cell, 0 for the root
+            index (int): Last cell of the path
+
+        Returns:
+            list[int]: Cell indices from the root to ``index``
+        """
+        # Moving back undoes the move, UP <-> DOWN and LEFT <-> RIGHT
+        step = MortonGrid.step
+        path = [index]
+
+        while parents[index]:
+            index = step(index, (parents[index] - 1) ^ 1)
+            path.append(index)
+
+        path.reverse()
+        return path
+
+    def as_numpy(self) -> tuple["ndarray", "ndarray"]:
+        """Zero-copy NumPy views of the cost and wall buffers
+
+        Raises:
+            ImportError: NumPy is not installed
+
+        Returns:
+            tuple[ndarray, ndarray]: (costs, walls), flat in Z-order
+        """
+        if np is None:
+            raise ImportError("NumPy is required for Grid.as_numpy()")
+
+        costs = np.frombuffer(self.costs, dtype=np.int8)
+        walls = np.frombuffer(self.walls, dtype=np.uint8)
+
+        return costs, walls
+
+    def __repr__(self) -> str:
+        return (f"MortonGrid({self.width}x{self.height}, {self.start},"
+                f" {self.end})")
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+INFINITY = float("inf")
+
 
 class Node:
     def __init__(
@@ -15,12 +17,12 @@ class Node:
         self.cost = cost
         self.parent = parent
         self.action = action
-        self.estimated_distance = float("inf")
+        self.estimated_distance = INFINITY
 
     def __lt__(self, other: Node) -> bool:
-        if self.estimated_distance == float("inf"):
+        if self.estimated_distance == INFINITY:
             return self.state < other.state
-        
+
         return self.estimated_distance < other.estimated_distance
 
     def __repr__(self) -> str:
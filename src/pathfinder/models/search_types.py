@@ -9,3 +9,85 @@ class Search(Enum):
     BREADTH_FIRST_SEARCH = "BFS"
     GREEDY_BEST_FIRST_SEARCH = "GBFS"
     DEPTH_FIRST_SEARCH = "DFS"
+    BITBOARD_BREADTH_FIRST_SEARCH = "Bitboard BFS"
+    BUCKETED_DIJKSTRAS_SEARCH = "Bucketed DS"
+    BIDIRECTIONAL_ASTAR_SEARCH = "Bi-A*"
+    BIDIRECTIONAL_DIJKSTRAS_SEARCH = "Bi-DS"
+    BIDIRECTIONAL_BREADTH_FIRST_SEARCH = "Bi-BFS"
+    JUMP_POINT_SEARCH = "JPS"
+    JUMP_POINT_PLUS_SEARCH = "JPS+"
+    FRINGE_SEARCH = "Fringe"
+    ITERATIVE_DEEPENING_ASTAR_SEARCH = "IDA*"
+    SIMPLIFIED_MEMORY_BOUNDED_ASTAR_SEARCH = "SMA*"
+    PARTIAL_EXPANSION_ASTAR_SEARCH = "PEA*"
+
+
+class TieBreak(Enum):
+    """Tie-breaking policies for A* entries with equal f-scores
+
+    Ties that remain after the policy are broken by cell index.
+    """
+
+    # Prefer the cell closer to the goal (the default)
+    LOW_H = "Lower h"
+
+    # Prefer the cell further from the start. For equal f = g + h this
+    # orders entries like LOW_H, it is kept as the textbook formulation
+    HIGH_G = "Higher g"
+
+    # Prefer the most recently pushed cell
+    LIFO = "LIFO"
+
+    # Prefer cells near the straight start-goal line, then lower h
+    CROSS_PRODUCT = "Cross product"
+
+    # No preference, cell index order only
+    INDEX = "Cell index"
+
+
+class FrontierKind(Enum):
+    """Priority queues of the frontier of Dijkstra's Search and A*, and of
+    Greedy Best First Search for the heaps
+
+    Every kind expands cells in the same order, they only differ in cost.
+    The binary heap runs in C through heapq, so in CPython the bucket
+    queue is at best on par with it and the radix heap is slower.
+    """
+
+    # Bucket queue for the small move costs of most grids, radix heap
+    # for the others
+    AUTO = "Auto"
+
+    # Binary heap of packed keys, PriorityQueueFrontier (the default)
+    BINARY_HEAP = "Binary heap"
+
+    # Circular bucket queue (Dial's algorithm), BucketQueueFrontier
+    BUCKET_QUEUE = "Bucket queue"
+
+    # Radix heap for monotone integer priorities, RadixHeapFrontier
+    RADIX_HEAP = "Radix heap"
+
+    # 4-ary heap with decrease-key and no stale entries,
+    # IndexedHeapFrontier
+    INDEXED_HEAP = "Indexed heap"
+
+
+class TraceLevel(Enum):
+    """How much of a search's progress is recorded in its Solution"""
+
+    # Only the path
+    NONE = "none"
+
+    # The path and the number of expanded and pushed cells
+    COUNTS = "counts"
+
+    # The counters and every explored cell in expansion order
+    FULL = "full"
+
+
+class BudgetLimit(Enum):
+    """Limits of a search budget"""
+
+    TIME = "time"
+    EXPANSIONS = "expansions"
+    FRONTIER = "frontier"
@@ -1,20 +1,112 @@
+from array import array
+from typing import Callable, Generator, Iterable, Iterator
+
+from .search_types import BudgetLimit, TieBreak, TraceLevel
+
+# Decodes a flat cell index into its (row, col) position
+Decoder = Callable[[int], tuple[int, int]]
+
+
+class CellView:
+    """Read-only sequence of (row, col) positions over flat cell indices
+
+    Positions are decoded when accessed, so a solution only keeps
+    4 bytes per cell (8 on huge grids) instead of a tuple.
+    """
+
+    __slots__ = ("cells", "decode")
+
+    def __init__(self, cells: array, decode: Decoder) -> None:
+        self.cells = cells
+        self.decode = decode
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __getitem__(
+        self,
+        key: int | slice
+    ) -> tuple[int, int] | list[tuple[int, int]]:
+        if isinstance(key, slice):
+            return list(map(self.decode, self.cells[key]))
+
+        return self.decode(self.cells[key])
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return map(self.decode, self.cells)
+
+    def __contains__(self, pos: tuple[int, int]) -> bool:
+        return any(cell == pos for cell in self)
+
+    def __repr__(self) -> str:
+        return f"CellView({len(self)} cells)"
+
+
 class Solution:
     """Model a solution to a pathfinding problem"""
 
     def __init__(
         self,
-        path: list[tuple[int, int]],
-        explored: list[tuple[int, int]],
+        path: Iterable[int],
+        explored: Iterable[int],
         time: float = 0,
-        path_cost: int = 0
+        path_cost: int = 0,
+        tie_break: TieBreak | None = None,
+        *,
+        decode: Decoder,
+        trace: TraceLevel = TraceLevel.FULL,
+        expanded: int | None = None,
+        pushed: int | None = None,
+        popped: int | None = None,
+        peak_frontier: int | None = None
     ) -> None:
-        self.path = path
+        # The searches hand over flat cell indices, kept in compact arrays
+        # and decoded to positions on access
+        self.path = CellView(Solution.pack(path), decode)
+        self.explored = CellView(Solution.pack(explored), decode)
+
+        # Counters are reported from TraceLevel.COUNTS up, the explored
+        # length falls back to the recorded trace without them
+        if trace is TraceLevel.NONE:
+            expanded = pushed = popped = peak_frontier = None
+
         self.path_cost = path_cost
-        self.path_length = len(path)
-        self.explored = explored
-        self.explored_length = len(explored)
+        self.path_length = len(self.path)
+        self.explored_length = \
+            len(self.explored) if expanded is None else expanded
+        self.pushed = pushed
         self.time = time
 
+        # Frontier entries popped, stale ones included, and the most
+        # entries queued at once. The memory-bounded searches report the
+        # most cells they held
+        self.popped = popped
+        self.peak_frontier = peak_frontier
+        self.trace = trace
+
+        # Tie-breaking policy of searches that have one
+        self.tie_break = tie_break
+
+    @staticmethod
+    def pack(cells: Iterable[int]) -> array:
+        """Store cell indices as unsigned 32-bit integers, or 64-bit ones
+        for grids with more cells
+
+        Args:
+            cells (Iterable[int]): Cell indices
+
+        Returns:
+            array: The indices, not copied if already packed
+        """
+        if isinstance(cells, array) and cells.typecode in ("I", "Q"):
+            return cells
+
+        cells = list(cells)
+        try:
+            return array("I", cells)
+        except OverflowError:
+            return array("Q", cells)
+
     def __repr__(self) -> str:
         return (f"Solution([{self.path[0]}, ..., {self.path[-1]}],"
                 f" {'{...}'}, {self.time})")
@@ -24,6 +116,53 @@ class NoSolution(Solution):
     """Model an empty pathfinding solution"""
 
     def __repr__(self) -> str:
-        explored = list(self.explored)
-        return (f"NoSolution([], {'{'}{explored[0]}, {explored[1]},"
-                f" ...{'}'}, {self.time})")
+        # Sample cells only when traced, the count is always known
+        sample = [str(cell) for cell in self.explored[:2]]
+        if self.explored_length > len(sample):
+            sample.append("...")
+        return (f"NoSolution([], {'{'}{', '.join(sample)}{'}'},"
+                f" {self.explored_length}, {self.time})")
+
+
+class BudgetExceeded(NoSolution):
+    """Model a search stopped by its budget before finding a path"""
+
+    def __init__(
+        self,
+        explored: Iterable[int],
+        limit: BudgetLimit,
+        expanded: int,
+        frontier_size: int,
+        **kwargs
+    ) -> None:
+        super().__init__([], explored, expanded=expanded, **kwargs)
+
+        # How far the search got, whatever its trace level
+        self.limit = limit
+        self.expanded = expanded
+        self.frontier_size = frontier_size
+
+    def __repr__(self) -> str:
+        return (f"BudgetExceeded({self.limit.value}, {self.expanded},"
+                f" {self.frontier_size}, {self.time})")
+
+
+# Stepwise search yielding batches of expanded cell indices and returning
+# the final Solution
+SolutionStream = Generator[array, None, Solution]
+
+
+def drain(stream: SolutionStream) -> Solution:
+    """Run a stepwise search to completion
+
+    Args:
+        stream (SolutionStream): Stepwise search
+
+    Returns:
+        Solution: Solution returned by the search
+    """
+    try:
+        while True:
+            next(stream)
+    except StopIteration as stop:
+        return stop.value
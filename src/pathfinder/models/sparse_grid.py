@@ -0,0 +1,128 @@
+from typing import Iterable, Sequence
+
+from .grid import BaseGrid
+from .node import Node
+
+
+class SparseCosts(dict[int, int]):
+    """Cell costs by index, only stored for cells not costing 1
+
+    Walls are stored with a cost of -1.
+    """
+
+    def __missing__(self, key: int) -> int:
+        return 1
+
+
+class SparseGrid(BaseGrid[SparseCosts]):
+    """Model a mostly open grid by its walls and weighted cells only
+
+    Cells are indexed row-major like a Grid, but there are no per-cell
+    arrays: costs live in a dict holding walls (-1) and cells whose cost
+    is not 1, and BaseGrid.neighbours works the moves out of a cell from
+    it when asked. Memory grows with the number of obstacles, not the
+    area. Searches keep their state in a SparseArena.
+    """
+
+    sparse = True
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        walls: Iterable[tuple[int, int]] = (),
+        weights: dict[tuple[int, int], int] | None = None
+    ) -> None:
+        super().__init__(width, height, start, end)
+
+        self.costs = SparseCosts()
+        for pos in walls:
+            self.costs[self.index(pos)] = -1
+        for pos, cost in (weights or {}).items():
+            self.set_cost(pos, cost)
+
+    @classmethod
+    def from_nodes(
+        cls,
+        grid: Sequence[Sequence[Node]],
+        start: tuple[int, int],
+        end: tuple[int, int]
+    ) -> "SparseGrid":
+        """Build a sparse grid from a matrix of nodes (e.g. ``Maze.maze``)
+
+        Args:
+            grid (Sequence[Sequence[Node]]): Node matrix
+            start (tuple[int, int]): Start position
+            end (tuple[int, int]): Goal position
+
+        Returns:
+            SparseGrid: Sparse grid
+        """
+        width = max(len(row) for row in grid)
+        sparse = cls(width, len(grid), start, end)
+
+        # Missing cells of ragged rows are treated as walls
+        for rowIdx, row in enumerate(grid):
+            for colIdx in range(width):
+                node = row[colIdx] if colIdx < len(row) else None
+                if node is None or node.value == "#":
+                    sparse.set_cost((rowIdx, colIdx), -1)
+                elif node.cost != 1:
+                    sparse.set_cost((rowIdx, colIdx), node.cost)
+
+        return sparse
+
+    @classmethod
+    def from_map_data(cls, map_data: dict) -> "SparseGrid":
+        """Build a sparse grid from saved map data (see ``Maze.save_map``)
+
+        Args:
+            map_data (dict): Parsed map JSON
+
+        Returns:
+            SparseGrid: Sparse grid
+        """
+        start, end = tuple(map_data["start"]), tuple(map_data["goal"])
+        sparse = cls(map_data["width"], map_data["height"], start, end)
+
+        for cell in map_data["cells"]:
+            value = cell["value"]
+            sparse.set_cost(
+                (cell["row"], cell["col"]),
+                -1 if value == "#" else int(value)
+            )
+
+        # Same costs as Maze.set_cell gives the start and goal cells
+        sparse.set_cost(start, 0)
+        sparse.set_cost(end, 1)
+
+        return sparse
+
+    @property
+    def obstacles(self) -> int:
+        """Number of cells stored, walls and weighted cells"""
+        return len(self.costs)
+
+    @property
+    def max_cost(self) -> int:
+        """Highest cost of entering a cell, cells not stored cost 1"""
+        return max(1, max(self.costs.values(), default=1))
+
+    def set_cost(self, pos: tuple[int, int], cost: int) -> None:
+        """Update the weight of a cell
+
+        Args:
+            pos (tuple[int, int]): Cell position
+            cost (int): New weight, -1 for walls
+        """
+        idx = self.index(pos)
+        if cost == 1:
+            self.costs.pop(idx, None)
+        else:
+            self.costs[idx] = cost
+
+    def __repr__(self) -> str:
+        return (f"SparseGrid({self.width}x{self.height}, {self.start},"
+                f" {self.end}, {self.obstacles} obstacles)")
@@ -0,0 +1,346 @@
+import mmap
+import struct
+from array import array
+from collections import OrderedDict
+from typing import Iterable
+
+from .grid import DOWN, LEFT, RIGHT, UP, BaseGrid
+
+# File header: magic, version, tile side, width, height, start and goal
+HEADER = struct.Struct("<4sHHQQQQQQ")
+MAGIC = b"PFTG"
+VERSION = 1
+
+# Tiles start on a page boundary so their pages can be released one by one
+DATA_OFFSET = 4096
+
+TILE_SIDE = 256
+
+# Tiles kept in memory by default, 4 MiB of 256x256 tiles
+CACHE_TILES = 64
+
+# Cost bytes deleted when scanning for the highest cost: 0, 1 and walls
+_UNWEIGHTED = bytes((0, 1, *range(0x80, 0x100)))
+
+
+class TileCache:
+    """Costs of a tiled map file, indexed like the row-major cost array
+    of a Grid
+
+    A tile is copied out of the memory map the first time one of its
+    cells is read and kept in a bounded LRU. Evicting a tile also lets
+    the OS drop its pages, so resident memory stays around `capacity`
+    tiles whatever the size of the map.
+    """
+
+    def __init__(
+        self,
+        buffer: mmap.mmap,
+        width: int,
+        height: int,
+        side: int,
+        capacity: int = CACHE_TILES
+    ) -> None:
+        self.buffer = buffer
+        self.width = width
+        self.height = height
+        self.side = side
+        self.across = -(-width // side)
+        self.tile_bytes = side * side
+        self.capacity = capacity
+
+        # Loaded tiles by tile id, least recently used first
+        self.tiles: OrderedDict[int, array] = OrderedDict()
+        self.faults = 0
+
+    def tile(self, tile_id: int) -> array:
+        """Get the costs of a tile, loading it if needed
+
+        Args:
+            tile_id (int): Row-major tile number
+
+        Returns:
+            array: Row-major signed costs of the tile's cells
+        """
+        tiles = self.tiles
+        tile = tiles.get(tile_id)
+        if tile is not None:
+            tiles.move_to_end(tile_id)
+            return tile
+
+        self.faults += 1
+        start = DATA_OFFSET + tile_id * self.tile_bytes
+        tile = array("b", self.buffer[start:start + self.tile_bytes])
+        tiles[tile_id] = tile
+
+        if len(tiles) > self.capacity:
+            evicted, _ = tiles.popitem(last=False)
+            self._release(evicted)
+
+        return tile
+
+    def _release(self, tile_id: int) -> None:
+        """Let the OS drop the mapped pages of an evicted tile"""
+        if not hasattr(mmap, "MADV_DONTNEED"):
+            return
+
+        # Only whole pages inside the tile can be released
+        start = DATA_OFFSET + tile_id * self.tile_bytes
+        first = -(-start // mmap.PAGESIZE) * mmap.PAGESIZE
+        last = (start + self.tile_bytes) // mmap.PAGESIZE * mmap.PAGESIZE
+        if first < last:
+            self.buffer.madvise(mmap.MADV_DONTNEED, first, last - first)
+
+    def locate(self, index: int) -> tuple[int, int]:
+        """Find a cell in the tiles
+
+        Args:
+            index (int): Row-major cell index
+
+        Returns:
+            tuple[int, int]: Tile id and offset of the cell in the tile
+        """
+        side = self.side
+        row, col = divmod(index, self.width)
+        tile_row, r = divmod(row, side)
+        tile_col, c = divmod(col, side)
+
+        return tile_row * self.across + tile_col, r * side + c
+
+    def __getitem__(self, index: int) -> int:
+        tile_id, offset = self.locate(index)
+        return self.tile(tile_id)[offset]
+
+    def __setitem__(self, index: int, cost: int) -> None:
+        tile_id, offset = self.locate(index)
+        self.buffer[DATA_OFFSET + tile_id * self.tile_bytes + offset] = \
+            cost & 0xFF
+
+        if tile_id in self.tiles:
+            self.tiles[tile_id][offset] = cost
+
+    def __len__(self) -> int:
+        return self.width * self.height
+
+
+class TiledGrid(BaseGrid[TileCache]):
+    """Model a grid stored on disk in square tiles, for maps larger than
+    memory
+
+    The map file (see `TiledGrid.create`) is memory-mapped and its tiles
+    are read on demand through a TileCache, so a search only loads the
+    tiles along its corridor. Cells are indexed row-major like a Grid and
+    searches keep their state in a SparseArena.
+
+    Cells past the right and bottom edges of the map are stored as walls,
+    which fills the last row and column of tiles.
+    """
+
+    sparse = True
+
+    def __init__(
+        self,
+        path: str,
+        cache_tiles: int = CACHE_TILES,
+        writable: bool = False
+    ) -> None:
+        with open(path, "r+b" if writable else "rb") as f:
+            self.buffer = mmap.mmap(
+                f.fileno(),
+                0,
+                access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            )
+
+        magic, version, side, width, height, *ends = \
+            HEADER.unpack_from(self.buffer)
+        if magic != MAGIC or version != VERSION:
+            self.buffer.close()
+            raise ValueError(f"'{path}' is not a version {VERSION} tiled map")
+
+        super().__init__(width, height, (ends[0], ends[1]),
+                         (ends[2], ends[3]))
+        self.path = path
+        self.costs = TileCache(self.buffer, width, height, side, cache_tiles)
+
+        # Highest cost, found by scanning the map file on first use
+        self.highest: int | None = None
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        width: int,
+        height: int,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        cells: Iterable[tuple[tuple[int, int], int]] = (),
+        tile_side: int = TILE_SIDE
+    ) -> None:
+        """Write a tiled map file of open cells
+
+        Args:
+            path (str): File to write
+            width (int): Map width
+            height (int): Map height
+            start (tuple[int, int]): Start position
+            end (tuple[int, int]): Goal position
+            cells (Iterable[tuple[tuple[int, int], int]], optional):
+            (position, cost) of the cells not costing 1, -1 for walls.
+            Defaults to ().
+            tile_side (int, optional): Side of the tiles. Defaults to
+            TILE_SIDE.
+        """
+        across = -(-width // tile_side)
+        down = -(-height // tile_side)
+
+        # Only tiles on the right and bottom edges differ, one pattern for
+        # each (open columns, open rows) shape
+        patterns: dict[tuple[int, int], bytes] = {}
+
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, tile_side, width, height,
+                                *start, *end).ljust(DATA_OFFSET, b"\0"))
+
+            for tile_row in range(down):
+                rows = min(tile_side, height - tile_row * tile_side)
+                for tile_col in range(across):
+                    cols = min(tile_side, width - tile_col * tile_side)
+                    if (cols, rows) not in patterns:
+                        line = b"\x01" * cols + b"\xff" * (tile_side - cols)
+                        patterns[cols, rows] = line * rows \
+                            + b"\xff" * tile_side * (tile_side - rows)
+                    f.write(patterns[cols, rows])
+
+        grid = cls(path, cache_tiles=1, writable=True)
+        for pos, cost in cells:
+            grid.set_cost(pos, cost)
+        grid.close()
+
+    @classmethod
+    def convert(
+        cls,
+        map_data: dict,
+        path: str,
+        tile_side: int = TILE_SIDE
+    ) -> "TiledGrid":
+        """Write saved map data (see ``Maze.save_map``) as a tiled map file
+
+        Args:
+            map_data (dict): Parsed map JSON
+            path (str): File to write
+            tile_side (int, optional): Side of the tiles. Defaults to
+            TILE_SIDE.
+
+        Returns:
+            TiledGrid: The map, opened read-only
+        """
+        start, end = tuple(map_data["start"]), tuple(map_data["goal"])
+        cells = [
+            ((cell["row"], cell["col"]),
+             -1 if cell["value"] == "#" else int(cell["value"]))
+            for cell in map_data["cells"]
+        ]
+
+        # Same costs as Maze.set_cell gives the start and goal cells
+        cells += [(start, 0), (end, 1)]
+
+        cls.create(path, map_data["width"], map_data["height"], start, end,
+                   cells, tile_side)
+
+        return cls(path)
+
+    @property
+    def max_cost(self) -> int:
+        """Highest cost of entering a cell, cells costing 0 or 1 count as 1
+
+        The map file is scanned a tile at a time on first use, without
+        going through the tile cache, and the tiles not cached are
+        released after.
+        """
+        if self.highest is None:
+            costs = self.costs
+            highest = 1
+            tiles = (len(self.buffer) - DATA_OFFSET) // costs.tile_bytes
+            for tile_id in range(tiles):
+                start = DATA_OFFSET + tile_id * costs.tile_bytes
+                weighted = self.buffer[start:start + costs.tile_bytes] \
+                    .translate(None, _UNWEIGHTED)
+                if weighted:
+                    highest = max(highest, max(weighted))
+                if tile_id not in costs.tiles:
+                    costs._release(tile_id)
+            self.highest = highest
+
+        return self.highest
+
+    def set_cost(self, pos: tuple[int, int], cost: int) -> None:
+        """Update the weight of a cell, in the map file
+
+        Args:
+            pos (tuple[int, int]): Cell position
+            cost (int): New weight, -1 for walls
+
+        Raises:
+            TypeError: The map was opened read-only
+        """
+        idx = self.index(pos)
+        previous = self.costs[idx]
+        self.costs[idx] = cost
+
+        # Raise the highest cost, or scan again if it was lowered
+        if self.highest is not None:
+            if cost > self.highest:
+                self.highest = cost
+            elif previous == self.highest and cost < previous:
+                self.highest = None
+
+    def neighbours(self, index: int) -> tuple[tuple[int, int], ...]:
+        """Get the possible moves out of a cell
+
+        Args:
+            index (int): Cell index
+
+        Returns:
+            tuple[tuple[int, int], ...]: (direction, index delta) pairs
+        """
+        costs = self.costs
+        width, side = self.width, costs.side
+        row, col = divmod(index, width)
+        tile_row, r = divmod(row, side)
+        tile_col, c = divmod(col, side)
+
+        # Cells on the border of a tile look their neighbours up one by one
+        if not (0 < r < side - 1 and 0 < c < side - 1):
+            return super().neighbours(index)
+
+        # Every neighbour is in the same tile, cells past the edges of the
+        # map are walls there
+        tile = costs.tile(tile_row * costs.across + tile_col)
+        offset = r * side + c
+
+        mask = 0
+        if tile[offset - side] >= 0:
+            mask |= 1 << UP
+        if tile[offset + side] >= 0:
+            mask |= 1 << DOWN
+        if tile[offset - 1] >= 0:
+            mask |= 1 << LEFT
+        if tile[offset + 1] >= 0:
+            mask |= 1 << RIGHT
+
+        return self.steps[mask]
+
+    def close(self) -> None:
+        """Drop the loaded tiles and unmap the map file"""
+        self.costs.tiles.clear()
+        self.buffer.close()
+
+    def __enter__(self) -> "TiledGrid":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (f"TiledGrid({self.width}x{self.height}, {self.start},"
+                f" {self.end}, '{self.path}')")
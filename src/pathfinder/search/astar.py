@@ -1,86 +1,252 @@
-from ..models.frontier import PriorityQueueFrontier
-from ..models.grid import Grid
-from ..models.solution import NoSolution, Solution
+from array import array
+
+from ..models.arena import SearchArena
+from ..models.budget import SearchBudget
+from ..models.frontier import priority_frontier
+from ..models.grid import BaseGrid
+from ..models.search_types import FrontierKind, TieBreak, TraceLevel
+from ..models.solution import (
+    BudgetExceeded,
+    NoSolution,
+    Solution,
+    SolutionStream,
+    drain,
+)
 
 
 class AStarSearch:
     @staticmethod
-    def search(grid: Grid) -> Solution:
+    def search(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        tie_break: TieBreak = TieBreak.LOW_H,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        frontier_kind: FrontierKind = FrontierKind.BINARY_HEAP
+    ) -> Solution:
         """Find path between two points in a grid using A* Search
 
         Args:
-            grid (Grid): Grid of points
-            callback (Optional[Visualiser], optional): Callback for 
-            visualisation. Defaults to None.
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state.
+            Defaults to None.
+            tie_break (TieBreak, optional): Order of entries with equal
+            f-scores. Defaults to TieBreak.LOW_H.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+            frontier_kind (FrontierKind, optional): Priority queue of the
+            frontier. Defaults to FrontierKind.BINARY_HEAP.
 
         Returns:
             Solution: Solution found
         """
-        # Create Node for the source cell
-        node = grid.get_node(pos=grid.start)
-
-        # Instantiate PriorityQueue frontier and add node into it
-        frontier = PriorityQueueFrontier()
-        frontier.add(
-            node,
-            priority=AStarSearch.heuristic(grid.start, grid.end)
+        return drain(AStarSearch.stream(
+            grid, arena, tie_break=tie_break, trace=trace, budget=budget,
+            frontier_kind=frontier_kind, batch_size=0))
+
+    @staticmethod
+    def stream(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        tie_break: TieBreak = TieBreak.LOW_H,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        frontier_kind: FrontierKind = FrontierKind.BINARY_HEAP,
+        batch_size: int = 64
+    ) -> SolutionStream:
+        """Find path between two points in a grid step by step using
+        A* Search
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state.
+            Defaults to None.
+            tie_break (TieBreak, optional): Order of entries with equal
+            f-scores. Defaults to TieBreak.LOW_H.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+            frontier_kind (FrontierKind, optional): Priority queue of the
+            frontier. Defaults to FrontierKind.BINARY_HEAP.
+            batch_size (int, optional): Expansions per yielded batch, 0
+            to only return the Solution. Defaults to 64.
+
+        Yields:
+            array: Cell indices expanded since the previous batch, empty
+            unless fully traced
+
+        Returns:
+            Solution: Solution found
+        """
+        pos = grid.pos
+        costs = grid.costs
+        start = grid.index(grid.start)
+        end = grid.index(grid.end)
+        (sr, sc), (er, ec) = grid.start, grid.end
+
+        # Per-query search state, valid where stamped with this generation
+        arena = SearchArena.prepare(grid, arena)
+        generation = arena.reset()
+        g_score, parents = arena.g, arena.parents
+        seen, closed = arena.seen, arena.closed
+
+        # Instantiate PriorityQueue frontier and add the source cell into it.
+        # F-scores grow by at most the highest cell cost plus 1 per move,
+        # as the Manhattan distance heuristic is consistent
+        h = AStarSearch.heuristic(grid.start, grid.end)
+        frontier = priority_frontier(
+            frontier_kind,
+            grid.size,
+            grid.max_cost + 1,
+            tie_bits=AStarSearch.tie_bits(grid, tie_break)
         )
+        frontier.add(start, priority=h)
+        g_score[start] = 0
+        parents[start] = 0
+        seen[start] = generation
+
+        # Bounds of the tie field values, see AStarSearch.tie_bits
+        h_bits = (grid.width + grid.height).bit_length()
+        max_g = 127 * grid.size
+        pushes = 4 * grid.size + 2
 
-        # Keep track of G scores
-        g_score = {grid.start: 0}
-        f_score = {grid.start: AStarSearch.heuristic(grid.start, grid.end)}
+        # Keep track of explored cells, in order only for a full trace
+        record = trace is TraceLevel.FULL
+        explored = array(grid.index_typecode)
+        expanded, pushed = 0, 1
+        flush_at = batch_size or -1
 
-        # Keep track of explored nodes
-        explored = []
+        # Stop at the budget's limits, checked every few expansions
+        check_at = budget.next_check(0) if budget else -1
 
         while True:
             # Return empty Solution object for no solution
             if frontier.is_empty():
-                return NoSolution([], explored)
+                return NoSolution(
+                    [],
+                    explored,
+                    tie_break=tie_break,
+                    decode=pos,
+                    trace=trace,
+                    expanded=expanded,
+                    pushed=pushed,
+                    popped=frontier.pops,
+                    peak_frontier=frontier.peak
+                )
 
-            # Remove node from the frontier
+            # Remove cell from the frontier, skipping stale entries: the
+            # first pop of a cell carries its best score, later copies
+            # pushed before an improvement are worse and already closed
             node = frontier.pop()
-            if node.state not in explored:
-                explored.append(node.state)
+            if closed[node] == generation:
+                continue
+
+            closed[node] = generation
+            expanded += 1
+            if record:
+                explored.append(node)
+
+            # Hand a batch of expansions to a streaming caller
+            if expanded == flush_at:
+                flush_at += batch_size
+                yield explored[-batch_size:]
 
             # If reached destination point
-            if node.state == grid.end:
+            if node == end:
 
                 # Generate path and return a Solution object
-                cells = []
-                path_cost = 0
+                path = grid.trace_path(parents, node)
+                path_cost = sum(costs[i] for i in path[1:])
 
-                temp = node
-                while temp.parent != None:
-                    cells.append(temp.state)
-                    path_cost += temp.cost
-                    temp = temp.parent
+                return Solution(
+                    path,
+                    explored,
+                    path_cost=path_cost,
+                    tie_break=tie_break,
+                    decode=pos,
+                    trace=trace,
+                    expanded=expanded,
+                    pushed=pushed,
+                    popped=frontier.pops,
+                    peak_frontier=frontier.peak
+                )
 
-                cells.append(grid.start)
-                cells.reverse()
-
-                return Solution(cells, explored, path_cost=path_cost)
+            # Give up once a limit of the budget is reached
+            if expanded == check_at and budget:
+                limit = budget.exceeded(expanded, len(frontier))
+                if limit:
+                    return BudgetExceeded(
+                        explored,
+                        limit,
+                        expanded,
+                        len(frontier),
+                        tie_break=tie_break,
+                        decode=pos,
+                        trace=trace,
+                        pushed=pushed,
+                        popped=frontier.pops,
+                        peak_frontier=frontier.peak
+                    )
+                check_at = budget.next_check(expanded)
 
             # Determine possible actions
-            for action, state in grid.get_neighbours(node.state).items():
-                cost = g_score[node.state] + grid.get_cost(state)
+            for direction, delta in grid.neighbours(node):
+                state = node + delta
+                cost = g_score[node] + costs[state]
 
-                if state not in g_score or cost < g_score[state]:
+                if seen[state] != generation or cost < g_score[state]:
+                    seen[state] = generation
                     g_score[state] = cost
-                    f_score[state] = cost + \
-                        AStarSearch.heuristic(state, grid.end)
+                    parents[state] = direction + 1
 
-                    n = grid.get_node(pos=state)
-                    n.parent = node
-                    n.estimated_distance = f_score[state] - cost
+                    row, col = pos(state)
+                    h = abs(row - er) + abs(col - ec)
 
-                    if not n.action:
-                        n.action = action
+                    if tie_break is TieBreak.LOW_H:
+                        tie = h
+                    elif tie_break is TieBreak.HIGH_G:
+                        tie = max_g - cost
+                    elif tie_break is TieBreak.LIFO:
+                        pushes -= 1
+                        tie = pushes
+                    elif tie_break is TieBreak.CROSS_PRODUCT:
+                        cross = (row - er) * (sc - ec) - (sr - er) * (col - ec)
+                        tie = abs(cross) << h_bits | h
+                    else:
+                        tie = 0
 
-                    frontier.add(
-                        node=n,
-                        priority=f_score[state]
-                    )
+                    pushed += 1
+                    frontier.add(state, priority=cost + h, tie=tie)
+
+    @staticmethod
+    def tie_bits(grid: BaseGrid, tie_break: TieBreak) -> int:
+        """Width of the tie field in the heap keys of a tie-breaking policy
+
+        Args:
+            grid (BaseGrid): Grid to search
+            tie_break (TieBreak): Tie-breaking policy
+
+        Returns:
+            int: Number of bits
+        """
+        h_bits = (grid.width + grid.height).bit_length()
+
+        match tie_break:
+            case TieBreak.LOW_H:
+                return h_bits
+            case TieBreak.HIGH_G:
+                # Cell costs fit a signed byte
+                return (127 * grid.size).bit_length()
+            case TieBreak.LIFO:
+                # At most one push per relaxed move
+                return (4 * grid.size + 2).bit_length()
+            case TieBreak.CROSS_PRODUCT:
+                return ((grid.width + grid.height) ** 2).bit_length() + h_bits
+            case _:
+                return 0
 
     @staticmethod
     def heuristic(state: tuple[int, int], goal: tuple[int, int]) -> int:
@@ -0,0 +1,503 @@
+from array import array
+from collections import deque
+
+from ..models.arena import SearchArena
+from ..models.budget import SearchBudget
+from ..models.frontier import PriorityQueueFrontier
+from ..models.grid import BaseGrid
+from ..models.search_types import TraceLevel
+from ..models.solution import (
+    BudgetExceeded,
+    NoSolution,
+    Solution,
+    SolutionStream,
+    drain,
+)
+
+
+class BidirectionalAStarSearch:
+    @staticmethod
+    def search(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None
+    ) -> Solution:
+        """Find path between two points in a grid using A* Search from
+        both ends
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state,
+            the second tree uses its paired arena. Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+
+        Returns:
+            Solution: Solution found
+        """
+        return drain(BidirectionalAStarSearch.stream(
+            grid, arena, trace=trace, budget=budget,
+            batch_size=0))
+
+    @staticmethod
+    def stream(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        batch_size: int = 64
+    ) -> SolutionStream:
+        """Find path between two points in a grid step by step using A*
+        Search from both ends
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state,
+            the second tree uses its paired arena. Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+            batch_size (int, optional): Expansions per yielded batch, 0
+            to only return the Solution. Defaults to 64.
+
+        Yields:
+            array: Cell indices expanded since the previous batch, empty
+            unless fully traced
+
+        Returns:
+            Solution: Solution found
+        """
+        return (yield from best_first(
+            grid, arena, trace, budget, batch_size, informed=True))
+
+
+class BidirectionalDijkstrasSearch:
+    @staticmethod
+    def search(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None
+    ) -> Solution:
+        """Find path between two points in a grid using Dijkstra's Search
+        from both ends
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state,
+            the second tree uses its paired arena. Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+
+        Returns:
+            Solution: Solution found
+        """
+        return drain(BidirectionalDijkstrasSearch.stream(
+            grid, arena, trace=trace, budget=budget,
+            batch_size=0))
+
+    @staticmethod
+    def stream(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        batch_size: int = 64
+    ) -> SolutionStream:
+        """Find path between two points in a grid step by step using
+        Dijkstra's Search from both ends
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state,
+            the second tree uses its paired arena. Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+            batch_size (int, optional): Expansions per yielded batch, 0
+            to only return the Solution. Defaults to 64.
+
+        Yields:
+            array: Cell indices expanded since the previous batch, empty
+            unless fully traced
+
+        Returns:
+            Solution: Solution found
+        """
+        return (yield from best_first(
+            grid, arena, trace, budget, batch_size, informed=False))
+
+
+class BidirectionalBreadthFirstSearch:
+    @staticmethod
+    def search(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None
+    ) -> Solution:
+        """Find path between two points in a grid using Breadth First
+        Search from both ends
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state,
+            the second tree uses its paired arena. Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+
+        Returns:
+            Solution: Solution found
+        """
+        return drain(BidirectionalBreadthFirstSearch.stream(
+            grid, arena, trace=trace, budget=budget,
+            batch_size=0))
+
+    @staticmethod
+    def stream(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        batch_size: int = 64
+    ) -> SolutionStream:
+        """Find path between two points in a grid step by step using
+        Breadth First Search from both ends
+
+        Whole levels are expanded, on the side with the fewest queued
+        cells. The first level that links the two trees gives a path
+        with the fewest moves.
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state,
+            the second tree uses its paired arena. Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+            batch_size (int, optional): Expansions per yielded batch, 0
+            to only return the Solution. Defaults to 64.
+
+        Yields:
+            array: Cell indices expanded since the previous batch, empty
+            unless fully traced
+
+        Returns:
+            Solution: Solution found
+        """
+        pos = grid.pos
+        start = grid.index(grid.start)
+        end = grid.index(grid.end)
+
+        # One arena per tree, depths are kept as g-scores
+        forward = SearchArena.prepare(grid, arena)
+        trees = (forward, forward.pair())
+        generations = (trees[0].reset(), trees[1].reset())
+        queues = (deque([start]), deque([end]))
+        for tree, generation, root in zip(trees, generations, (start, end)):
+            tree.g[root] = 0
+            tree.parents[root] = 0
+            tree.seen[root] = generation
+
+        # Keep track of explored cells, in order only for a full trace
+        record = trace is TraceLevel.FULL
+        explored = array(grid.index_typecode)
+        expanded, pushed = 0, 2
+        flush_at = batch_size or -1
+
+        # Stop at the budget's limits, checked every few expansions
+        check_at = budget.next_check(0) if budget else -1
+
+        # Fewest moves of a path found so far and the cell the trees meet at
+        best, meet = (0, start) if start == end else (None, None)
+
+        while meet is None:
+            # Return empty Solution object for no solution
+            if not queues[0] or not queues[1]:
+                return NoSolution(
+                    [],
+                    explored,
+                    decode=pos,
+                    trace=trace,
+                    expanded=expanded,
+                    pushed=pushed
+                )
+
+            side = 0 if len(queues[0]) <= len(queues[1]) else 1
+            queue = queues[side]
+            tree, generation = trees[side], generations[side]
+            other, other_generation = trees[1 - side], generations[1 - side]
+            depth, parents, seen = tree.g, tree.parents, tree.seen
+
+            for _ in range(len(queue)):
+                node = queue.popleft()
+                tree.closed[node] = generation
+                expanded += 1
+                if record:
+                    explored.append(node)
+
+                # Hand a batch of expansions to a streaming caller
+                if expanded == flush_at:
+                    flush_at += batch_size
+                    yield explored[-batch_size:]
+
+                # Give up once a limit of the budget is reached
+                if expanded == check_at and budget:
+                    queued = len(queues[0]) + len(queues[1])
+                    limit = budget.exceeded(expanded, queued)
+                    if limit:
+                        return BudgetExceeded(
+                            explored,
+                            limit,
+                            expanded,
+                            queued,
+                            decode=pos,
+                            trace=trace,
+                            pushed=pushed
+                        )
+                    check_at = budget.next_check(expanded)
+
+                for direction, delta in grid.neighbours(node):
+                    state = node + delta
+                    if seen[state] == generation:
+                        continue
+
+                    seen[state] = generation
+                    depth[state] = depth[node] + 1
+                    parents[state] = direction + 1
+                    pushed += 1
+                    queue.append(state)
+
+                    # Cells the other tree reached link the trees, the rest
+                    # of the level may still give a shorter link
+                    if other.seen[state] == other_generation:
+                        moves = depth[state] + other.g[state]
+                        if best is None or moves < best:
+                            best, meet = moves, state
+
+        path = stitch(grid, trees[0], trees[1], meet)
+        path_cost = sum(grid.costs[i] for i in path[1:])
+
+        return Solution(
+            path,
+            explored,
+            path_cost=path_cost,
+            decode=pos,
+            trace=trace,
+            expanded=expanded,
+            pushed=pushed
+        )
+
+
+def best_first(
+    grid: BaseGrid,
+    arena: SearchArena | None,
+    trace: TraceLevel,
+    budget: SearchBudget | None,
+    batch_size: int,
+    informed: bool
+) -> SolutionStream:
+    """Search a grid from both ends with a best-first tree each
+
+    The forward tree grows from the start, the backward tree from the
+    goal along reversed moves: stepping back from a cell into its
+    neighbour costs the weight of the cell left. Each step expands the
+    tree with the fewest queued cells, and every relaxation that reaches
+    a cell of the other tree offers a path through it.
+
+    Dijkstra's trees stop once the sum of their lowest priorities
+    reaches the cheapest path offered. A* trees use the average of both
+    Manhattan distances as their heuristic: a cell's priority is g plus
+    half the distance to the tree's target minus half the distance to
+    its root. Both trees then agree on the cost of every move, so they
+    stop on the same sum rule. Priorities are doubled, and offset by the
+    start-goal distance, to stay non-negative integers.
+
+    Args:
+        grid (BaseGrid): Grid of points
+        arena (SearchArena | None): Reusable search state
+        trace (TraceLevel): What to record of the explored cells
+        budget (SearchBudget | None): Limits to stop the search at
+        batch_size (int): Expansions per yielded batch, 0 to only return
+        the Solution
+        informed (bool): Use the A* heuristic
+
+    Yields:
+        array: Cell indices expanded since the previous batch, empty
+        unless fully traced
+
+    Returns:
+        Solution: Solution found
+    """
+    pos = grid.pos
+    costs = grid.costs
+    start = grid.index(grid.start)
+    end = grid.index(grid.end)
+
+    # One arena and frontier per tree, each heading to the other's root
+    forward = SearchArena.prepare(grid, arena)
+    trees = (forward, forward.pair())
+    generations = (trees[0].reset(), trees[1].reset())
+    targets = (grid.end, grid.start)
+    tie_bits = (grid.width + grid.height).bit_length() if informed else 0
+    frontiers = (PriorityQueueFrontier(grid.size, tie_bits),
+                 PriorityQueueFrontier(grid.size, tie_bits))
+
+    # Bounds of the heuristic term, see above
+    (sr, sc), (er, ec) = grid.start, grid.end
+    span = abs(sr - er) + abs(sc - ec) if informed else 0
+
+    for side, root in enumerate((start, end)):
+        tree = trees[side]
+        tree.g[root] = 0
+        tree.parents[root] = 0
+        tree.seen[root] = generations[side]
+        frontiers[side].add(root, priority=2 * span)
+
+    # Keep track of explored cells, in order only for a full trace
+    record = trace is TraceLevel.FULL
+    explored = array(grid.index_typecode)
+    expanded, pushed = 0, 2
+    flush_at = batch_size or -1
+
+    # Stop at the budget's limits, checked every few expansions
+    check_at = budget.next_check(0) if budget else -1
+
+    # Cost of the cheapest path found so far and the cell the trees meet at
+    best, meet = (0, start) if start == end else (None, None)
+
+    # Everything an expansion needs of a side, unpacked once per step
+    sides = tuple(
+        (
+            frontiers[side], trees[side].g, trees[side].parents,
+            trees[side].seen, trees[side].closed, generations[side],
+            trees[1 - side].g, trees[1 - side].seen, generations[1 - side],
+            *targets[side], *targets[1 - side]
+        )
+        for side in (0, 1)
+    )
+    heaps = (frontiers[0].frontier, frontiers[1].frontier)
+
+    while heaps[0] and heaps[1]:
+        # Lowest priorities bound the cost of any path not offered yet,
+        # stale entries only make the bounds lower
+        if best is not None:
+            low = frontiers[0].peek() + frontiers[1].peek()
+            if low >= (2 * (best + span) if informed else best):
+                break
+
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        (frontier, g_score, parents, seen, closed, generation,
+         other_g, other_seen, other_generation, tr, tc, rr, rc) = sides[side]
+
+        # Skip stale entries, see AStarSearch
+        node = frontier.pop()
+        if closed[node] == generation:
+            continue
+
+        closed[node] = generation
+        expanded += 1
+        if record:
+            explored.append(node)
+
+        # Hand a batch of expansions to a streaming caller
+        if expanded == flush_at:
+            flush_at += batch_size
+            yield explored[-batch_size:]
+
+        # Give up once a limit of the budget is reached
+        if expanded == check_at and budget:
+            queued = len(frontiers[0]) + len(frontiers[1])
+            limit = budget.exceeded(expanded, queued)
+            if limit:
+                return BudgetExceeded(
+                    explored,
+                    limit,
+                    expanded,
+                    queued,
+                    decode=pos,
+                    trace=trace,
+                    pushed=pushed
+                )
+            check_at = budget.next_check(expanded)
+
+        # Moving back from a cell costs the weight of the cell
+        leave = costs[node]
+        for direction, delta in grid.neighbours(node):
+            state = node + delta
+            cost = g_score[node] + (leave if side else costs[state])
+
+            if seen[state] != generation or cost < g_score[state]:
+                seen[state] = generation
+                g_score[state] = cost
+                parents[state] = direction + 1
+
+                pushed += 1
+                if informed:
+                    row, col = pos(state)
+                    h = abs(row - tr) + abs(col - tc)
+                    back = abs(row - rr) + abs(col - rc)
+                    frontier.add(state, priority=2 * cost + h - back + span,
+                                 tie=h)
+                else:
+                    frontier.add(state, priority=cost)
+
+                if other_seen[state] == other_generation:
+                    total = cost + other_g[state]
+                    if best is None or total < best:
+                        best, meet = total, state
+
+    # Return empty Solution object for no solution, the cost and meeting
+    # cell are always found together
+    if best is None or meet is None:
+        return NoSolution(
+            [],
+            explored,
+            decode=pos,
+            trace=trace,
+            expanded=expanded,
+            pushed=pushed
+        )
+
+    return Solution(
+        stitch(grid, trees[0], trees[1], meet),
+        explored,
+        path_cost=best,
+        decode=pos,
+        trace=trace,
+        expanded=expanded,
+        pushed=pushed
+    )
+
+
+def stitch(
+    grid: BaseGrid,
+    forward: SearchArena,
+    backward: SearchArena,
+    meet: int
+) -> list[int]:
+    """Join the paths of both trees at the cell they meet at
+
+    Args:
+        grid (BaseGrid): Searched grid
+        forward (SearchArena): State of the tree grown from the start
+        backward (SearchArena): State of the tree grown from the goal
+        meet (int): Cell reached by both trees
+
+    Returns:
+        list[int]: Cell indices from the start to the goal
+    """
+    head = grid.trace_path(forward.parents, meet)
+    tail = grid.trace_path(backward.parents, meet)
+
+    return head + tail[-2::-1]
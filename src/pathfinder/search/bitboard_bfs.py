@@ -0,0 +1,292 @@
+from array import array
+from math import isqrt
+
+from ..models.arena import SearchArena
+from ..models.budget import SearchBudget
+from ..models.grid import BaseGrid, Grid
+from ..models.search_types import BudgetLimit, TraceLevel
+from ..models.solution import (
+    BudgetExceeded,
+    NoSolution,
+    Solution,
+    SolutionStream,
+    drain,
+)
+from .bfs import BreadthFirstSearch
+
+# Wall flag byte -> "1" for open cells and "0" for walls
+_OPEN_DIGITS = bytes(
+    ord("1") if byte == 0 else ord("0") for byte in range(256))
+
+# Set bit offsets of every byte value
+_BYTE_BITS = tuple(
+    tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+# Byte -> 1 if any of its bits is set
+_NONZERO = bytes(int(byte > 0) for byte in range(256))
+
+
+class BitboardBreadthFirstSearch:
+    """Breadth First Search over whole levels at once
+
+    The open cells and the cells of a BFS level are bits of big integers,
+    bit i standing for cell index i. The next level is the current one
+    shifted by 1 and by the width, masked by the open cells not reached
+    yet, so one level takes a few big integer operations in C instead of
+    a Python iteration per cell.
+
+    Only row-major Grids have bitboards, the other grids run the per-cell
+    BreadthFirstSearch.
+    """
+
+    @staticmethod
+    def search(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None
+    ) -> Solution:
+        """Find path between two points in a grid using a bitboard
+        Breadth First Search
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state,
+            only used on grids without bitboards. Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at, checked after every level. Defaults to None.
+
+        Returns:
+            Solution: Solution found
+        """
+        return drain(BitboardBreadthFirstSearch.stream(
+            grid, arena, trace=trace, budget=budget,
+            batch_size=0))
+
+    @staticmethod
+    def stream(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        batch_size: int = 64
+    ) -> SolutionStream:
+        """Find path between two points in a grid step by step using a
+        bitboard Breadth First Search
+
+        Levels are expanded whole, the explored cells of a level are in
+        index order rather than in queue order.
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state,
+            only used on grids without bitboards. Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at, checked after every level. Defaults to None.
+            batch_size (int, optional): Expansions per yielded batch, 0
+            to only return the Solution. Defaults to 64.
+
+        Yields:
+            array: Cell indices expanded since the previous batch, empty
+            unless fully traced
+
+        Returns:
+            Solution: Solution found
+        """
+        if type(grid) is not Grid:
+            return (yield from BreadthFirstSearch.stream(
+                grid, arena, trace=trace, budget=budget,
+                batch_size=batch_size))
+
+        pos = grid.pos
+        costs = grid.costs
+        start = grid.index(grid.start)
+        end = grid.index(grid.end)
+        width, size = grid.width, grid.size
+        goal = 1 << end
+
+        # Open cells, and the columns a move left or right can leave from
+        row = (1 << width) - 1
+        rows = ((1 << size) - 1) // row
+        remaining = int(grid.walls.translate(_OPEN_DIGITS)[::-1], 2)
+        from_right = (row ^ 1) * rows
+        from_left = (row >> 1) * rows
+
+        def spread(level: int) -> int:
+            """Cells one move away from a level, open or not"""
+            return (level >> width | level << width
+                    | (level & from_right) >> 1 | (level & from_left) << 1)
+
+        # Levels are recomputed from checkpoints to trace the path back,
+        # keeping about the square root of the distance in memory
+        level = 1 << start
+        remaining &= ~level
+        checkpoints = [(level, remaining)]
+        every = max(isqrt(grid.width + grid.height), 1)
+        depth, count = 0, 1
+
+        # Keep track of explored cells, in order only for a full trace
+        record = trace is TraceLevel.FULL
+        explored = array(grid.index_typecode)
+        expanded, pushed = 0, 1
+        flush_at = batch_size or -1
+
+        # Stop at the budget's limits, checked after every level. A level
+        # crossing the expansion limit is only expanded up to it
+        check_at = budget.next_check(0) if budget else -1
+        stop_at = -1
+        if budget and budget.max_expansions is not None:
+            stop_at = max(budget.max_expansions, 1)
+
+        while not level & goal:
+            rest = 0
+            if 0 <= stop_at < expanded + count:
+                part = BitboardBreadthFirstSearch.lowest(
+                    level, stop_at - expanded)
+                level, rest = part, level ^ part
+                count = stop_at - expanded
+
+            expanded += count
+            if record:
+                BitboardBreadthFirstSearch.extend(explored, level, size)
+
+            # Hand the batches of expansions filled by the level to a
+            # streaming caller
+            while expanded >= flush_at > 0:
+                yield explored[flush_at - batch_size:flush_at]
+                flush_at += batch_size
+
+            # The cells of the level left out stay queued
+            if rest:
+                pending = rest.bit_count()
+                return BudgetExceeded(
+                    explored,
+                    BudgetLimit.EXPANSIONS,
+                    expanded,
+                    pending,
+                    decode=pos,
+                    trace=trace,
+                    pushed=pushed
+                )
+
+            level = spread(level) & remaining
+
+            # Return empty Solution object for no solution
+            if not level:
+                return NoSolution(
+                    [],
+                    explored,
+                    decode=pos,
+                    trace=trace,
+                    expanded=expanded,
+                    pushed=pushed
+                )
+
+            remaining ^= level
+            count = level.bit_count()
+            pushed += count
+            depth += 1
+            if depth % every == 0:
+                checkpoints.append((level, remaining))
+
+            # Give up once a limit of the budget is reached
+            if budget and expanded >= check_at:
+                limit = budget.exceeded(expanded, count)
+                if limit:
+                    return BudgetExceeded(
+                        explored,
+                        limit,
+                        expanded,
+                        count,
+                        decode=pos,
+                        trace=trace,
+                        pushed=pushed
+                    )
+                check_at = budget.next_check(expanded)
+
+        # The goal is expanded on its own from the last level
+        expanded += 1
+        if record:
+            explored.append(end)
+
+        # Walk back to any neighbour in the previous level, one level at a
+        # time, which gives a shortest path
+        path = [end]
+        node = end
+        for block in range((depth - 1) // every, -1, -1):
+            level, remaining = checkpoints[block]
+            levels = [level]
+            for _ in range(block * every + 1, min(depth, (block + 1) * every)):
+                level = spread(level) & remaining
+                remaining ^= level
+                levels.append(level)
+
+            for level in reversed(levels):
+                for _, delta in grid.neighbours(node):
+                    if level >> node + delta & 1:
+                        node += delta
+                        break
+                path.append(node)
+
+        path.reverse()
+        path_cost = sum(costs[i] for i in path[1:])
+
+        return Solution(
+            path,
+            explored,
+            path_cost=path_cost,
+            decode=pos,
+            trace=trace,
+            expanded=expanded,
+            pushed=pushed
+        )
+
+    @staticmethod
+    def lowest(level: int, count: int) -> int:
+        """Keep the cells of a level with the lowest indices
+
+        Args:
+            level (int): Bitboard of the level
+            count (int): Number of cells to keep, at most those of the
+            level
+
+        Returns:
+            int: Bitboard of the `count` lowest cells
+        """
+        # Binary search for the shortest prefix of the bitboard holding
+        # them, a few big integer operations per halving
+        low, high = count, level.bit_length()
+        while low < high:
+            middle = (low + high) // 2
+            if (level & ((1 << middle) - 1)).bit_count() < count:
+                low = middle + 1
+            else:
+                high = middle
+
+        return level & ((1 << low) - 1)
+
+    @staticmethod
+    def extend(explored: array, level: int, size: int) -> None:
+        """Append the cells of a level to the explored cells
+
+        Args:
+            explored (array): Explored cell indices
+            level (int): Bitboard of the level
+            size (int): Number of cells of the grid
+        """
+        # Bytes holding cells are found with bytes.find rather than a
+        # Python loop over every byte
+        data = level.to_bytes((size + 7) // 8, "little")
+        find = data.translate(_NONZERO).find
+        append = explored.append
+
+        offset = find(1)
+        while offset >= 0:
+            base = offset * 8
+            for bit in _BYTE_BITS[data[offset]]:
+                append(base + bit)
+            offset = find(1, offset + 1)
@@ -0,0 +1,318 @@
+from array import array
+from typing import TYPE_CHECKING, Generator
+
+from ..models.arena import SearchArena
+from ..models.budget import SearchBudget
+from ..models.grid import BaseGrid, Grid
+from ..models.search_types import TraceLevel
+from ..models.solution import (
+    BudgetExceeded,
+    NoSolution,
+    Solution,
+    SolutionStream,
+    drain,
+)
+from .dijkstras import DijkstrasSearch
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+# Distance of the cells not reached
+UNREACHED = -1
+
+
+class BucketedDijkstrasSearch:
+    """Dijkstra's Search settling whole distance buckets with NumPy
+
+    Cells are kept in buckets of `delta` consecutive distances. The cells
+    of the lowest bucket are relaxed together against their four
+    neighbours with array operations, over and over until no distance
+    in the bucket improves, after which the bucket is settled. With the
+    default delta of 1 each bucket is a single distance and is relaxed
+    once, like Dial's algorithm. Larger deltas (delta-stepping) take
+    fewer, bigger steps for some repeated relaxations.
+
+    Without NumPy, or on grids other than row-major Grids, searches run
+    DijkstrasSearch instead.
+    """
+
+    @staticmethod
+    def search(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        delta: int = 1
+    ) -> Solution:
+        """Find path between two points in a grid using a bucketed
+        Dijkstra's Search
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state,
+            only used by the DijkstrasSearch fallback. Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at, checked after every bucket. Defaults to None.
+            delta (int, optional): Width of the distance buckets.
+            Defaults to 1.
+
+        Returns:
+            Solution: Solution found
+        """
+        return drain(BucketedDijkstrasSearch.stream(
+            grid, arena, trace=trace, budget=budget, delta=delta,
+            batch_size=0))
+
+    @staticmethod
+    def stream(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        delta: int = 1,
+        batch_size: int = 64
+    ) -> SolutionStream:
+        """Find path between two points in a grid step by step using a
+        bucketed Dijkstra's Search
+
+        Buckets are settled whole, the explored cells of a bucket are in
+        index order rather than in distance order.
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state,
+            only used by the DijkstrasSearch fallback. Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at, checked after every bucket. Defaults to None.
+            delta (int, optional): Width of the distance buckets.
+            Defaults to 1.
+            batch_size (int, optional): Expansions per yielded batch, 0
+            to only return the Solution. Defaults to 64.
+
+        Yields:
+            array: Cell indices expanded since the previous batch, empty
+            unless fully traced
+
+        Returns:
+            Solution: Solution found
+        """
+        if np is None or type(grid) is not Grid:
+            return (yield from DijkstrasSearch.stream(
+                grid, arena, trace=trace, budget=budget,
+                batch_size=batch_size))
+
+        pos = grid.pos
+        start = grid.index(grid.start)
+        end = grid.index(grid.end)
+
+        # Keep track of explored cells, in order only for a full trace
+        record = trace is TraceLevel.FULL
+        explored = array(grid.index_typecode)
+        expanded = 0
+        flush_at = batch_size or -1
+
+        # Stop at the budget's limits, checked after every bucket. A
+        # bucket crossing the expansion limit is only settled up to it,
+        # leaving its other cells queued
+        check_at = budget.next_check(0) if budget else -1
+        stop_at = -1
+        if budget and budget.max_expansions is not None:
+            stop_at = max(budget.max_expansions, 1)
+
+        buckets = BucketedDijkstrasSearch.buckets(grid, start, delta)
+        for settled, pending in buckets:
+            over = expanded + len(settled) - stop_at if stop_at >= 0 else 0
+            if over > 0:
+                settled = settled[:len(settled) - over]
+                pending += over
+
+            expanded += len(settled)
+            if record:
+                explored.extend(settled.tolist())
+
+            # Hand the batches of expansions filled by the bucket to a
+            # streaming caller
+            while expanded >= flush_at > 0:
+                yield explored[flush_at - batch_size:flush_at]
+                flush_at += batch_size
+
+            # The goal's distance is final once its bucket is settled, as
+            # far as the cells of a cut bucket, in index order, go
+            if buckets.dist[end] != UNREACHED \
+                    and buckets.dist[end] < buckets.upper \
+                    and (over <= 0 or end <= settled[-1]):
+                break
+
+            # Give up once a limit of the budget is reached
+            if budget and expanded >= check_at:
+                limit = budget.exceeded(expanded, pending)
+                if limit:
+                    return BudgetExceeded(
+                        explored,
+                        limit,
+                        expanded,
+                        pending,
+                        decode=pos,
+                        trace=trace,
+                        pushed=buckets.pushed
+                    )
+                check_at = budget.next_check(expanded)
+        else:
+            # Return empty Solution object for no solution
+            return NoSolution(
+                [],
+                explored,
+                decode=pos,
+                trace=trace,
+                expanded=expanded,
+                pushed=buckets.pushed
+            )
+
+        # Generate path and return a Solution object
+        path = grid.trace_path(buckets.parents.tobytes(), end)
+
+        return Solution(
+            path,
+            explored,
+            path_cost=int(buckets.dist[end]),
+            decode=pos,
+            trace=trace,
+            expanded=expanded,
+            pushed=buckets.pushed
+        )
+
+    @staticmethod
+    def distance_field(
+        grid: Grid,
+        source: tuple[int, int] | None = None,
+        delta: int = 1
+    ) -> tuple["ndarray", "ndarray"]:
+        """Cost of the cheapest path from a cell to every cell of a grid
+
+        Args:
+            grid (Grid): Row-major grid
+            source (tuple[int, int] | None, optional): Cell the paths start
+            from. Defaults to the grid's start.
+            delta (int, optional): Width of the distance buckets.
+            Defaults to 1.
+
+        Raises:
+            ImportError: NumPy is not installed
+
+        Returns:
+            tuple[ndarray, ndarray]: (distances, parents) shaped
+            (height, width). Distances are UNREACHED (-1) for the cells
+            out of reach, parents are the direction plus one of the move
+            into each cell and 0 for the source and the cells out of reach
+        """
+        buckets = BucketedDijkstrasSearch.buckets(
+            grid, grid.index(source or grid.start), delta)
+        for _ in buckets:
+            pass
+
+        shape = (grid.height, grid.width)
+        return buckets.dist.reshape(shape), buckets.parents.reshape(shape)
+
+    @staticmethod
+    def buckets(grid: Grid, source: int, delta: int = 1) -> "Buckets":
+        """Settle the cells of a grid bucket by bucket
+
+        Args:
+            grid (Grid): Row-major grid
+            source (int): Index of the cell the paths start from
+            delta (int, optional): Width of the distance buckets.
+            Defaults to 1.
+
+        Raises:
+            ImportError: NumPy is not installed
+
+        Returns:
+            Buckets: Iterator over the settled buckets
+        """
+        return Buckets(grid, source, delta)
+
+
+class Buckets:
+    """Iterator settling the buckets of a BucketedDijkstrasSearch
+
+    Yields the cells settled by every bucket, in index order, and the
+    number of queued cells left. The distances and parent directions
+    found so far are in `dist` and `parents`.
+    """
+
+    def __init__(self, grid: Grid, source: int, delta: int = 1) -> None:
+        if np is None:
+            raise ImportError("NumPy is required for BucketedDijkstrasSearch"
+                              " buckets and distance fields")
+        if delta < 1:
+            raise ValueError(f"Bucket width must be at least 1, got {delta}")
+
+        self.grid = grid
+        self.delta = delta
+
+        # Cost of entering each cell and the move masks, flat
+        self.costs = np.frombuffer(grid.costs, dtype=np.int8).astype(np.int64)
+        self.moves = np.frombuffer(grid.moves, dtype=np.uint8)
+
+        self.dist = np.full(grid.size, UNREACHED, dtype=np.int64)
+        self.parents = np.zeros(grid.size, dtype=np.uint8)
+        self.dist[source] = 0
+
+        # Queued cells, the bucket of a cell follows from its distance so
+        # copies queued before an improvement move along with it
+        self.frontier = np.array([source], dtype=np.int64)
+        self.upper = 0
+        self.pushed = 1
+
+    def __iter__(self) -> Generator[tuple["ndarray", int], None, None]:
+        # Checked by __init__
+        assert np is not None
+
+        dist, parents, costs, moves = \
+            self.dist, self.parents, self.costs, self.moves
+        deltas, width = self.grid.deltas, self.delta
+
+        frontier = self.frontier
+        while len(frontier):
+            keys = dist[frontier] // width
+            bucket = int(keys.min())
+            self.upper = (bucket + 1) * width
+            settled = []
+
+            # Relax the bucket until none of its distances improves
+            current = keys == bucket
+            while current.any():
+                cells = np.unique(frontier[current])
+                settled.append(cells)
+                queued = [frontier[~current]]
+
+                masks = moves[cells]
+                base = dist[cells]
+                for direction, step in enumerate(deltas):
+                    can_move = (masks >> direction & 1).astype(bool)
+                    targets = cells[can_move] + step
+                    cost = base[can_move] + costs[targets]
+
+                    known = dist[targets]
+                    better = (known == UNREACHED) | (cost < known)
+                    targets = targets[better]
+
+                    dist[targets] = cost[better]
+                    parents[targets] = direction + 1
+                    self.pushed += len(targets)
+                    queued.append(targets)
+
+                frontier = np.concatenate(queued)
+                current = dist[frontier] // width == bucket
+
+            self.frontier = frontier
+            yield np.unique(np.concatenate(settled)), len(frontier)
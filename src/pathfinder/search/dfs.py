@@ -1,69 +1,175 @@
-from ..models.grid import Grid
+from array import array
+
+from ..models.arena import SearchArena
+from ..models.budget import SearchBudget
+from ..models.grid import BaseGrid
 from ..models.frontier import StackFrontier
-from ..models.solution import NoSolution, Solution
+from ..models.search_types import TraceLevel
+from ..models.solution import (
+    BudgetExceeded,
+    NoSolution,
+    Solution,
+    SolutionStream,
+    drain,
+)
 
 
 class DepthFirstSearch:
     @staticmethod
-    def search(grid: Grid) -> Solution:
+    def search(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None
+    ) -> Solution:
         """Find path between two points in a grid using Depth First Search
 
         Args:
-            grid (Grid): Grid of points
-            callback (Optional[Visualiser], optional): Callback for 
-            visualisation. Defaults to None.
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state.
+            Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
 
         Returns:
             Solution: Solution found
         """
-        # Create Node for the source cell
-        node = grid.get_node(pos=grid.start)
+        return drain(DepthFirstSearch.stream(
+            grid, arena, trace=trace, budget=budget,
+            batch_size=0))
+
+    @staticmethod
+    def stream(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        batch_size: int = 64
+    ) -> SolutionStream:
+        """Find path between two points in a grid step by step using
+        Depth First Search
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state.
+            Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+            batch_size (int, optional): Expansions per yielded batch, 0
+            to only return the Solution. Defaults to 64.
+
+        Yields:
+            array: Cell indices expanded since the previous batch, empty
+            unless fully traced
 
-        # Instantiate Frontier and add node into it
+        Returns:
+            Solution: Solution found
+        """
+        pos = grid.pos
+        costs = grid.costs
+        start = grid.index(grid.start)
+        end = grid.index(grid.end)
+
+        # Per-query search state, valid where stamped with this generation
+        arena = SearchArena.prepare(grid, arena)
+        generation = arena.reset()
+        parents, closed = arena.parents, arena.closed
+        parents[start] = 0
+
+        # Instantiate Frontier and add the source cell into it
         frontier = StackFrontier()
-        frontier.add(node)
+        frontier.add(start)
 
-        # Keep track of explored positions
-        explored_states = {}
+        # Keep track of explored cells, in order only for a full trace
+        record = trace is TraceLevel.FULL
+        explored = array(grid.index_typecode)
+        expanded, pushed = 0, 1
+        flush_at = batch_size or -1
+
+        # Most cells queued at once, checked before each pop. Cells are
+        # queued once, so every pop is an expansion
+        peak = 1
+
+        # Stop at the budget's limits, checked every few expansions
+        check_at = budget.next_check(0) if budget else -1
 
         while True:
             # Return empty Solution object for no solution
             if frontier.is_empty():
-                return NoSolution([], list(explored_states))
-
-            # Remove node from the frontier
+                return NoSolution(
+                    [],
+                    explored,
+                    decode=pos,
+                    trace=trace,
+                    expanded=expanded,
+                    pushed=pushed,
+                    popped=expanded,
+                    peak_frontier=peak
+                )
+
+            # Remove cell from the frontier
+            if len(frontier) > peak:
+                peak = len(frontier)
             node = frontier.remove()
 
-            # Add current node position the explored set
-            explored_states[node.state] = True
+            # Add current cell into the explored set
+            closed[node] = generation
+            expanded += 1
+            if record:
+                explored.append(node)
+
+            # Hand a batch of expansions to a streaming caller
+            if expanded == flush_at:
+                flush_at += batch_size
+                yield explored[-batch_size:]
 
             # If reached destination point
-            if node.state == grid.end:
+            if node == end:
 
                 # Generate path and return a Solution object
-                cells = []
-
-                path_cost = 0
-
-                temp = node
-                while temp.parent != None:
-                    cells.append(temp.state)
-                    path_cost += temp.cost
-                    temp = temp.parent
-
-                cells.append(grid.start)
-                cells.reverse()
+                path = grid.trace_path(parents, node)
+                path_cost = sum(costs[i] for i in path[1:])
 
                 return Solution(
-                    cells, list(explored_states), path_cost=path_cost)
+                    path,
+                    explored,
+                    path_cost=path_cost,
+                    decode=pos,
+                    trace=trace,
+                    expanded=expanded,
+                    pushed=pushed,
+                    popped=expanded,
+                    peak_frontier=peak
+                )
+
+            # Give up once a limit of the budget is reached
+            if expanded == check_at and budget:
+                limit = budget.exceeded(expanded, len(frontier))
+                if limit:
+                    return BudgetExceeded(
+                        explored,
+                        limit,
+                        expanded,
+                        len(frontier),
+                        decode=pos,
+                        trace=trace,
+                        pushed=pushed,
+                        popped=expanded,
+                        peak_frontier=peak
+                    )
+                check_at = budget.next_check(expanded)
 
             # Determine possible actions
-            for action, state in grid.get_neighbours(node.state).items():
-                if state in explored_states or frontier.contains_state(state):
+            for direction, delta in grid.neighbours(node):
+                state = node + delta
+                if closed[state] == generation \
+                        or frontier.contains_state(state):
                     continue
 
-                new = grid.get_node(pos=state)
-                new.parent = node
-                new.action = action
-
-                frontier.add(node=new)
+                parents[state] = direction + 1
+                pushed += 1
+                frontier.add(state)
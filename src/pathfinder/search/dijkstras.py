@@ -1,77 +1,184 @@
-from ..models.frontier import PriorityQueueFrontier
-from ..models.grid import Grid
-from ..models.solution import NoSolution, Solution
+from array import array
+
+from ..models.arena import SearchArena
+from ..models.budget import SearchBudget
+from ..models.frontier import priority_frontier
+from ..models.grid import BaseGrid
+from ..models.search_types import FrontierKind, TraceLevel
+from ..models.solution import (
+    BudgetExceeded,
+    NoSolution,
+    Solution,
+    SolutionStream,
+    drain,
+)
 
 
 class DijkstrasSearch:
     @staticmethod
-    def search(grid: Grid) -> Solution:
-        """Find path between two points in a grid using A* Search
+    def search(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        frontier_kind: FrontierKind = FrontierKind.BINARY_HEAP
+    ) -> Solution:
+        """Find path between two points in a grid using Dijkstra's Search
 
         Args:
-            grid (Grid): Grid of points
-            callback (Optional[Visualiser], optional): Callback for 
-            visualisation. Defaults to None.
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state.
+            Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+            frontier_kind (FrontierKind, optional): Priority queue of the
+            frontier. Defaults to FrontierKind.BINARY_HEAP.
 
         Returns:
             Solution: Solution found
         """
+        return drain(DijkstrasSearch.stream(
+            grid, arena, trace=trace, budget=budget,
+            frontier_kind=frontier_kind, batch_size=0))
 
-        # Create Node for the source cell
-        node = grid.get_node(pos=grid.start)
-
-        # Instantiate PriorityQueue frontier and add node into it
-        frontier = PriorityQueueFrontier()
-        frontier.add(node)
+    @staticmethod
+    def stream(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        frontier_kind: FrontierKind = FrontierKind.BINARY_HEAP,
+        batch_size: int = 64
+    ) -> SolutionStream:
+        """Find path between two points in a grid step by step using
+        Dijkstra's Search
 
-        # Keep track of G scores
-        distance = {grid.start: 0}
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state.
+            Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+            frontier_kind (FrontierKind, optional): Priority queue of the
+            frontier. Defaults to FrontierKind.BINARY_HEAP.
+            batch_size (int, optional): Expansions per yielded batch, 0
+            to only return the Solution. Defaults to 64.
+
+        Yields:
+            array: Cell indices expanded since the previous batch, empty
+            unless fully traced
 
-        explored = []
+        Returns:
+            Solution: Solution found
+        """
+        pos = grid.pos
+        costs = grid.costs
+        start = grid.index(grid.start)
+        end = grid.index(grid.end)
+
+        # Per-query search state, valid where stamped with this generation
+        arena = SearchArena.prepare(grid, arena)
+        generation = arena.reset()
+        distance, parents = arena.g, arena.parents
+        seen, closed = arena.seen, arena.closed
+
+        # Instantiate PriorityQueue frontier and add the source cell into it.
+        # Distances grow by at most the highest cell cost per move
+        frontier = priority_frontier(frontier_kind, grid.size, grid.max_cost)
+        frontier.add(start)
+        distance[start] = 0
+        parents[start] = 0
+        seen[start] = generation
+
+        # Keep track of explored cells, in order only for a full trace
+        record = trace is TraceLevel.FULL
+        explored = array(grid.index_typecode)
+        expanded, pushed = 0, 1
+        flush_at = batch_size or -1
+
+        # Stop at the budget's limits, checked every few expansions
+        check_at = budget.next_check(0) if budget else -1
 
         while True:
             # Return empty Solution object for no solution
             if frontier.is_empty():
-                return NoSolution([], explored)
-
-            # Remove node from the frontier
+                return NoSolution(
+                    [],
+                    explored,
+                    decode=pos,
+                    trace=trace,
+                    expanded=expanded,
+                    pushed=pushed,
+                    popped=frontier.pops,
+                    peak_frontier=frontier.peak
+                )
+
+            # Remove cell from the frontier, skipping stale entries: the
+            # first pop of a cell carries its best score, later copies
+            # pushed before an improvement are worse and already closed
             node = frontier.pop()
-            if node.state not in explored:
-                explored.append(node.state)
+            if closed[node] == generation:
+                continue
 
-            # If reached destination point
-            if node.state == grid.end:
+            closed[node] = generation
+            expanded += 1
+            if record:
+                explored.append(node)
 
-                # Generate path and return a Solution object
-                cells = []
+            # Hand a batch of expansions to a streaming caller
+            if expanded == flush_at:
+                flush_at += batch_size
+                yield explored[-batch_size:]
 
-                path_cost = 0
-
-                temp = node
-                while temp.parent != None:
-                    cells.append(temp.state)
-                    path_cost += temp.cost
-                    temp = temp.parent
-
-                cells.append(grid.start)
-                cells.reverse()
+            # If reached destination point
+            if node == end:
 
-                return Solution(cells, explored, path_cost=path_cost)
+                # Generate path and return a Solution object
+                path = grid.trace_path(parents, node)
+                path_cost = sum(costs[i] for i in path[1:])
+
+                return Solution(
+                    path,
+                    explored,
+                    path_cost=path_cost,
+                    decode=pos,
+                    trace=trace,
+                    expanded=expanded,
+                    pushed=pushed,
+                    popped=frontier.pops,
+                    peak_frontier=frontier.peak
+                )
+
+            # Give up once a limit of the budget is reached
+            if expanded == check_at and budget:
+                limit = budget.exceeded(expanded, len(frontier))
+                if limit:
+                    return BudgetExceeded(
+                        explored,
+                        limit,
+                        expanded,
+                        len(frontier),
+                        decode=pos,
+                        trace=trace,
+                        pushed=pushed,
+                        popped=frontier.pops,
+                        peak_frontier=frontier.peak
+                    )
+                check_at = budget.next_check(expanded)
 
             # Determine possible actions
-            for action, state in grid.get_neighbours(node.state).items():
-                cost = distance[node.state] + grid.get_cost(state)
+            for direction, delta in grid.neighbours(node):
+                state = node + delta
+                cost = distance[node] + costs[state]
 
-                if state not in distance or cost < distance[state]:
+                if seen[state] != generation or cost < distance[state]:
+                    seen[state] = generation
                     distance[state] = cost
+                    parents[state] = direction + 1
 
-                    n = grid.get_node(pos=state)
-                    n.parent = node
-
-                    if not n.action:
-                        n.action = action
-
-                    frontier.add(
-                        node=n,
-                        priority=cost
-                    )
+                    pushed += 1
+                    frontier.add(state, priority=cost)
@@ -0,0 +1,223 @@
+from array import array
+
+from ..models.arena import SearchArena
+from ..models.budget import SearchBudget
+from ..models.grid import BaseGrid
+from ..models.search_types import TraceLevel
+from ..models.solution import (
+    BudgetExceeded,
+    NoSolution,
+    Solution,
+    SolutionStream,
+    drain,
+)
+from .astar import AStarSearch
+
+
+class FringeSearch:
+    """A* Search without a priority queue, by rising f-score thresholds
+
+    Cells are visited depth first from a `now` stack. A cell whose
+    f-score is within the current threshold is expanded and its children
+    pushed on `now`, the others are put off on a `later` stack. Once
+    `now` runs out, the threshold rises to the lowest f-score put off and
+    `later` becomes `now`. Both stacks are plain lists, so nothing is kept
+    sorted, at the cost of cells being put off once per threshold and
+    reopened when a cheaper way in is found after their expansion.
+
+    It uses the Manhattan distance heuristic of AStarSearch and finds
+    paths as cheap as A*'s.
+    """
+
+    @staticmethod
+    def search(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None
+    ) -> Solution:
+        """Find path between two points in a grid using Fringe Search
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state.
+            Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+
+        Returns:
+            Solution: Solution found
+        """
+        return drain(FringeSearch.stream(
+            grid, arena, trace=trace, budget=budget, batch_size=0))
+
+    @staticmethod
+    def stream(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        batch_size: int = 64
+    ) -> SolutionStream:
+        """Find path between two points in a grid step by step using
+        Fringe Search
+
+        A cell reopened by a cheaper path is expanded, and explored,
+        again.
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state.
+            Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+            batch_size (int, optional): Expansions per yielded batch, 0
+            to only return the Solution. Defaults to 64.
+
+        Yields:
+            array: Cell indices expanded since the previous batch, empty
+            unless fully traced
+
+        Returns:
+            Solution: Solution found
+        """
+        pos = grid.pos
+        costs = grid.costs
+        start = grid.index(grid.start)
+        end = grid.index(grid.end)
+        er, ec = grid.end
+
+        # Per-query search state, valid where stamped with this generation.
+        # A cell is closed while expanded with its current g-score
+        arena = SearchArena.prepare(grid, arena)
+        generation = arena.reset()
+        g_score, parents = arena.g, arena.parents
+        seen, closed = arena.seen, arena.closed
+
+        # Stack entries pack the f-score of a cell when pushed above its
+        # index. Entries of a cell pushed before a cheaper path was found
+        # keep a higher f-score, and are skipped once the cell is closed
+        shift = max(grid.size - 1, 1).bit_length()
+        mask = (1 << shift) - 1
+
+        threshold = AStarSearch.heuristic(grid.start, grid.end)
+        now = [threshold << shift | start]
+        later: list[int] = []
+
+        # Lowest f-score put off, only meaningful while `later` holds cells
+        next_threshold = threshold
+        g_score[start] = 0
+        parents[start] = 0
+        seen[start] = generation
+
+        # Keep track of explored cells, in order only for a full trace
+        record = trace is TraceLevel.FULL
+        explored = array(grid.index_typecode)
+        expanded, pushed = 0, 1
+        flush_at = batch_size or -1
+
+        # Stop at the budget's limits, checked every few expansions
+        check_at = budget.next_check(0) if budget else -1
+
+        while True:
+            if not now:
+                # Return empty Solution object for no solution
+                if not later:
+                    return NoSolution(
+                        [],
+                        explored,
+                        decode=pos,
+                        trace=trace,
+                        expanded=expanded,
+                        pushed=pushed
+                    )
+
+                # Raise the threshold to the cheapest cell put off, and
+                # visit them in the order they were put off
+                threshold = next_threshold
+                later.reverse()
+                now, later = later, []
+
+            entry = now.pop()
+            node = entry & mask
+            if closed[node] == generation:
+                continue
+
+            f_score = entry >> shift
+            if f_score > threshold:
+                if not later or f_score < next_threshold:
+                    next_threshold = f_score
+                later.append(entry)
+                continue
+
+            closed[node] = generation
+            expanded += 1
+            if record:
+                explored.append(node)
+
+            # Hand a batch of expansions to a streaming caller
+            if expanded == flush_at:
+                flush_at += batch_size
+                yield explored[-batch_size:]
+
+            # If reached destination point
+            if node == end:
+                break
+
+            # Give up once a limit of the budget is reached
+            if expanded == check_at and budget:
+                pending = len(now) + len(later)
+                limit = budget.exceeded(expanded, pending)
+                if limit:
+                    return BudgetExceeded(
+                        explored,
+                        limit,
+                        expanded,
+                        pending,
+                        decode=pos,
+                        trace=trace,
+                        pushed=pushed
+                    )
+                check_at = budget.next_check(expanded)
+
+            # Push the children in reverse so the first move is visited
+            # first. A cheaper path reopens a closed cell
+            g = g_score[node]
+            for direction, delta in reversed(grid.neighbours(node)):
+                state = node + delta
+                cost = g + costs[state]
+
+                if seen[state] != generation or cost < g_score[state]:
+                    seen[state] = generation
+                    closed[state] = 0
+                    g_score[state] = cost
+                    parents[state] = direction + 1
+
+                    row, col = pos(state)
+                    f_score = cost + abs(row - er) + abs(col - ec)
+
+                    pushed += 1
+                    if f_score > threshold:
+                        if not later or f_score < next_threshold:
+                            next_threshold = f_score
+                        later.append(f_score << shift | state)
+                    else:
+                        now.append(f_score << shift | state)
+
+        # Generate path and return a Solution object
+        path = grid.trace_path(parents, end)
+        path_cost = sum(costs[i] for i in path[1:])
+
+        return Solution(
+            path,
+            explored,
+            path_cost=path_cost,
+            decode=pos,
+            trace=trace,
+            expanded=expanded,
+            pushed=pushed
+        )
@@ -1,88 +1,211 @@
-from ..models.frontier import PriorityQueueFrontier
-from ..models.grid import Grid
-from ..models.solution import NoSolution, Solution
+from array import array
+
+from ..models.arena import SearchArena
+from ..models.budget import SearchBudget
+from ..models.frontier import priority_frontier
+from ..models.grid import BaseGrid
+from ..models.search_types import FrontierKind, TraceLevel
+from ..models.solution import (
+    BudgetExceeded,
+    NoSolution,
+    Solution,
+    SolutionStream,
+    drain,
+)
 
 
 class GreedyBestFirstSearch:
     @staticmethod
-    def search(grid: Grid) -> Solution:
-        """Find path between two points in a grid using A* Search
+    def search(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        frontier_kind: FrontierKind = FrontierKind.BINARY_HEAP
+    ) -> Solution:
+        """Find path between two points in a grid using Greedy Best First
+        Search
 
         Args:
-            grid (Grid): Grid of points
-            callback (Optional[Visualiser], optional): Callback for 
-            visualisation. Defaults to None.
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state.
+            Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+            frontier_kind (FrontierKind, optional): Priority queue of the
+            frontier, a binary or indexed heap. Defaults to
+            FrontierKind.BINARY_HEAP.
+
+        Raises:
+            ValueError: The frontier needs monotone priorities
 
         Returns:
             Solution: Solution found
         """
-        # Create Node for the source cell
-        node = grid.get_node(pos=grid.start)
+        return drain(GreedyBestFirstSearch.stream(
+            grid, arena, trace=trace, budget=budget,
+            frontier_kind=frontier_kind, batch_size=0))
 
-        # Instantiate PriorityQueue frontier and add node into it
-        frontier = PriorityQueueFrontier()
+    @staticmethod
+    def stream(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        frontier_kind: FrontierKind = FrontierKind.BINARY_HEAP,
+        batch_size: int = 64
+    ) -> SolutionStream:
+        """Find path between two points in a grid step by step using
+        Greedy Best First Search
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state.
+            Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+            frontier_kind (FrontierKind, optional): Priority queue of the
+            frontier, a binary or indexed heap. Defaults to
+            FrontierKind.BINARY_HEAP.
+            batch_size (int, optional): Expansions per yielded batch, 0
+            to only return the Solution. Defaults to 64.
+
+        Raises:
+            ValueError: The frontier needs monotone priorities
+
+        Yields:
+            array: Cell indices expanded since the previous batch, empty
+            unless fully traced
+
+        Returns:
+            Solution: Solution found
+        """
+        # Heuristic values go up and down along a path, which only heaps
+        # can order
+        if frontier_kind not in (FrontierKind.BINARY_HEAP,
+                                 FrontierKind.INDEXED_HEAP):
+            raise ValueError(
+                f"{frontier_kind.value} frontiers need monotone priorities,"
+                " Greedy Best First Search has none")
+
+        pos = grid.pos
+        costs = grid.costs
+        start = grid.index(grid.start)
+        end = grid.index(grid.end)
+
+        # Per-query search state, valid where stamped with this generation
+        arena = SearchArena.prepare(grid, arena)
+        generation = arena.reset()
+        cost_so_far, parents = arena.g, arena.parents
+        seen, closed = arena.seen, arena.closed
+
+        # Instantiate PriorityQueue frontier and add the source cell into it
+        frontier = priority_frontier(frontier_kind, grid.size, 0)
         frontier.add(
-            node,
+            start,
             priority=GreedyBestFirstSearch.heuristic(grid.start, grid.end)
         )
+        cost_so_far[start] = 0
+        parents[start] = 0
+        seen[start] = generation
 
-        # Keep track of G scores
-        cost_so_far = {grid.start: 0}
+        # Keep track of explored cells, in order only for a full trace
+        record = trace is TraceLevel.FULL
+        explored = array(grid.index_typecode)
+        expanded, pushed = 0, 1
+        flush_at = batch_size or -1
 
-        explored = []
+        # Stop at the budget's limits, checked every few expansions
+        check_at = budget.next_check(0) if budget else -1
 
         while True:
             # Return empty Solution object for no solution
             if frontier.is_empty():
-                return NoSolution([], explored)
-
-            # Remove node from the frontier
+                return NoSolution(
+                    [],
+                    explored,
+                    decode=pos,
+                    trace=trace,
+                    expanded=expanded,
+                    pushed=pushed,
+                    popped=frontier.pops,
+                    peak_frontier=frontier.peak
+                )
+
+            # Remove cell from the frontier, every cell is pushed once
             node = frontier.pop()
-            if node.state not in explored:
-                explored.append(node.state)
+            closed[node] = generation
+            expanded += 1
+            if record:
+                explored.append(node)
+
+            # Hand a batch of expansions to a streaming caller
+            if expanded == flush_at:
+                flush_at += batch_size
+                yield explored[-batch_size:]
 
             # If reached destination point
-            if node.state == grid.end:
+            if node == end:
 
                 # Generate path and return a Solution object
-                cells = []
-
-                path_cost = 0
-
-                temp = node
-                while temp.parent != None:
-                    cells.append(temp.state)
-                    path_cost += temp.cost
-                    temp = temp.parent
-
-                cells.append(grid.start)
-                cells.reverse()
-
-                return Solution(cells, explored, path_cost=path_cost)
-
-            # Determine possible actions
-            for action, state in grid.get_neighbours(node.state).items():
-                new_cost = cost_so_far[node.state] + grid.get_cost(state)
-
-                if state not in cost_so_far or new_cost < cost_so_far[state]:
-                    cost_so_far[state] = new_cost
-
-                    n = grid.get_node(pos=state)
-                    n.parent = node
-                    n.estimated_distance = GreedyBestFirstSearch.heuristic(
-                        state,
-                        grid.end
+                path = grid.trace_path(parents, node)
+                path_cost = sum(costs[i] for i in path[1:])
+
+                return Solution(
+                    path,
+                    explored,
+                    path_cost=path_cost,
+                    decode=pos,
+                    trace=trace,
+                    expanded=expanded,
+                    pushed=pushed,
+                    popped=frontier.pops,
+                    peak_frontier=frontier.peak
+                )
+
+            # Give up once a limit of the budget is reached
+            if expanded == check_at and budget:
+                limit = budget.exceeded(expanded, len(frontier))
+                if limit:
+                    return BudgetExceeded(
+                        explored,
+                        limit,
+                        expanded,
+                        len(frontier),
+                        decode=pos,
+                        trace=trace,
+                        pushed=pushed,
+                        popped=frontier.pops,
+                        peak_frontier=frontier.peak
                     )
+                check_at = budget.next_check(expanded)
 
-                    if not n.action:
-                        n.action = action
-
+            # Determine possible actions
+            for direction, delta in grid.neighbours(node):
+                state = node + delta
+                new_cost = cost_so_far[node] + costs[state]
+
+                # The priority only depends on the position, so a cell is
+                # pushed when first reached and later improvements just
+                # update its cost and parent
+                if seen[state] != generation:
+                    seen[state] = generation
+                    pushed += 1
                     frontier.add(
-                        node=n,
+                        state,
                         priority=GreedyBestFirstSearch.heuristic(
-                            state, grid.end
+                            pos(state), grid.end
                         )
                     )
+                elif new_cost >= cost_so_far[state]:
+                    continue
+
+                cost_so_far[state] = new_cost
+                parents[state] = direction + 1
 
     @staticmethod
     def heuristic(state: tuple[int, int], goal: tuple[int, int]) -> int:
@@ -0,0 +1,310 @@
+from array import array
+
+from ..models.arena import SearchArena
+from ..models.budget import SearchBudget
+from ..models.frontier import PriorityQueueFrontier
+from ..models.grid import BaseGrid, Grid
+from ..models.search_types import TraceLevel
+from ..models.solution import (
+    BudgetExceeded,
+    NoSolution,
+    Solution,
+    SolutionStream,
+    drain,
+)
+from .astar import AStarSearch
+
+
+class JumpPointSearch:
+    """A* Search over jump points, for grids where every move costs 1
+
+    Instead of pushing every neighbour, a search runs along straight lines
+    from the cell it expands and only pushes the cells where a path could
+    turn: cells next to the corner of a wall (forced neighbours), the goal,
+    and cells of a vertical run with such a cell to their left or right.
+    The pruning rules are the 4-connected ones of PathFinding.js.
+
+    Horizontal runs scan per-search byte maps of their stopping cells with
+    bytes.find, vertical runs step cell by cell. The path is returned cell
+    by cell, the cells between jump points filled in.
+
+    Grids with weighted cells, and grids other than row-major Grids, run
+    AStarSearch instead.
+    """
+
+    @staticmethod
+    def search(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None
+    ) -> Solution:
+        """Find path between two points in a grid using Jump Point Search
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state.
+            Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+
+        Returns:
+            Solution: Solution found
+        """
+        return drain(JumpPointSearch.stream(
+            grid, arena, trace=trace, budget=budget, batch_size=0))
+
+    @staticmethod
+    def stream(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        batch_size: int = 64
+    ) -> SolutionStream:
+        """Find path between two points in a grid step by step using
+        Jump Point Search
+
+        Only jump points are expanded, so the explored cells are the jump
+        points rather than every cell scanned.
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state.
+            Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+            batch_size (int, optional): Expansions per yielded batch, 0
+            to only return the Solution. Defaults to 64.
+
+        Yields:
+            array: Cell indices expanded since the previous batch, empty
+            unless fully traced
+
+        Returns:
+            Solution: Solution found
+        """
+        if type(grid) is not Grid or grid.weighted:
+            return (yield from AStarSearch.stream(
+                grid, arena, trace=trace, budget=budget,
+                batch_size=batch_size))
+
+        pos = grid.pos
+        costs, walls = grid.costs, grid.walls
+        width, height, size = grid.width, grid.height, grid.size
+        deltas = grid.deltas
+        start = grid.index(grid.start)
+        end = grid.index(grid.end)
+        er, ec = grid.end
+
+        # Per-query search state, valid where stamped with this generation.
+        # Parents hold the direction of the run into a jump point, and
+        # `origins` the jump point that run started from
+        arena = SearchArena.prepare(grid, arena)
+        generation = arena.reset()
+        g_score, parents = arena.g, arena.parents
+        seen, closed = arena.seen, arena.closed
+        origins: dict[int, int] = {}
+
+        stop_left, stop_right = JumpPointSearch.stops(grid)
+        stop_left[end] = stop_right[end] = 1
+
+        def jump(node: int, direction: int) -> int:
+            """Next jump point of a run, -1 when it ends in a wall"""
+            if direction >= 2:
+                # Horizontal runs stop at walls, forced neighbours and the
+                # goal, whichever comes first
+                row_start = node - node % width
+                if direction == 3:
+                    found = stop_right.find(1, node + 1, row_start + width)
+                else:
+                    found = stop_left.rfind(1, row_start, node)
+                return -1 if found < 0 or walls[found] else found
+
+            step = deltas[direction]
+            col = node % width
+            node += step
+            while 0 <= node < size and not walls[node]:
+                if node == end:
+                    return node
+
+                # Forced neighbours, an open side cell whose cell behind
+                # is a wall
+                if col > 0 and not walls[node - 1] \
+                        and walls[node - 1 - step]:
+                    return node
+                if col < width - 1 and not walls[node + 1] \
+                        and walls[node + 1 - step]:
+                    return node
+
+                # Cells a horizontal run turns from
+                row_start = node - col
+                found = stop_left.rfind(1, row_start, node)
+                if found >= 0 and not walls[found]:
+                    return node
+                found = stop_right.find(1, node + 1, row_start + width)
+                if found >= 0 and not walls[found]:
+                    return node
+                node += step
+            return -1
+
+        # Instantiate PriorityQueue frontier and add the source cell into it
+        h = AStarSearch.heuristic(grid.start, grid.end)
+        frontier = PriorityQueueFrontier(
+            grid.size, tie_bits=(width + height).bit_length())
+        frontier.add(start, priority=h, tie=h)
+        g_score[start] = 0
+        parents[start] = 0
+        seen[start] = generation
+
+        # Keep track of explored cells, in order only for a full trace
+        record = trace is TraceLevel.FULL
+        explored = array(grid.index_typecode)
+        expanded, pushed = 0, 1
+        flush_at = batch_size or -1
+
+        # Stop at the budget's limits, checked every few expansions
+        check_at = budget.next_check(0) if budget else -1
+
+        while True:
+            # Return empty Solution object for no solution
+            if frontier.is_empty():
+                return NoSolution(
+                    [],
+                    explored,
+                    decode=pos,
+                    trace=trace,
+                    expanded=expanded,
+                    pushed=pushed,
+                    popped=frontier.pops,
+                    peak_frontier=frontier.peak
+                )
+
+            # Remove jump point from the frontier, skipping stale entries
+            node = frontier.pop()
+            if closed[node] == generation:
+                continue
+
+            closed[node] = generation
+            expanded += 1
+            if record:
+                explored.append(node)
+
+            # Hand a batch of expansions to a streaming caller
+            if expanded == flush_at:
+                flush_at += batch_size
+                yield explored[-batch_size:]
+
+            # If reached destination point
+            if node == end:
+                break
+
+            # Give up once a limit of the budget is reached
+            if expanded == check_at and budget:
+                limit = budget.exceeded(expanded, len(frontier))
+                if limit:
+                    return BudgetExceeded(
+                        explored,
+                        limit,
+                        expanded,
+                        len(frontier),
+                        decode=pos,
+                        trace=trace,
+                        pushed=pushed,
+                        popped=frontier.pops,
+                        peak_frontier=frontier.peak
+                    )
+                check_at = budget.next_check(expanded)
+
+            # Runs to follow: all four from the start, otherwise straight
+            # on and both sides of the run that reached the jump point
+            if parents[node]:
+                direction = parents[node] - 1
+                sides = (2, 3) if direction < 2 else (0, 1)
+                runs = (direction, *sides)
+            else:
+                runs = (0, 1, 2, 3)
+
+            moves = grid.moves[node]
+            for direction in runs:
+                if not moves >> direction & 1:
+                    continue
+
+                state = jump(node, direction)
+                if state < 0:
+                    continue
+
+                cost = g_score[node] + (state - node) // deltas[direction]
+                if seen[state] != generation or cost < g_score[state]:
+                    seen[state] = generation
+                    g_score[state] = cost
+                    parents[state] = direction + 1
+                    origins[state] = node
+
+                    row, col = pos(state)
+                    h = abs(row - er) + abs(col - ec)
+
+                    pushed += 1
+                    frontier.add(state, priority=cost + h, tie=h)
+
+        # Generate path, filling in the runs between jump points, and
+        # return a Solution object
+        path = [end]
+        node = end
+        while node != start:
+            step = deltas[parents[node] - 1]
+            origin = origins[node]
+            while node != origin:
+                node -= step
+                path.append(node)
+        path.reverse()
+        path_cost = sum(costs[i] for i in path[1:])
+
+        return Solution(
+            path,
+            explored,
+            path_cost=path_cost,
+            decode=pos,
+            trace=trace,
+            expanded=expanded,
+            pushed=pushed,
+            popped=frontier.pops,
+            peak_frontier=frontier.peak
+        )
+
+    @staticmethod
+    def stops(grid: Grid) -> tuple[bytearray, bytearray]:
+        """Cells a horizontal run stops at, in each direction
+
+        A run stops at a wall, or at an open cell with an open cell above
+        or below it whose neighbour behind is a wall, i.e. a forced
+        neighbour.
+
+        Args:
+            grid (Grid): Row-major grid
+
+        Returns:
+            tuple[bytearray, bytearray]: 1 for the cells runs going left
+            and right stop at, 0 for the others
+        """
+        width, size = grid.width, grid.size
+        walls = int.from_bytes(grid.walls, "little")
+        passable = walls ^ int.from_bytes(b"\x01" * size, "little")
+
+        # Every byte is 0 or 1, so whole rows of cells are shifted and
+        # combined without carries using big integer arithmetic. Bits
+        # shifted past either end of the grid fall out of the mask
+        above, below = passable << 8 * width, passable >> 8 * width
+        mask = (1 << 8 * size) - 1
+
+        left = walls | (above & walls << 8 * (width - 1)) \
+            | (below & walls >> 8 * (width + 1))
+        right = walls | (above & walls << 8 * (width + 1)) \
+            | (below & walls >> 8 * (width - 1))
+
+        return (bytearray((left & mask).to_bytes(size, "little")),
+                bytearray((right & mask).to_bytes(size, "little")))
@@ -0,0 +1,386 @@
+from array import array
+
+from ..models.arena import SearchArena
+from ..models.budget import SearchBudget
+from ..models.frontier import PriorityQueueFrontier
+from ..models.grid import DOWN, RIGHT, UP, BaseGrid, Grid
+from ..models.search_types import TraceLevel
+from ..models.solution import (
+    BudgetExceeded,
+    NoSolution,
+    Solution,
+    SolutionStream,
+    drain,
+)
+from .astar import AStarSearch
+from .jps import JumpPointSearch
+
+
+class JumpPointPlusSearch:
+    """Jump Point Search reading its runs from precomputed tables (JPS+)
+
+    For every cell and direction, `jump_tables` stores how far a run goes:
+    a positive distance to the next jump point, or minus the number of
+    cells that can be crossed before a wall or the edge of the grid. The
+    jump points are those of JumpPointSearch without the goal, so the
+    tables only depend on the walls. They are built once per grid, kept
+    on it and dropped by Grid.set_cost when a wall changes, so every
+    query on a static map only looks distances up.
+
+    The goal, different for each query, stops the runs crossing its row.
+    It falls back like JumpPointSearch, and no tables are built for the
+    grids it falls back on.
+    """
+
+    @staticmethod
+    def search(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None
+    ) -> Solution:
+        """Find path between two points in a grid using JPS+
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state.
+            Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+
+        Returns:
+            Solution: Solution found
+        """
+        return drain(JumpPointPlusSearch.stream(
+            grid, arena, trace=trace, budget=budget, batch_size=0))
+
+    @staticmethod
+    def stream(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        batch_size: int = 64
+    ) -> SolutionStream:
+        """Find path between two points in a grid step by step using JPS+
+
+        Only jump points are expanded, so the explored cells are the jump
+        points rather than every cell crossed.
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state.
+            Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+            batch_size (int, optional): Expansions per yielded batch, 0
+            to only return the Solution. Defaults to 64.
+
+        Yields:
+            array: Cell indices expanded since the previous batch, empty
+            unless fully traced
+
+        Returns:
+            Solution: Solution found
+        """
+        if type(grid) is not Grid or grid.weighted:
+            return (yield from AStarSearch.stream(
+                grid, arena, trace=trace, budget=budget,
+                batch_size=batch_size))
+
+        pos = grid.pos
+        costs, deltas = grid.costs, grid.deltas
+        width, height = grid.width, grid.height
+        start = grid.index(grid.start)
+        end = grid.index(grid.end)
+        er, ec = grid.end
+        tables = JumpPointPlusSearch.jump_tables(grid)
+
+        # Per-query search state, valid where stamped with this generation.
+        # Parents hold the direction of the run into a jump point, and
+        # `origins` the jump point that run started from
+        arena = SearchArena.prepare(grid, arena)
+        generation = arena.reset()
+        g_score, parents = arena.g, arena.parents
+        seen, closed = arena.seen, arena.closed
+        origins: dict[int, int] = {}
+
+        # Instantiate PriorityQueue frontier and add the source cell into it
+        h = AStarSearch.heuristic(grid.start, grid.end)
+        frontier = PriorityQueueFrontier(
+            grid.size, tie_bits=(width + height).bit_length())
+        frontier.add(start, priority=h, tie=h)
+        g_score[start] = 0
+        parents[start] = 0
+        seen[start] = generation
+
+        # Keep track of explored cells, in order only for a full trace
+        record = trace is TraceLevel.FULL
+        explored = array(grid.index_typecode)
+        expanded, pushed = 0, 1
+        flush_at = batch_size or -1
+
+        # Stop at the budget's limits, checked every few expansions
+        check_at = budget.next_check(0) if budget else -1
+
+        while True:
+            # Return empty Solution object for no solution
+            if frontier.is_empty():
+                return NoSolution(
+                    [],
+                    explored,
+                    decode=pos,
+                    trace=trace,
+                    expanded=expanded,
+                    pushed=pushed,
+                    popped=frontier.pops,
+                    peak_frontier=frontier.peak
+                )
+
+            # Remove jump point from the frontier, skipping stale entries
+            node = frontier.pop()
+            if closed[node] == generation:
+                continue
+
+            closed[node] = generation
+            expanded += 1
+            if record:
+                explored.append(node)
+
+            # Hand a batch of expansions to a streaming caller
+            if expanded == flush_at:
+                flush_at += batch_size
+                yield explored[-batch_size:]
+
+            # If reached destination point
+            if node == end:
+                break
+
+            # Give up once a limit of the budget is reached
+            if expanded == check_at and budget:
+                limit = budget.exceeded(expanded, len(frontier))
+                if limit:
+                    return BudgetExceeded(
+                        explored,
+                        limit,
+                        expanded,
+                        len(frontier),
+                        decode=pos,
+                        trace=trace,
+                        pushed=pushed,
+                        popped=frontier.pops,
+                        peak_frontier=frontier.peak
+                    )
+                check_at = budget.next_check(expanded)
+
+            # Runs to follow: all four from the start, otherwise straight
+            # on and both sides of the run that reached the jump point
+            if parents[node]:
+                direction = parents[node] - 1
+                sides = (2, 3) if direction < 2 else (0, 1)
+                runs = (direction, *sides)
+            else:
+                runs = (0, 1, 2, 3)
+
+            row, col = divmod(node, width)
+            for direction in runs:
+                distance = tables[direction][node]
+                reach = distance if distance > 0 else -distance
+
+                # Cells of the run before the goal's row or column
+                if direction == UP:
+                    to_goal = row - er
+                elif direction == DOWN:
+                    to_goal = er - row
+                elif row != er:
+                    to_goal = 0
+                elif direction == RIGHT:
+                    to_goal = ec - col
+                else:
+                    to_goal = col - ec
+
+                if 0 < to_goal <= reach:
+                    distance = to_goal
+                elif distance <= 0:
+                    continue
+
+                state = node + distance * deltas[direction]
+                cost = g_score[node] + distance
+                if seen[state] != generation or cost < g_score[state]:
+                    seen[state] = generation
+                    g_score[state] = cost
+                    parents[state] = direction + 1
+                    origins[state] = node
+
+                    srow, scol = divmod(state, width)
+                    h = abs(srow - er) + abs(scol - ec)
+
+                    pushed += 1
+                    frontier.add(state, priority=cost + h, tie=h)
+
+        # Generate path, filling in the runs between jump points, and
+        # return a Solution object
+        path = [end]
+        node = end
+        while node != start:
+            step = deltas[parents[node] - 1]
+            origin = origins[node]
+            while node != origin:
+                node -= step
+                path.append(node)
+        path.reverse()
+        path_cost = sum(costs[i] for i in path[1:])
+
+        return Solution(
+            path,
+            explored,
+            path_cost=path_cost,
+            decode=pos,
+            trace=trace,
+            expanded=expanded,
+            pushed=pushed,
+            popped=frontier.pops,
+            peak_frontier=frontier.peak
+        )
+
+    @staticmethod
+    def jump_tables(grid: Grid) -> tuple[array, array, array, array]:
+        """Get the jump distances of a grid, building them on first use
+
+        Args:
+            grid (Grid): Row-major grid
+
+        Returns:
+            tuple[array, array, array, array]: Jump distance of every cell
+            going up, down, left and right. Positive distances lead to a
+            jump point, others are minus the open cells ahead of a wall or
+            edge. Values of walls are meaningless
+        """
+        if grid.jump_tables is None:
+            grid.jump_tables = JumpPointPlusSearch.build_tables(grid)
+
+        return grid.jump_tables
+
+    @staticmethod
+    def build_tables(grid: Grid) -> tuple[array, array, array, array]:
+        """Compute the jump distances of a grid, see `jump_tables`
+
+        Args:
+            grid (Grid): Row-major grid
+
+        Returns:
+            tuple[array, array, array, array]: Up, down, left and right
+            jump distances
+        """
+        width, height, size = grid.width, grid.height, grid.size
+        walls = bytes(grid.walls)
+
+        # Distances fit 16 bits on grids up to 32768 cells wide and high
+        longest = max(width, height)
+        typecode = "h" if longest <= 1 << 15 else "i"
+        empty = bytes(size * array(typecode).itemsize)
+        up, down, left, right = tables = (
+            array(typecode, empty), array(typecode, empty),
+            array(typecode, empty), array(typecode, empty))
+
+        # Distance ramps sliced into runs, n..1 and -(n-1)..0
+        ramp = array(typecode, range(longest, 0, -1))
+        free = array(typecode, range(1 - longest, 1))
+
+        def runs(stops: bytes, blocked: bytes) -> tuple[array, bytearray]:
+            """Jump distances along a line and whether they reach a jump
+            point, moving towards the end of the line"""
+            length = len(stops)
+            line = array(typecode, bytes(length * ramp.itemsize))
+            reaches = bytearray(length)
+
+            # Each cell runs to the first stop after it, one slice per stop
+            first = 0
+            while first < length:
+                found = stops.find(1, first + 1)
+                if found < 0:
+                    found = length
+                cells = found - first
+                if found == length or blocked[found]:
+                    line[first:found] = free[longest - cells:]
+                else:
+                    line[first:found] = ramp[longest - cells:]
+                    reaches[first:found] = b"\x01" * cells
+                first = found
+
+            return line, reaches
+
+        def reverse(stops: bytes, blocked: bytes) -> tuple[array, bytearray]:
+            """Jump distances along a line moving towards its start"""
+            line, reaches = runs(stops[::-1], blocked[::-1])
+            line.reverse()
+            return line, reaches[::-1]
+
+        # Horizontal runs stop at walls and forced neighbours
+        stop_left, stop_right = map(bytes, JumpPointSearch.stops(grid))
+        turns = bytearray(size)
+        for first in range(0, size, width):
+            row = slice(first, first + width)
+            left[row], turns_left = reverse(stop_left[row], walls[row])
+            right[row], turns_right = runs(stop_right[row], walls[row])
+            turns[row] = (int.from_bytes(turns_left, "little")
+                          | int.from_bytes(turns_right, "little")
+                          ).to_bytes(width, "little")
+
+        # Vertical runs also stop at the cells a horizontal run leaves from
+        stop_up, stop_down = JumpPointPlusSearch.vertical_stops(grid, turns)
+        for col in range(width):
+            column = slice(col, size, width)
+            up[column], _ = reverse(stop_up[column], walls[column])
+            down[column], _ = runs(stop_down[column], walls[column])
+
+        return tables
+
+    @staticmethod
+    def vertical_stops(
+        grid: Grid,
+        turns: bytes | bytearray
+    ) -> tuple[bytes, bytes]:
+        """Cells a vertical run stops at, in each direction
+
+        A run stops at a wall, at an open cell with an open cell to its
+        left or right whose neighbour behind is a wall, i.e. a forced
+        neighbour, and at the cells a horizontal run reaches a jump point
+        from.
+
+        Args:
+            grid (Grid): Row-major grid
+            turns (bytes | bytearray): 1 for the cells a horizontal run
+            reaches a jump point from
+
+        Returns:
+            tuple[bytes, bytes]: 1 for the cells runs going up and down
+            stop at, 0 for the others
+        """
+        width, size = grid.width, grid.size
+        walls = int.from_bytes(grid.walls, "little")
+        passable = walls ^ int.from_bytes(b"\x01" * size, "little")
+
+        # Open cells on either side, cleared where the side is past the
+        # edge of the grid rather than on the next or previous row
+        on_left = (passable << 8) & int.from_bytes(
+            (b"\x00" + b"\x01" * (width - 1)) * grid.height, "little")
+        on_right = (passable >> 8) & int.from_bytes(
+            (b"\x01" * (width - 1) + b"\x00") * grid.height, "little")
+
+        # Every byte is 0 or 1, so the maps are combined without carries
+        # using big integer arithmetic
+        stops = walls | int.from_bytes(turns, "little")
+        mask = (1 << 8 * size) - 1
+
+        up = stops | (on_left & walls >> 8 * (width - 1)) \
+            | (on_right & walls >> 8 * (width + 1))
+        down = stops | (on_left & walls << 8 * (width + 1)) \
+            | (on_right & walls << 8 * (width - 1))
+
+        return ((up & mask).to_bytes(size, "little"),
+                (down & mask).to_bytes(size, "little"))
@@ -0,0 +1,410 @@
+from array import array
+from collections import OrderedDict, deque
+from heapq import heappop, heappush
+from string import Template
+from typing import Callable, TypeGuard
+
+from ..models.arena import SearchArena
+from ..models.grid import DOWN, LEFT, RIGHT, UP, BaseGrid, Grid
+from ..models.search_types import Search, TieBreak, TraceLevel
+from ..models.solution import NoSolution, Solution
+
+Kernel = Callable[[Grid, SearchArena | None], Solution]
+
+# Moves of a 4-connected grid: (direction, row delta, col delta)
+CONNECTIVITY = 4
+MOVES = ((UP, -1, 0), (DOWN, 1, 0), (LEFT, 0, -1), (RIGHT, 0, 1))
+
+# Number of kernels kept compiled, the least recently used one is dropped
+# past it
+CACHE_KERNELS = 64
+
+# Set-up shared by every kernel, followed by the algorithm's main loop
+PROLOGUE = """
+def search(grid, arena=None):
+    costs = grid.costs
+    moves = grid.moves
+    start = grid.index(grid.start)
+    end = grid.index(grid.end)
+    er, ec = grid.end
+
+    arena = SearchArena.prepare(grid, arena)
+    generation = arena.reset()
+    g, parents = arena.g, arena.parents
+    seen, closed = arena.seen, arena.closed
+    g[start] = 0
+    parents[start] = 0
+    seen[start] = generation
+
+    explored = array(grid.index_typecode)
+    append = explored.append
+    expanded, pushed = 0, 1
+"""
+
+# Best-first searches over packed heap keys (priority | tie | index)
+BEST_FIRST = """
+    sr, sc = grid.start
+    h = abs(sr - er) + abs(sc - ec)
+    heap = [((${start_priority} << $tie_bits | ${start_tie}) << $index_bits)
+            | start]
+
+    peak = 1
+
+    while heap:
+        node = heappop(heap) & $index_mask
+        if closed[node] == generation:
+            continue
+
+        closed[node] = generation
+        $record
+        if node == end:
+            return finish(grid, parents, explored, node, expanded, pushed,
+                          tie_break, trace, pushed - len(heap), peak)
+
+        m = moves[node]
+        gn = g[node]
+        r, c = divmod(node, $width)
+$neighbours
+        $peak
+    return finish(grid, parents, explored, None, expanded, pushed,
+                  tie_break, trace, pushed, peak)
+"""
+
+# Relaxation of one move for A*, Dijkstra's Search and GBFS
+RELAX = {
+    Search.ASTAR_SEARCH: """
+        if m & $bit:
+            nxt = node + $delta
+            cost = gn + costs[nxt]
+            if seen[nxt] != generation or cost < g[nxt]:
+                seen[nxt] = generation
+                g[nxt] = cost
+                parents[nxt] = $parent
+                h = abs(r + $dr - er) + abs(c + $dc - ec)
+                $push
+                heappush(heap, ((cost + h << $tie_bits | h) << $index_bits)
+                         | nxt)
+""",
+    Search.DIJKSTRAS_SEARCH: """
+        if m & $bit:
+            nxt = node + $delta
+            cost = gn + costs[nxt]
+            if seen[nxt] != generation or cost < g[nxt]:
+                seen[nxt] = generation
+                g[nxt] = cost
+                parents[nxt] = $parent
+                $push
+                heappush(heap, cost << $index_bits | nxt)
+""",
+    Search.GREEDY_BEST_FIRST_SEARCH: """
+        if m & $bit:
+            nxt = node + $delta
+            cost = gn + costs[nxt]
+            if seen[nxt] != generation:
+                seen[nxt] = generation
+                g[nxt] = cost
+                parents[nxt] = $parent
+                h = abs(r + $dr - er) + abs(c + $dc - ec)
+                $push
+                heappush(heap, h << $index_bits | nxt)
+            elif cost < g[nxt]:
+                g[nxt] = cost
+                parents[nxt] = $parent
+""",
+}
+
+# Uninformed searches, `seen` marks cells that were ever queued
+UNINFORMED = """
+    frontier = deque([start])
+    remove = frontier.${remove}
+    add = frontier.append
+
+    peak = 1
+
+    while frontier:
+        node = remove()
+        closed[node] = generation
+        $record
+        if node == end:
+            return finish(grid, parents, explored, node, expanded, pushed,
+                          tie_break, trace, pushed - len(frontier), peak)
+
+        m = moves[node]
+$neighbours
+        $peak
+    return finish(grid, parents, explored, None, expanded, pushed,
+                  tie_break, trace, pushed, peak)
+"""
+
+VISIT = """
+        if m & $bit:
+            nxt = node + $delta
+            if seen[nxt] != generation:
+                seen[nxt] = generation
+                parents[nxt] = $parent
+                $push
+                add(nxt)
+"""
+
+# Priority and tie of the start cell in the packed key
+START_KEY = {
+    Search.ASTAR_SEARCH: ("h", "h"),
+    Search.DIJKSTRAS_SEARCH: ("0", "0"),
+    Search.GREEDY_BEST_FIRST_SEARCH: ("h", "0"),
+}
+
+QUEUE_REMOVE = {
+    Search.BREADTH_FIRST_SEARCH: "popleft",
+    Search.DEPTH_FIRST_SEARCH: "pop",
+}
+
+# Bookkeeping of an expansion and of a push for each trace level
+TRACE_RECORD = {
+    TraceLevel.NONE: "pass",
+    TraceLevel.COUNTS: "expanded += 1",
+    TraceLevel.FULL: "append(node)",
+}
+
+TRACE_PUSH = {
+    TraceLevel.NONE: "pass",
+    TraceLevel.COUNTS: "pushed += 1",
+    TraceLevel.FULL: "pushed += 1",
+}
+
+# Most entries queued at once, as the frontiers count them before each
+# pop. The queue only grows by the pushes of an expansion, so it is
+# checked once they are done. The entries popped are the pushed ones no
+# longer queued
+COUNT_PEAK = """if len($queue) > peak:
+            peak = len($queue)"""
+
+TRACE_PEAK = {
+    TraceLevel.NONE: "pass",
+    TraceLevel.COUNTS: COUNT_PEAK,
+    TraceLevel.FULL: COUNT_PEAK,
+}
+
+
+def finish(
+    grid: BaseGrid,
+    parents: bytearray,
+    explored: array,
+    end: int | None,
+    expanded: int,
+    pushed: int,
+    tie_break: TieBreak | None = None,
+    trace: TraceLevel = TraceLevel.FULL,
+    popped: int | None = None,
+    peak: int | None = None
+) -> Solution:
+    """Build the Solution of a kernel run
+
+    Args:
+        grid (BaseGrid): Searched grid
+        parents (bytearray): Parent directions of the run
+        explored (array): Explored cells in order, for a full trace
+        end (int | None): Goal cell, None if not reached
+        expanded (int): Number of expanded cells, unless fully traced
+        pushed (int): Number of pushed cells
+        tie_break (TieBreak | None, optional): Tie-breaking policy of the
+        kernel. Defaults to None.
+        trace (TraceLevel, optional): Trace level of the kernel.
+        Defaults to TraceLevel.FULL.
+        popped (int | None, optional): Number of queued entries popped.
+        Defaults to None.
+        peak (int | None, optional): Most entries queued at once.
+        Defaults to None.
+
+    Returns:
+        Solution: Solution found
+    """
+    # A full trace counts expansions by recording them
+    if trace is TraceLevel.FULL:
+        expanded = len(explored)
+
+    if end is None:
+        return NoSolution(
+            [],
+            explored,
+            tie_break=tie_break,
+            decode=grid.pos,
+            trace=trace,
+            expanded=expanded,
+            pushed=pushed,
+            popped=popped,
+            peak_frontier=peak
+        )
+
+    path = grid.trace_path(parents, end)
+    path_cost = sum(grid.costs[i] for i in path[1:])
+
+    return Solution(
+        path,
+        explored,
+        path_cost=path_cost,
+        tie_break=tie_break,
+        decode=grid.pos,
+        trace=trace,
+        expanded=expanded,
+        pushed=pushed,
+        popped=popped,
+        peak_frontier=peak
+    )
+
+
+class GridKernels:
+    """Search functions specialised for one grid shape
+
+    The generic searches look neighbours and heuristics up through the
+    grid on every expansion. A kernel is generated source with the grid
+    width, the move offsets, the heuristic and the heap key layout
+    inlined as constants, and with only the bookkeeping of its trace
+    level. Kernels are cached per (algorithm, shape, connectivity, trace
+    level), so every query on a shape reuses the same function, up to
+    CACHE_KERNELS of them.
+    """
+
+    cache: OrderedDict[tuple[Search, int, int, int, TraceLevel], Kernel] = \
+        OrderedDict()
+
+    @staticmethod
+    def supports(grid: BaseGrid, search: Search) -> TypeGuard[Grid]:
+        """Check whether a kernel can run a search on a grid
+
+        Args:
+            grid (BaseGrid): Grid to search
+            search (Search): Search algorithm
+
+        Returns:
+            TypeGuard[Grid]: Whether a kernel is available, only for a
+            row-major Grid
+        """
+        return type(grid) is Grid \
+            and (search in RELAX or search in QUEUE_REMOVE)
+
+    @staticmethod
+    def get(
+        grid: BaseGrid,
+        search: Search,
+        trace: TraceLevel = TraceLevel.FULL
+    ) -> Kernel:
+        """Get the kernel of a search for a grid's shape
+
+        Args:
+            grid (BaseGrid): Grid to search
+            search (Search): Search algorithm
+            trace (TraceLevel, optional): What the kernel records of the
+            explored cells. Defaults to TraceLevel.FULL.
+
+        Returns:
+            Kernel: Specialised search function
+        """
+        key = (search, grid.width, grid.height, CONNECTIVITY, trace)
+        cache = GridKernels.cache
+
+        kernel = cache.get(key)
+        if kernel is not None:
+            cache.move_to_end(key)
+            return kernel
+
+        kernel = cache[key] = GridKernels.build(
+            search, grid.width, grid.height, trace)
+        if len(cache) > CACHE_KERNELS:
+            cache.popitem(last=False)
+
+        return kernel
+
+    @staticmethod
+    def source(
+        search: Search,
+        width: int,
+        height: int,
+        trace: TraceLevel = TraceLevel.FULL
+    ) -> str:
+        """Generate the source code of a kernel
+
+        Args:
+            search (Search): Search algorithm
+            width (int): Grid width
+            height (int): Grid height
+            trace (TraceLevel, optional): What the kernel records of the
+            explored cells. Defaults to TraceLevel.FULL.
+
+        Returns:
+            str: Python source defining `search(grid, arena=None)`
+        """
+        index_bits = max(width * height - 1, 1).bit_length()
+        constants = {
+            "width": width,
+            "index_bits": index_bits,
+            "index_mask": (1 << index_bits) - 1,
+            "tie_bits": (width + height).bit_length()
+            if search is Search.ASTAR_SEARCH else 0,
+            "record": TRACE_RECORD[trace],
+            "push": TRACE_PUSH[trace],
+        }
+
+        if search in RELAX:
+            body, step, queue = BEST_FIRST, RELAX[search], "heap"
+            constants["start_priority"], constants["start_tie"] = \
+                START_KEY[search]
+        else:
+            body, step, queue = UNINFORMED, VISIT, "frontier"
+            constants["remove"] = QUEUE_REMOVE[search]
+        constants["peak"] = Template(TRACE_PEAK[trace]).substitute(
+            queue=queue)
+
+        deltas = {UP: -width, DOWN: width, LEFT: -1, RIGHT: 1}
+        constants["neighbours"] = "".join(
+            Template(step).substitute(
+                constants,
+                bit=1 << direction,
+                delta=deltas[direction],
+                parent=direction + 1,
+                dr=dr,
+                dc=dc,
+            )
+            for direction, dr, dc in MOVES
+        )
+
+        return PROLOGUE + Template(body).substitute(constants)
+
+    @staticmethod
+    def build(
+        search: Search,
+        width: int,
+        height: int,
+        trace: TraceLevel = TraceLevel.FULL
+    ) -> Kernel:
+        """Compile a kernel
+
+        Args:
+            search (Search): Search algorithm
+            width (int): Grid width
+            height (int): Grid height
+            trace (TraceLevel, optional): What the kernel records of the
+            explored cells. Defaults to TraceLevel.FULL.
+
+        Returns:
+            Kernel: Specialised search function
+        """
+        namespace = {
+            "array": array,
+            "deque": deque,
+            "heappop": heappop,
+            "heappush": heappush,
+            "SearchArena": SearchArena,
+            "finish": finish,
+            "tie_break": TieBreak.LOW_H
+            if search is Search.ASTAR_SEARCH else None,
+            "trace": trace,
+        }
+        code = compile(
+            GridKernels.source(search, width, height, trace),
+            f"<{search.name.lower()} kernel {width}x{height}"
+            f" {trace.value}>",
+            "exec"
+        )
+        exec(code, namespace)
+
+        return namespace["search"]
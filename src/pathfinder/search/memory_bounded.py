@@ -0,0 +1,811 @@
+from array import array
+from heapq import heapify, heappop, heappush
+
+from ..models.arena import SearchArena
+from ..models.budget import SearchBudget
+from ..models.frontier import PriorityQueueFrontier
+from ..models.grid import BaseGrid
+from ..models.search_types import TraceLevel
+from ..models.solution import (
+    BudgetExceeded,
+    NoSolution,
+    Solution,
+    SolutionStream,
+    drain,
+)
+from .astar import AStarSearch
+
+# Default number of cells held by the transposition table of IDA* and by
+# the search tree of SMA*
+TABLE_SIZE = 1 << 18
+NODE_LIMIT = 1 << 16
+
+INFINITY = float("inf")
+
+# Flag of the parent direction of the cells PEA* keeps out of its frontier
+WAITING = 0x10
+
+
+class IterativeDeepeningAStarSearch:
+    """Depth first searches bounded by rising f-score thresholds (IDA*)
+
+    Each iteration follows paths depth first from the start as long as
+    their f-score is within the threshold, then the threshold rises to the
+    lowest f-score that went over it. Only the current path is kept, plus
+    a transposition table of the cheapest g-score each cell was reached
+    with during the iteration, which cuts the paths reaching a cell no
+    cheaper than before. The table holds at most `table_size` cells, cells
+    past it are searched again whenever they are reached.
+
+    Memory is bounded by the table and the length of the path, at the cost
+    of expanding cells again in every iteration.
+    """
+
+    @staticmethod
+    def search(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        table_size: int = TABLE_SIZE
+    ) -> Solution:
+        """Find path between two points in a grid using IDA* Search
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Unused, the search keeps
+            no per-cell arrays. Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at, the frontier being the current path.
+            Defaults to None.
+            table_size (int, optional): Most cells held by the
+            transposition table. Defaults to TABLE_SIZE.
+
+        Returns:
+            Solution: Solution found
+        """
+        return drain(IterativeDeepeningAStarSearch.stream(
+            grid, arena, trace=trace, budget=budget, table_size=table_size,
+            batch_size=0))
+
+    @staticmethod
+    def stream(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        table_size: int = TABLE_SIZE,
+        batch_size: int = 64
+    ) -> SolutionStream:
+        """Find path between two points in a grid step by step using
+        IDA* Search
+
+        Cells are explored again in every iteration that reaches them.
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Unused, the search keeps
+            no per-cell arrays. Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at, the frontier being the current path.
+            Defaults to None.
+            table_size (int, optional): Most cells held by the
+            transposition table. Defaults to TABLE_SIZE.
+            batch_size (int, optional): Expansions per yielded batch, 0
+            to only return the Solution. Defaults to 64.
+
+        Yields:
+            array: Cell indices expanded since the previous batch, empty
+            unless fully traced
+
+        Returns:
+            Solution: Solution found, `peak_frontier` being the longest
+            path followed
+        """
+        pos = grid.pos
+        costs = grid.costs
+        start = grid.index(grid.start)
+        end = grid.index(grid.end)
+        er, ec = grid.end
+
+        # Cheapest g-score of the cells reached during an iteration
+        table: dict[int, int] = {}
+
+        # Keep track of explored cells, in order only for a full trace
+        record = trace is TraceLevel.FULL
+        explored = array(grid.index_typecode)
+        expanded, pushed, peak = 0, 0, 1
+        flush_at = batch_size or -1
+
+        # Stop at the budget's limits, checked every few expansions
+        check_at = budget.next_check(0) if budget else -1
+
+        threshold = AStarSearch.heuristic(grid.start, grid.end)
+        while True:
+            table.clear()
+            table[start] = 0
+
+            # Current path, the g-score of its cells and the next move to
+            # try out of each
+            path, g_path, tried = [start], [0], [0]
+            on_path = {start}
+            next_threshold = None
+            node = start
+
+            while True:
+                # Expand the last cell of the path
+                pushed += 1
+                expanded += 1
+                if record:
+                    explored.append(node)
+
+                # Hand a batch of expansions to a streaming caller
+                if expanded == flush_at:
+                    flush_at += batch_size
+                    yield explored[-batch_size:]
+
+                # If reached destination point
+                if node == end:
+                    return Solution(
+                        path,
+                        explored,
+                        path_cost=g_path[-1],
+                        decode=pos,
+                        trace=trace,
+                        expanded=expanded,
+                        pushed=pushed,
+                        peak_frontier=peak
+                    )
+
+                # Give up once a limit of the budget is reached
+                if expanded == check_at and budget:
+                    limit = budget.exceeded(expanded, len(path))
+                    if limit:
+                        return BudgetExceeded(
+                            explored,
+                            limit,
+                            expanded,
+                            len(path),
+                            decode=pos,
+                            trace=trace,
+                            pushed=pushed,
+                            peak_frontier=peak
+                        )
+                    check_at = budget.next_check(expanded)
+
+                # Find the next cell to extend the path with, backtracking
+                # out of the cells without moves left
+                node = -1
+                while path:
+                    last = path[-1]
+                    moves = grid.neighbours(last)
+                    if tried[-1] == len(moves):
+                        on_path.discard(path.pop())
+                        g_path.pop()
+                        tried.pop()
+                        continue
+
+                    _, delta = moves[tried[-1]]
+                    tried[-1] += 1
+                    state = last + delta
+                    if state in on_path:
+                        continue
+
+                    cost = g_path[-1] + costs[state]
+                    row, col = pos(state)
+                    f_score = cost + abs(row - er) + abs(col - ec)
+                    if f_score > threshold:
+                        if next_threshold is None \
+                                or f_score < next_threshold:
+                            next_threshold = f_score
+                        continue
+
+                    # Cut paths no cheaper than one already followed
+                    known = table.get(state)
+                    if known is not None and known <= cost:
+                        continue
+                    if known is not None or len(table) < table_size:
+                        table[state] = cost
+
+                    node = state
+                    path.append(state)
+                    g_path.append(cost)
+                    tried.append(0)
+                    on_path.add(state)
+                    if len(path) > peak:
+                        peak = len(path)
+                    break
+
+                if node < 0:
+                    break
+
+            # Return empty Solution object for no solution
+            if next_threshold is None:
+                return NoSolution(
+                    [],
+                    explored,
+                    decode=pos,
+                    trace=trace,
+                    expanded=expanded,
+                    pushed=pushed,
+                    peak_frontier=peak
+                )
+
+            threshold = next_threshold
+
+
+class SimplifiedMemoryBoundedAStarSearch:
+    """A* Search holding at most `node_limit` cells (SMA*)
+
+    The search tree is kept in dicts. The cell with the lowest f-score,
+    the deepest one among equals, generates one child at a time. When the
+    tree is full, the leaf with the highest f-score, the shallowest one
+    among equals, is forgotten. Its parent keeps the f-score and generates
+    it again once its turn comes back. Once all the children of a cell are
+    generated, its f-score is backed up to the lowest of theirs, up the
+    tree.
+
+    A cell is held once: reaching it no cheaper than the held copy is cut,
+    and a cheaper path replaces the held copy and drops its subtree.
+
+    Paths are as cheap as A*'s when a cheapest path has at most
+    `node_limit` cells. Otherwise the path found, if any, is a costlier
+    one that fits.
+    """
+
+    @staticmethod
+    def search(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        node_limit: int = NODE_LIMIT
+    ) -> Solution:
+        """Find path between two points in a grid using SMA* Search
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Unused, the search keeps
+            no per-cell arrays. Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at, the frontier being the cells held.
+            Defaults to None.
+            node_limit (int, optional): Most cells held at once.
+            Defaults to NODE_LIMIT.
+
+        Raises:
+            ValueError: The node limit is lower than 2
+
+        Returns:
+            Solution: Solution found
+        """
+        return drain(SimplifiedMemoryBoundedAStarSearch.stream(
+            grid, arena, trace=trace, budget=budget, node_limit=node_limit,
+            batch_size=0))
+
+    @staticmethod
+    def stream(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        node_limit: int = NODE_LIMIT,
+        batch_size: int = 64
+    ) -> SolutionStream:
+        """Find path between two points in a grid step by step using
+        SMA* Search
+
+        A cell is explored when it generates its first child, and again
+        after all its children were forgotten.
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Unused, the search keeps
+            no per-cell arrays. Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at, the frontier being the cells held.
+            Defaults to None.
+            node_limit (int, optional): Most cells held at once.
+            Defaults to NODE_LIMIT.
+            batch_size (int, optional): Expansions per yielded batch, 0
+            to only return the Solution. Defaults to 64.
+
+        Raises:
+            ValueError: The node limit is lower than 2
+
+        Yields:
+            array: Cell indices expanded since the previous batch, empty
+            unless fully traced
+
+        Returns:
+            Solution: Solution found, `peak_frontier` being the most
+            cells held at once
+        """
+        if node_limit < 2:
+            raise ValueError(
+                f"SMA* needs a node limit of at least 2, got {node_limit}")
+
+        pos = grid.pos
+        costs = grid.costs
+        start = grid.index(grid.start)
+        end = grid.index(grid.end)
+        er, ec = grid.end
+
+        # Search tree, an entry per held cell. `pending` holds the
+        # directions a cell has not generated yet, and `forgotten` the
+        # f-scores of the forgotten children of the cells that have some,
+        # by direction. A cell with either is open
+        g_score: dict[int, int] = {}
+        f_score: dict[int, float] = {}
+        parents: dict[int, int] = {}
+        directions: dict[int, int] = {}
+        depths: dict[int, int] = {}
+        pending: dict[int, int] = {}
+        kids: dict[int, int] = {}
+        forgotten: dict[int, dict[int, float]] = {}
+
+        # Cells held but not expanded yet
+        fresh: set[int] = set()
+
+        # Open cells by (f-score, -depth) and leaves by (-f-score, depth).
+        # Entries are checked against the tree when they come up, and the
+        # outdated ones dropped once they outnumber the held cells
+        best: list[tuple[float, int, int]] = []
+        worst: list[tuple[float, int, int]] = []
+
+        def children(node: int) -> list[int]:
+            """Held children of a cell"""
+            return [node + delta for _, delta in grid.neighbours(node)
+                    if parents.get(node + delta) == node]
+
+        def hold(node: int, g: int, f: float, parent: int, direction: int,
+                 depth: int) -> None:
+            """Add a cell to the tree"""
+            g_score[node] = g
+            f_score[node] = f
+            parents[node] = parent
+            directions[node] = direction
+            depths[node] = depth
+            pending[node] = sum(1 << d for d, _ in grid.neighbours(node))
+            kids[node] = 0
+            fresh.add(node)
+            if parent >= 0:
+                kids[parent] += 1
+
+            heappush(best, (f, -depth, node))
+            heappush(worst, (-f, depth, node))
+
+        def drop(node: int) -> None:
+            """Remove a cell and its subtree from the tree"""
+            stack = [node]
+            while stack:
+                cell = stack.pop()
+                stack.extend(children(cell))
+                for table in (g_score, f_score, parents, directions, depths,
+                              pending, kids):
+                    del table[cell]
+                forgotten.pop(cell, None)
+                fresh.discard(cell)
+
+        def unlink(node: int) -> int:
+            """Remove a cell and its subtree from its parent, returning
+            the parent"""
+            parent = parents[node]
+            drop(node)
+            kids[parent] -= 1
+            if not kids[parent]:
+                heappush(worst, (-f_score[parent], depths[parent], parent))
+            return parent
+
+        def backup(node: int) -> None:
+            """Set the f-scores of the cells that generated all their
+            children to the lowest of these, held or forgotten, up the
+            tree. Cells left without any are dropped"""
+            while node >= 0 and not pending[node]:
+                scores = [f_score[child] for child in children(node)]
+                scores.extend(forgotten.get(node, {}).values())
+                if not scores:
+                    if node == start:
+                        f_score[node] = INFINITY
+                        return
+                    node = unlink(node)
+                    continue
+
+                lowest = min(scores)
+                if lowest == f_score[node]:
+                    return
+                f_score[node] = lowest
+                if node in forgotten:
+                    heappush(best, (lowest, -depths[node], node))
+                if not kids[node]:
+                    heappush(worst, (-lowest, depths[node], node))
+                node = parents[node]
+
+        def is_open(entry: tuple[float, int, int]) -> bool:
+            """Whether an entry of `best` is current and its cell not
+            expanded yet or open"""
+            f, depth, node = entry
+            return depths.get(node) == -depth and f_score[node] == f \
+                and bool(pending[node] or node in forgotten
+                         or node in fresh)
+
+        def forget(keep: int) -> None:
+            """Forget the worst leaf other than `keep`, its parent
+            remembers its f-score"""
+            skipped = []
+            while worst:
+                entry = heappop(worst)
+                f, depth, node = entry
+                if depths.get(node) != depth or f_score[node] != -f \
+                        or kids[node] or node == start:
+                    continue
+                if node == keep:
+                    skipped.append(entry)
+                    continue
+
+                forgotten.setdefault(parents[node], {})[directions[node]] = -f
+                parent = unlink(node)
+                heappush(best, (f_score[parent], -depths[parent], parent))
+                break
+
+            for entry in skipped:
+                heappush(worst, entry)
+
+        h = AStarSearch.heuristic(grid.start, grid.end)
+        hold(start, 0, h, -1, 0, 0)
+
+        # Keep track of explored cells, in order only for a full trace
+        record = trace is TraceLevel.FULL
+        explored = array(grid.index_typecode)
+        expanded, pushed, peak = 0, 1, 1
+        flush_at = batch_size or -1
+
+        # Stop at the budget's limits, checked every few expansions
+        check_at = budget.next_check(0) if budget else -1
+
+        while True:
+            # Drop the outdated and repeated heap entries
+            if len(best) > 2 * len(g_score) + 64:
+                best[:] = {(f, depth, node) for f, depth, node in best
+                           if depths.get(node) == -depth
+                           and f_score[node] == f}
+                heapify(best)
+            if len(worst) > 2 * len(g_score) + 64:
+                worst[:] = {(f, depth, node) for f, depth, node in worst
+                            if depths.get(node) == depth
+                            and f_score[node] == -f}
+                heapify(worst)
+
+            # Find the best cell not expanded yet or open, it stays open
+            # until all its children are generated and held
+            while best and not is_open(best[0]):
+                heappop(best)
+
+            # Return empty Solution object for no solution, or none
+            # within the node limit
+            if not best or best[0][0] == INFINITY:
+                return NoSolution(
+                    [],
+                    explored,
+                    decode=pos,
+                    trace=trace,
+                    expanded=expanded,
+                    pushed=pushed,
+                    peak_frontier=peak
+                )
+
+            node = best[0][2]
+            if node in fresh:
+                fresh.discard(node)
+                expanded += 1
+                if record:
+                    explored.append(node)
+
+                # Hand a batch of expansions to a streaming caller
+                if expanded == flush_at:
+                    flush_at += batch_size
+                    yield explored[-batch_size:]
+
+                # If reached destination point
+                if node == end:
+                    break
+
+                # Give up once a limit of the budget is reached
+                if expanded == check_at and budget:
+                    limit = budget.exceeded(expanded, len(g_score))
+                    if limit:
+                        return BudgetExceeded(
+                            explored,
+                            limit,
+                            expanded,
+                            len(g_score),
+                            decode=pos,
+                            trace=trace,
+                            pushed=pushed,
+                            peak_frontier=peak
+                        )
+                    check_at = budget.next_check(expanded)
+
+                # A cell without moves is dropped right away
+                if not pending[node]:
+                    backup(node)
+                    continue
+
+            # Generate the next new child, or else the forgotten child
+            # with the lowest f-score, which it keeps
+            bits = pending[node]
+            if bits:
+                direction = (bits & -bits).bit_length() - 1
+                pending[node] = bits & (bits - 1)
+                floor = f_score[node]
+            else:
+                remembered = forgotten[node]
+                direction = min(remembered, key=remembered.__getitem__)
+                floor = max(f_score[node], remembered.pop(direction))
+                if not remembered:
+                    del forgotten[node]
+
+            delta = next(d for move, d in grid.neighbours(node)
+                         if move == direction)
+            state = node + delta
+            cost = g_score[node] + costs[state]
+            depth = depths[node] + 1
+
+            # Cut paths no cheaper than the held copy of a cell, and those
+            # too long to reach the goal within the limit
+            known = g_score.get(state)
+            if known is not None and known <= cost \
+                    or state != end and depth >= node_limit - 1:
+                backup(node)
+                continue
+
+            # A cheaper path replaces the held copy, whose former parent
+            # is backed up once the new copy holds this cell up
+            replaced = -1
+            if known is not None:
+                replaced = unlink(state)
+            elif len(g_score) >= node_limit:
+                forget(node)
+
+            row, col = pos(state)
+            f = max(floor, cost + abs(row - er) + abs(col - ec))
+            hold(state, cost, f, node, direction, depth)
+            pushed += 1
+            if len(g_score) > peak:
+                peak = len(g_score)
+
+            if replaced >= 0:
+                backup(replaced)
+            backup(node)
+
+        # Generate path and return a Solution object
+        path = [end]
+        while parents[path[-1]] >= 0:
+            path.append(parents[path[-1]])
+        path.reverse()
+
+        return Solution(
+            path,
+            explored,
+            path_cost=g_score[end],
+            decode=pos,
+            trace=trace,
+            expanded=expanded,
+            pushed=pushed,
+            peak_frontier=peak
+        )
+
+
+class PartialExpansionAStarSearch:
+    """A* Search queueing only the children worth expanding next (PEA*)
+
+    Expanding a cell only queues the children whose f-score is within
+    `cutoff` of the cell's priority. If others are left, the cell is
+    queued again with the lowest of their f-scores instead of being
+    closed, so the frontier holds few children that never come up.
+    """
+
+    @staticmethod
+    def search(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        cutoff: int = 0
+    ) -> Solution:
+        """Find path between two points in a grid using Partial Expansion
+        A* Search
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state.
+            Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+            cutoff (int, optional): How far above the expanded cell's
+            priority children are queued. Defaults to 0.
+
+        Returns:
+            Solution: Solution found
+        """
+        return drain(PartialExpansionAStarSearch.stream(
+            grid, arena, trace=trace, budget=budget, cutoff=cutoff,
+            batch_size=0))
+
+    @staticmethod
+    def stream(
+        grid: BaseGrid,
+        arena: SearchArena | None = None,
+        trace: TraceLevel = TraceLevel.FULL,
+        budget: SearchBudget | None = None,
+        cutoff: int = 0,
+        batch_size: int = 64
+    ) -> SolutionStream:
+        """Find path between two points in a grid step by step using
+        Partial Expansion A* Search
+
+        A cell is explored every time it is partially expanded.
+
+        Args:
+            grid (BaseGrid): Grid of points
+            arena (SearchArena | None, optional): Reusable search state.
+            Defaults to None.
+            trace (TraceLevel, optional): What to record of the explored
+            cells. Defaults to TraceLevel.FULL.
+            budget (SearchBudget | None, optional): Limits to stop the
+            search at. Defaults to None.
+            cutoff (int, optional): How far above the expanded cell's
+            priority children are queued. Defaults to 0.
+            batch_size (int, optional): Expansions per yielded batch, 0
+            to only return the Solution. Defaults to 64.
+
+        Yields:
+            array: Cell indices expanded since the previous batch, empty
+            unless fully traced
+
+        Returns:
+            Solution: Solution found
+        """
+        pos = grid.pos
+        costs = grid.costs
+        start = grid.index(grid.start)
+        end = grid.index(grid.end)
+        er, ec = grid.end
+
+        # Per-query search state, valid where stamped with this generation.
+        # A cell is closed once all its children are queued
+        arena = SearchArena.prepare(grid, arena)
+        generation = arena.reset()
+        g_score, parents = arena.g, arena.parents
+        seen, closed = arena.seen, arena.closed
+
+        # Instantiate PriorityQueue frontier and add the source cell into it
+        h = AStarSearch.heuristic(grid.start, grid.end)
+        frontier = PriorityQueueFrontier(
+            grid.size, tie_bits=(grid.width + grid.height).bit_length())
+        frontier.add(start, priority=h, tie=h)
+        g_score[start] = 0
+        parents[start] = 0
+        seen[start] = generation
+
+        # Keep track of explored cells, in order only for a full trace
+        record = trace is TraceLevel.FULL
+        explored = array(grid.index_typecode)
+        expanded, pushed = 0, 1
+        flush_at = batch_size or -1
+
+        # Stop at the budget's limits, checked every few expansions
+        check_at = budget.next_check(0) if budget else -1
+
+        while True:
+            # Return empty Solution object for no solution
+            if frontier.is_empty():
+                return NoSolution(
+                    [],
+                    explored,
+                    decode=pos,
+                    trace=trace,
+                    expanded=expanded,
+                    pushed=pushed,
+                    popped=frontier.pops,
+                    peak_frontier=frontier.peak
+                )
+
+            # Remove cell from the frontier with the priority it was queued
+            # with, skipping the closed ones
+            priority = frontier.peek()
+            node = frontier.pop()
+            if closed[node] == generation:
+                continue
+
+            expanded += 1
+            if record:
+                explored.append(node)
+
+            # Hand a batch of expansions to a streaming caller
+            if expanded == flush_at:
+                flush_at += batch_size
+                yield explored[-batch_size:]
+
+            # If reached destination point
+            if node == end:
+                break
+
+            # Give up once a limit of the budget is reached
+            if expanded == check_at and budget:
+                limit = budget.exceeded(expanded, len(frontier))
+                if limit:
+                    return BudgetExceeded(
+                        explored,
+                        limit,
+                        expanded,
+                        len(frontier),
+                        decode=pos,
+                        trace=trace,
+                        pushed=pushed,
+                        popped=frontier.pops,
+                        peak_frontier=frontier.peak
+                    )
+                check_at = budget.next_check(expanded)
+
+            # Queue the children within the cutoff, and keep the lowest
+            # f-score of the others to queue the cell again with. These
+            # keep their g-score, flagged as waiting for this cell, so
+            # worse paths to them are not queued meanwhile
+            deferred = None
+            for direction, delta in grid.neighbours(node):
+                state = node + delta
+                cost = g_score[node] + costs[state]
+                if seen[state] == generation and (
+                        cost > g_score[state] or cost == g_score[state]
+                        and parents[state] != direction + 1 | WAITING):
+                    continue
+
+                seen[state] = generation
+                g_score[state] = cost
+
+                row, col = pos(state)
+                h = abs(row - er) + abs(col - ec)
+                if cost + h > priority + cutoff:
+                    parents[state] = direction + 1 | WAITING
+                    if deferred is None or cost + h < deferred:
+                        deferred = cost + h
+                    continue
+
+                parents[state] = direction + 1
+                pushed += 1
+                frontier.add(state, priority=cost + h, tie=h)
+
+            if deferred is None:
+                closed[node] = generation
+            else:
+                row, col = pos(node)
+                pushed += 1
+                frontier.add(node, priority=deferred,
+                             tie=abs(row - er) + abs(col - ec))
+
+        # Generate path and return a Solution object
+        path = grid.trace_path(parents, end)
+        path_cost = sum(costs[i] for i in path[1:])
+
+        return Solution(
+            path,
+            explored,
+            path_cost=path_cost,
+            decode=pos,
+            trace=trace,
+            expanded=expanded,
+            pushed=pushed,
+            popped=frontier.pops,
+            peak_frontier=frontier.peak
+        )
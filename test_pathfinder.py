@@ -0,0 +1,854 @@
+"""
+Tests for the headless pathfinding engine (src/pathfinder)
+These run without pygame and without opening a window
+"""
+import time
+from array import array
+from collections import OrderedDict, deque
+from typing import Any
+
+import pytest
+
+from src.pathfinder.main import PathFinder
+from src.pathfinder.models.arena import (
+    MAX_GENERATION, SearchArena, SparseArena)
+from src.pathfinder.models.budget import SearchBudget
+from src.pathfinder.models.frontier import (
+    BucketQueueFrontier, IndexedHeapFrontier, PriorityQueueFrontier,
+    QueueFrontier, RadixHeapFrontier, StackFrontier)
+from src.pathfinder.models.grid import Grid
+from src.pathfinder.models.morton_grid import MortonGrid
+from src.pathfinder.models.node import Node
+from src.pathfinder.models.sparse_grid import SparseGrid
+from src.pathfinder.models.tiled_grid import TiledGrid
+from src.pathfinder.models.search_types import (
+    BudgetLimit, FrontierKind, Search, TieBreak, TraceLevel)
+from src.pathfinder.models.solution import BudgetExceeded
+from src.pathfinder.search import bucketed_dijkstras, kernels
+from src.pathfinder.search.bucketed_dijkstras import BucketedDijkstrasSearch
+from src.pathfinder.search.kernels import GridKernels
+
+
+def make_grid(rows: list[str]) -> Grid:
+    """Build a grid from text rows
+
+    "#" is a wall, "A"/"B" are start/goal and digits are weights.
+    """
+    nodes = []
+    start = end = (0, 0)
+    for i, row in enumerate(rows):
+        nodes.append([])
+        for j, value in enumerate(row):
+            if value == "A":
+                start = (i, j)
+                cost = 0
+            elif value == "B":
+                end = (i, j)
+                cost = 1
+            elif value == "#":
+                cost = -1
+            elif value == ".":
+                value, cost = "1", 1
+            else:
+                cost = int(value)
+            nodes[-1].append(Node(value, (i, j), cost))
+
+    return Grid.from_nodes(nodes, start, end)
+
+
+OPEN = [
+    "..........",
+    ".A........",
+    "..........",
+    "......B...",
+]
+
+WALLED = [
+    "A.#.......",
+    "..#.####..",
+    "..#....#..",
+    "....#..#.B",
+]
+
+WEIGHTED = [
+    "A9999.....",
+    ".#####.##.",
+    "........9B",
+]
+
+BLOCKED = [
+    "A.#...",
+    "..#.B.",
+    "###...",
+]
+
+# Searches expanding cells one by one on every grid layout
+PER_CELL = (
+    Search.ASTAR_SEARCH,
+    Search.DIJKSTRAS_SEARCH,
+    Search.BREADTH_FIRST_SEARCH,
+    Search.GREEDY_BEST_FIRST_SEARCH,
+    Search.DEPTH_FIRST_SEARCH,
+)
+
+BIDIRECTIONAL = (
+    Search.BIDIRECTIONAL_ASTAR_SEARCH,
+    Search.BIDIRECTIONAL_DIJKSTRAS_SEARCH,
+    Search.BIDIRECTIONAL_BREADTH_FIRST_SEARCH,
+)
+
+# Searches expanding jump points only
+JUMP_POINT = (
+    Search.JUMP_POINT_SEARCH,
+    Search.JUMP_POINT_PLUS_SEARCH,
+)
+
+# Memory-bounded searches, expanding cells more than once
+MEMORY_BOUNDED = (
+    Search.ITERATIVE_DEEPENING_ASTAR_SEARCH,
+    Search.SIMPLIFIED_MEMORY_BOUNDED_ASTAR_SEARCH,
+    Search.PARTIAL_EXPANSION_ASTAR_SEARCH,
+)
+
+
+def test_grid_from_nodes():
+    grid = make_grid(WALLED)
+
+    assert (grid.width, grid.height) == (10, 4)
+    assert grid.start == (0, 0) and grid.end == (3, 9)
+    assert grid.get_cost((0, 2)) == -1
+    assert grid.walls[grid.index((1, 2))] == 1
+    assert grid.pos(grid.index((2, 7))) == (2, 7)
+    assert set(grid.get_neighbours((0, 1))) == {"down", "left"}
+
+    grid.set_cost((0, 2), 1)
+    assert set(grid.get_neighbours((0, 1))) == {"down", "left", "right"}
+
+
+def test_move_table_tracks_set_cost():
+    grid = make_grid(WALLED)
+
+    for pos, cost in (((1, 5), -1), ((0, 2), 1), ((3, 9), -1), ((1, 0), 4)):
+        grid.set_cost(pos, cost)
+        assert grid.moves == grid._build_moves()
+
+    idx = grid.index((0, 3))
+    assert [grid.pos(idx + d) for _, d in grid.neighbours(idx)] == \
+        [(1, 3), (0, 2), (0, 4)]
+
+
+def test_frontiers_track_membership():
+    for size in (None, 10):
+        stack, queue = StackFrontier(size), QueueFrontier(size)
+        for frontier in (stack, queue):
+            for node in (3, 8, 5):
+                frontier.add(node)
+            assert frontier.contains_state(8)
+            assert not frontier.contains_state(4)
+
+        assert [stack.remove() for _ in range(3)] == [5, 8, 3]
+        assert [queue.remove() for _ in range(3)] == [3, 8, 5]
+        for frontier in (stack, queue):
+            assert frontier.is_empty()
+            assert not any(frontier.contains_state(n) for n in (3, 8, 5))
+            with pytest.raises(Exception):
+                frontier.remove()
+
+    # Cells may be queued again after leaving
+    queue.add(8)
+    assert queue.contains_state(8) and len(queue) == 1
+    assert isinstance(queue.frontier, deque)
+
+
+def test_priority_frontier_packs_keys():
+    frontier = PriorityQueueFrontier(100, tie_bits=4)
+    for node, priority, tie in ((7, 3, 1), (99, 2, 5), (4, 3, 0), (0, 2, 5)):
+        frontier.add(node, priority=priority, tie=tie)
+
+    assert frontier.peek() == 2
+    assert [frontier.pop() for _ in range(4)] == [0, 99, 4, 7]
+    assert frontier.is_empty()
+
+    # Only the indexed heap knows which cells it holds
+    for frontier in (PriorityQueueFrontier(10),
+                     BucketQueueFrontier(10, span=1),
+                     RadixHeapFrontier(10)):
+        assert not hasattr(frontier, "contains_state")
+    assert IndexedHeapFrontier(10).contains_state(0) is False
+
+
+def test_monotone_frontiers_pop_like_the_binary_heap():
+    # (priority, cell, tie) pushed first and after popping some cells,
+    # each within 3 of the last popped priority. The queue runs empty
+    # before cell 0 is pushed
+    pushes = [(5, 9, 1), (6, 7, 0), (5, 2, 0)]
+    later = {9: [(8, 3, 0), (6, 1, 1)], 2: [(7, 4, 0)], 3: [(10, 0, 0)]}
+
+    order = []
+    for frontier in (PriorityQueueFrontier(16, tie_bits=1),
+                     BucketQueueFrontier(16, span=3, tie_bits=1),
+                     RadixHeapFrontier(16, tie_bits=1)):
+        for priority, node, tie in pushes:
+            frontier.add(node, priority=priority, tie=tie)
+
+        popped = []
+        while not frontier.is_empty():
+            popped.append((frontier.peek(), frontier.pop()))
+            for priority, node, tie in later.get(popped[-1][1], ()):
+                frontier.add(node, priority=priority, tie=tie)
+        order.append(popped)
+
+    assert order[0] == order[1] == order[2]
+    assert [node for _, node in order[0]] == [2, 9, 7, 1, 4, 3, 0]
+
+    for rows in (OPEN, WALLED, WEIGHTED, BLOCKED):
+        grid = make_grid(rows)
+        for search in (Search.ASTAR_SEARCH, Search.DIJKSTRAS_SEARCH):
+            expected = PathFinder.find_path(grid, search)
+            for kind in FrontierKind:
+                solution = PathFinder.find_path(
+                    grid, search, frontier_kind=kind)
+                assert list(solution.explored) == list(expected.explored)
+                assert list(solution.path) == list(expected.path), kind
+
+
+def test_empty_frontiers_raise_index_error():
+    for frontier in (PriorityQueueFrontier(10),
+                     BucketQueueFrontier(10, span=3),
+                     RadixHeapFrontier(10),
+                     IndexedHeapFrontier(10)):
+        # Never filled, then emptied after the current bucket moved on
+        for pops in (2, 4):
+            with pytest.raises(IndexError):
+                frontier.pop()
+            with pytest.raises(IndexError):
+                frontier.peek()
+
+            frontier.add(4, priority=3 * pops)
+            frontier.add(2, priority=3 * pops + 1)
+            assert [frontier.pop(), frontier.pop()] == [4, 2]
+            assert frontier.is_empty() and frontier.pops == pops
+
+
+def test_indexed_heap_lowers_keys_in_place():
+    frontier = IndexedHeapFrontier(100, tie_bits=2)
+    for node in range(20, 0, -1):
+        frontier.add(node, priority=node % 7 + 10, tie=node % 3)
+    frontier.add(13, priority=4)
+    frontier.add(13, priority=9)
+    frontier.add(99, priority=4, tie=1)
+
+    assert len(frontier) == 21 and frontier.get(13) == 4
+    assert frontier.contains_state(99) and not frontier.contains_state(0)
+
+    popped = [frontier.pop() for _ in range(len(frontier))]
+    assert popped[:2] == [13, 99]
+    assert sorted(popped) == list(range(1, 21)) + [99]
+    assert frontier.pops == frontier.peak == 21
+    assert all(slot == -1 for slot in frontier.where)
+
+    # Stale copies are never queued, so never popped
+    grid = make_grid(WEIGHTED)
+    for search in (Search.ASTAR_SEARCH, Search.DIJKSTRAS_SEARCH,
+                   Search.GREEDY_BEST_FIRST_SEARCH):
+        lazy = PathFinder.find_path(grid, search)
+        indexed = PathFinder.find_path(
+            grid, search, frontier_kind=FrontierKind.INDEXED_HEAP)
+
+        assert list(indexed.path) == list(lazy.path), search
+        assert lazy.popped is not None and lazy.peak_frontier is not None
+        assert indexed.popped == indexed.explored_length <= lazy.popped
+        assert indexed.peak_frontier is not None
+        assert indexed.peak_frontier <= lazy.peak_frontier, search
+
+    with pytest.raises(ValueError):
+        PathFinder.find_path(grid, Search.GREEDY_BEST_FIRST_SEARCH,
+                             frontier_kind=FrontierKind.BUCKET_QUEUE)
+
+
+def test_optimal_searches_find_shortest_path():
+    for rows, cost in ((OPEN, 7), (WALLED, 18), (WEIGHTED, 15)):
+        for search in (Search.ASTAR_SEARCH, Search.DIJKSTRAS_SEARCH):
+            solution = PathFinder.find_path(make_grid(rows), search)
+            assert solution.path_cost == cost, (search, rows)
+
+
+def test_priority_searches_expand_every_cell_once():
+    for rows in (OPEN, WALLED, WEIGHTED, BLOCKED):
+        grid = make_grid(rows)
+        for search in (Search.ASTAR_SEARCH, Search.DIJKSTRAS_SEARCH,
+                       Search.GREEDY_BEST_FIRST_SEARCH):
+            solution = PathFinder.find_path(grid, search)
+
+            # Stale entries are popped but not expanded again
+            cells = len(set(solution.explored))
+            assert solution.explored_length == cells, (search, rows)
+            assert solution.popped is not None
+            assert solution.popped >= cells, (search, rows)
+
+            # Greedy Best First Search pushes a cell once, when reached
+            if search is Search.GREEDY_BEST_FIRST_SEARCH:
+                assert solution.popped == cells, rows
+                assert solution.pushed is not None
+                assert solution.pushed <= grid.size - grid.walls.count(1)
+
+    # A* reaches cells again by cheaper paths, leaving stale entries
+    astar = PathFinder.find_path(make_grid(WALLED), Search.ASTAR_SEARCH)
+    assert astar.popped is not None
+    assert astar.popped > astar.explored_length
+
+
+def test_tie_breaks_keep_astar_optimal():
+    for rows, cost in ((OPEN, 7), (WALLED, 18), (WEIGHTED, 15)):
+        for tie_break in TieBreak:
+            solution = PathFinder.find_path(
+                make_grid(rows), Search.ASTAR_SEARCH, tie_break=tie_break)
+
+            assert solution.path_cost == cost, (tie_break, rows)
+            assert solution.tie_break is tie_break
+
+
+def test_every_search_finds_a_valid_path():
+    for rows in (OPEN, WALLED, WEIGHTED):
+        for search in Search:
+            grid = make_grid(rows)
+            solution = PathFinder.find_path(grid, search)
+            path = list(solution.path)
+
+            assert path[0] == grid.start and path[-1] == grid.end, search
+            for a, b in zip(path, path[1:]):
+                assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1, search
+                assert grid.get_cost(b) >= 0, search
+
+
+def test_searches_leave_grid_untouched():
+    grid = make_grid(WEIGHTED)
+    before = (grid.costs.tobytes(), bytes(grid.moves))
+
+    for search in Search:
+        first = PathFinder.find_path(grid, search)
+        second = PathFinder.find_path(grid, search)
+
+        assert list(first.explored) == list(second.explored), search
+        assert list(first.path) == list(second.path), search
+
+    assert (grid.costs.tobytes(), bytes(grid.moves)) == before
+
+
+def test_arena_reuse_matches_fresh_queries():
+    arena = None
+    for rows in (WALLED, WEIGHTED, OPEN):
+        grid = make_grid(rows)
+        arena = SearchArena(grid.size)
+        arena.generation = MAX_GENERATION - 3
+
+        for search in list(Search) * 2:
+            reused = PathFinder.find_path(grid, search, arena=arena)
+            fresh = PathFinder.find_path(grid, search)
+
+            assert list(reused.explored) == list(fresh.explored), search
+            assert list(reused.path) == list(fresh.path), search
+
+    try:
+        PathFinder.find_path(make_grid(BLOCKED), Search.ASTAR_SEARCH, arena)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Arena of another size was accepted")
+
+
+def test_kernels_match_generic_searches():
+    for rows in (OPEN, WALLED, WEIGHTED, BLOCKED):
+        grid = make_grid(rows)
+        for search in Search:
+            kernel = PathFinder.find_path(grid, search, specialised=True)
+            generic = PathFinder.find_path(grid, search)
+
+            assert list(kernel.explored) == list(generic.explored), search
+            assert list(kernel.path) == list(generic.path), search
+            assert kernel.path_cost == generic.path_cost, search
+            assert kernel.popped == generic.popped, search
+            assert kernel.peak_frontier == generic.peak_frontier, search
+
+
+def test_kernel_cache_drops_least_recent_kernels(monkeypatch):
+    monkeypatch.setattr(kernels, "CACHE_KERNELS", 2)
+    monkeypatch.setattr(GridKernels, "cache", OrderedDict())
+
+    # Three grid shapes, the first is used again before the third
+    first, second, third = map(make_grid, (OPEN, BLOCKED, WEIGHTED))
+    kernel = GridKernels.get(first, Search.ASTAR_SEARCH)
+    GridKernels.get(second, Search.ASTAR_SEARCH)
+    assert GridKernels.get(first, Search.ASTAR_SEARCH) is kernel
+    GridKernels.get(third, Search.ASTAR_SEARCH)
+
+    assert len(GridKernels.cache) == 2
+    assert GridKernels.get(first, Search.ASTAR_SEARCH) is kernel
+    assert (Search.ASTAR_SEARCH, second.width, second.height) not in \
+        {key[:3] for key in GridKernels.cache}
+
+
+def test_solution_decodes_packed_cells():
+    grid = make_grid(WALLED)
+    solution = PathFinder.find_path(grid, Search.ASTAR_SEARCH)
+
+    assert solution.explored.cells.typecode == "I"
+    assert solution.path_length == len(solution.path.cells)
+    assert solution.path[0] == grid.start and solution.path[-1] == grid.end
+    assert solution.path[:] == [grid.pos(i) for i in solution.path.cells]
+    assert grid.end in solution.explored
+
+
+def test_trace_levels_record_less_and_find_same_path():
+    for rows in (WALLED, WEIGHTED, BLOCKED):
+        grid = make_grid(rows)
+        for search in Search:
+            for specialised in (False, True):
+                none, counts, full = (
+                    PathFinder.find_path(
+                        grid, search, specialised=specialised, trace=trace)
+                    for trace in TraceLevel
+                )
+
+                assert list(full.path) == list(counts.path) == list(none.path)
+                assert counts.explored_length == full.explored_length
+                assert full.pushed is not None
+                assert counts.pushed == full.pushed >= full.explored_length
+                assert counts.explored_length and not len(counts.explored)
+                assert none.explored_length == 0 and none.pushed is None
+
+
+def test_stream_yields_explored_cells_in_batches():
+    for rows in (WEIGHTED, BLOCKED):
+        grid = make_grid(rows)
+        for search in Search:
+            stream = PathFinder.stream(grid, search, batch_size=3)
+            batches = []
+            try:
+                while True:
+                    batches.append(list(next(stream)))
+            except StopIteration as stop:
+                solution = stop.value
+
+            assert all(len(batch) == 3 for batch in batches[:-1]), search
+            assert sum(batches, []) == list(solution.explored), search
+            assert list(solution.path) == \
+                list(PathFinder.find_path(grid, search).path), search
+
+
+def test_budget_stops_searches_with_partial_result():
+    grid = make_grid(WALLED)
+    for search in Search:
+        solution = PathFinder.find_path(
+            grid, search, budget=SearchBudget(max_expansions=3))
+        assert isinstance(solution, BudgetExceeded), search
+        assert solution.limit is BudgetLimit.EXPANSIONS, search
+        assert solution.expanded == solution.explored_length == 3, search
+        assert solution.path_length == 0, search
+
+        # Jump points may be reached one at a time, leaving none queued
+        if search not in JUMP_POINT:
+            assert solution.frontier_size > 0, search
+
+        solution = PathFinder.find_path(
+            grid, search, budget=SearchBudget(max_frontier=0, interval=1))
+        assert isinstance(solution, BudgetExceeded), search
+        assert solution.limit is BudgetLimit.FRONTIER, search
+
+        budget = SearchBudget(time.perf_counter(), interval=1)
+        solution = PathFinder.find_path(grid, search, budget=budget)
+        assert isinstance(solution, BudgetExceeded), search
+        assert solution.limit is BudgetLimit.TIME, search
+
+        solution = PathFinder.find_path(
+            grid, search, budget=SearchBudget.within(1000, 1000, 1000))
+        assert not isinstance(solution, BudgetExceeded), search
+        assert solution.path_length, search
+
+
+def test_whole_level_searches_stop_at_the_expansion_limit():
+    # Levels around the start hold 1, 4, 8, 12... cells, the limit falls
+    # in the middle of the eighth one
+    size = 60
+    costs = array("b", [1] * size * size)
+    grid = Grid(size, size, costs, (30, 30), (0, 0))
+
+    for search in (Search.BITBOARD_BREADTH_FIRST_SEARCH,
+                   Search.BUCKETED_DIJKSTRAS_SEARCH):
+        for interval in (1, 256):
+            budget = SearchBudget(max_expansions=100, interval=interval)
+            solution = PathFinder.find_path(grid, search, budget=budget)
+
+            assert isinstance(solution, BudgetExceeded), search
+            assert solution.limit is BudgetLimit.EXPANSIONS, search
+            assert solution.expanded == solution.explored_length == 100
+            assert len(set(solution.explored)) == 100, search
+            assert solution.frontier_size >= 113 - 100, search
+
+
+def test_morton_layout_matches_row_major():
+    for rows in (OPEN, WALLED, WEIGHTED, BLOCKED):
+        grid = make_grid(rows)
+        morton = MortonGrid(grid.width, grid.height, array("b", grid.costs),
+                            grid.start, grid.end)
+
+        for row in range(grid.height):
+            for col in range(grid.width):
+                assert morton.pos(morton.index((row, col))) == (row, col)
+                assert morton.get_neighbours((row, col)) == \
+                    grid.get_neighbours((row, col))
+
+        for search in PER_CELL:
+            expected = PathFinder.find_path(grid, search)
+            solution = PathFinder.find_path(morton, search)
+
+            # Ties are broken by cell index, so only GBFS may differ
+            assert bool(solution.path_length) == bool(expected.path_length)
+            if search is not Search.GREEDY_BEST_FIRST_SEARCH:
+                assert solution.path_cost == expected.path_cost, search
+
+        morton.set_cost((1, 1), -1)
+        grid.set_cost((1, 1), -1)
+        assert morton.get_neighbours((1, 0)) == grid.get_neighbours((1, 0))
+
+
+def test_sparse_grid_matches_dense_grid():
+    for rows in (OPEN, WALLED, WEIGHTED, BLOCKED):
+        grid = make_grid(rows)
+        nodes = [[grid.get_node((row, col)) for col in range(grid.width)]
+                 for row in range(grid.height)]
+        sparse = SparseGrid.from_nodes(nodes, grid.start, grid.end)
+
+        assert sparse.obstacles < sparse.size
+        assert sparse.max_cost == grid.max_cost
+        for search in PER_CELL:
+            expected = PathFinder.find_path(grid, search)
+            solution = PathFinder.find_path(sparse, search)
+
+            assert list(solution.explored) == list(expected.explored)
+            assert list(solution.path) == list(expected.path), search
+
+    arena = SearchArena.prepare(sparse)
+    assert isinstance(arena, SparseArena) and arena.seen[sparse.size] == 0
+
+
+def test_sparse_grid_scales_with_obstacles():
+    size = 1 << 20
+    walls = [(row, 3) for row in range(1, size)]
+    grid = SparseGrid(size, size, (0, 0), (5, 5), walls=walls)
+
+    solution = PathFinder.find_path(grid, Search.ASTAR_SEARCH)
+    assert solution.path_cost == 10 and solution.explored.cells.typecode == "Q"
+    assert grid.obstacles == size - 1
+
+
+def test_tiled_grid_matches_dense_grid(tmp_path):
+    path = str(tmp_path / "map.pftg")
+    for rows in (OPEN, WALLED, WEIGHTED, BLOCKED):
+        grid = make_grid(rows)
+        cells = [(grid.pos(i), cost) for i, cost in enumerate(grid.costs)
+                 if cost != 1]
+        TiledGrid.create(path, grid.width, grid.height, grid.start,
+                         grid.end, cells, tile_side=4)
+
+        with TiledGrid(path, cache_tiles=2) as tiled:
+            assert tiled.max_cost == max(grid.max_cost, 1)
+            for search in PER_CELL:
+                expected = PathFinder.find_path(grid, search)
+                solution = PathFinder.find_path(tiled, search)
+
+                assert list(solution.explored) == list(expected.explored)
+                assert list(solution.path) == list(expected.path), search
+                assert len(tiled.costs.tiles) <= 2
+
+
+def test_tiled_grid_loads_tiles_along_the_search(tmp_path):
+    path = str(tmp_path / "map.pftg")
+    size = 4096
+    TiledGrid.create(path, size, size, (0, 0), (40, size - 1),
+                     [((row, 9), -1) for row in range(60)], tile_side=64)
+
+    with TiledGrid(path, cache_tiles=8, writable=True) as grid:
+        solution = PathFinder.find_path(grid, Search.GREEDY_BEST_FIRST_SEARCH)
+        assert solution.path_cost == 60 + (size - 1) + 20
+        assert grid.costs.faults < (size // 64) ** 2 // 16
+        assert len(grid.costs.tiles) <= 8
+
+        grid.set_cost((0, 1), -1)
+        assert grid.get_cost((0, 1)) == -1
+
+        # The highest cost is scanned once, then follows set_cost
+        assert grid.max_cost == 1
+        grid.set_cost((0, 2), 9)
+        assert grid.max_cost == 9
+        grid.set_cost((0, 2), 1)
+        assert grid.max_cost == 1
+
+    with TiledGrid(path) as grid:
+        assert grid.get_cost((0, 1)) == -1 and grid.get_cost((0, 2)) == 1
+
+
+def test_bitboard_bfs_finds_shortest_paths():
+    for rows in (OPEN, WALLED, WEIGHTED, BLOCKED):
+        grid = make_grid(rows)
+        expected = PathFinder.find_path(grid, Search.BREADTH_FIRST_SEARCH)
+        solution = PathFinder.find_path(
+            grid, Search.BITBOARD_BREADTH_FIRST_SEARCH)
+
+        # Whole levels are expanded, not the part of the goal's level
+        # that a queue reaches before the goal
+        assert solution.path_length == expected.path_length
+        assert set(solution.explored) <= set(expected.explored)
+
+    # Serpentine corridor, most levels are a single cell
+    size = 100
+    costs = array("b", [1] * size * size)
+    for col in range(1, size - 1, 2):
+        gap = size - 1 if col % 4 == 1 else 0
+        for row in range(size):
+            if row != gap:
+                costs[row * size + col] = -1
+    grid = Grid(size, size, costs, (0, 0), (size - 1, size - 1))
+
+    solution = PathFinder.find_path(
+        grid, Search.BITBOARD_BREADTH_FIRST_SEARCH, trace=TraceLevel.COUNTS)
+    expected = PathFinder.find_path(
+        grid, Search.BREADTH_FIRST_SEARCH, trace=TraceLevel.COUNTS)
+    assert solution.path_cost == expected.path_cost
+    assert solution.explored_length <= expected.explored_length
+
+
+def test_bucketed_dijkstra_matches_dijkstra():
+    for rows in (OPEN, WALLED, WEIGHTED, BLOCKED):
+        grid = make_grid(rows)
+        expected = PathFinder.find_path(grid, Search.DIJKSTRAS_SEARCH)
+
+        for delta in (1, 3):
+            solution = PathFinder.find_path(
+                grid, Search.BUCKETED_DIJKSTRAS_SEARCH, delta=delta)
+            assert bool(solution.path_length) == bool(expected.path_length)
+            assert solution.path_cost == expected.path_cost
+
+    # Without NumPy there is no distance field
+    if bucketed_dijkstras.np is None:
+        with pytest.raises(ImportError):
+            BucketedDijkstrasSearch.distance_field(grid)
+        return
+
+    grid = make_grid(WEIGHTED)
+    dist, parents = BucketedDijkstrasSearch.distance_field(grid, delta=4)
+    assert dist.shape == parents.shape == (grid.height, grid.width)
+
+    for row in range(grid.height):
+        for col in range(grid.width):
+            grid.end = (row, col)
+            solution = PathFinder.find_path(grid, Search.DIJKSTRAS_SEARCH)
+            expected = solution.path_cost if solution.path_length else -1
+            assert dist[row, col] == expected
+
+
+def test_bucketed_dijkstra_needs_numpy_outside_of_searches(monkeypatch):
+    monkeypatch.setattr(bucketed_dijkstras, "np", None)
+    grid = make_grid(WEIGHTED)
+
+    # Searches fall back to Dijkstra's, distance fields cannot
+    solution = PathFinder.find_path(grid, Search.BUCKETED_DIJKSTRAS_SEARCH)
+    assert solution.path_length
+    with pytest.raises(ImportError):
+        BucketedDijkstrasSearch.distance_field(grid)
+    with pytest.raises(ImportError):
+        BucketedDijkstrasSearch.buckets(grid, 0)
+
+
+def test_bidirectional_searches_meet_on_a_shortest_path():
+    arena = SearchArena(make_grid(OPEN).size)
+    for rows in (OPEN, WALLED, WEIGHTED, BLOCKED):
+        grid = make_grid(rows)
+        cheapest = PathFinder.find_path(grid, Search.DIJKSTRAS_SEARCH)
+        shortest = PathFinder.find_path(grid, Search.BREADTH_FIRST_SEARCH)
+
+        for search in BIDIRECTIONAL:
+            solution = PathFinder.find_path(
+                grid, search,
+                arena=arena if grid.size == arena.size else None)
+            path = list(solution.path)
+
+            if search is Search.BIDIRECTIONAL_BREADTH_FIRST_SEARCH:
+                assert solution.path_length == shortest.path_length, search
+            else:
+                assert solution.path_cost == cheapest.path_cost, search
+
+            if path:
+                assert path[0] == grid.start and path[-1] == grid.end
+                assert solution.path_cost == \
+                    sum(grid.get_cost(pos) for pos in path[1:])
+
+    partner = arena.pair()
+    assert partner is arena.pair() and partner.generation > 0
+
+
+def test_jump_point_search_finds_shortest_paths():
+    for rows in (OPEN, WALLED, BLOCKED):
+        grid = make_grid(rows)
+        expected = PathFinder.find_path(grid, Search.ASTAR_SEARCH)
+        solution = PathFinder.find_path(grid, Search.JUMP_POINT_SEARCH)
+
+        assert solution.path_cost == expected.path_cost
+        assert solution.explored_length <= expected.explored_length
+
+    # Scattered walls, runs stop at many forced neighbours
+    size = 40
+    costs = array("b", [1] * size * size)
+    for i in range(0, size * size, 7):
+        costs[i * 13 % (size * size)] = -1
+    costs[0] = 0
+    costs[-1] = 1
+    grid = Grid(size, size, costs, (0, 0), (size - 1, size - 1))
+    for goal in ((size - 1, size - 1), (17, 3), (2, 31)):
+        grid.end = goal
+        expected = PathFinder.find_path(grid, Search.ASTAR_SEARCH)
+        solution = PathFinder.find_path(grid, Search.JUMP_POINT_SEARCH)
+        assert solution.path_cost == expected.path_cost, goal
+
+    # Weighted cells fall back to A*, until they are cleared
+    grid = make_grid(WEIGHTED)
+    assert grid.weighted == 5
+    expected = PathFinder.find_path(grid, Search.ASTAR_SEARCH)
+    solution = PathFinder.find_path(grid, Search.JUMP_POINT_SEARCH)
+    assert list(solution.explored) == list(expected.explored)
+
+    for col in range(1, 5):
+        grid.set_cost((0, col), 1)
+    grid.set_cost((2, 8), 1)
+    assert grid.weighted == 0
+    solution = PathFinder.find_path(grid, Search.JUMP_POINT_SEARCH)
+    assert solution.path_cost == 11
+    assert solution.explored_length < expected.explored_length
+
+
+def test_jump_tables_are_reused_until_a_wall_changes():
+    grid = make_grid(WALLED)
+    online = PathFinder.find_path(grid, Search.JUMP_POINT_SEARCH)
+    solution = PathFinder.find_path(grid, Search.JUMP_POINT_PLUS_SEARCH)
+    assert solution.path_cost == online.path_cost == 18
+    assert list(solution.path) == list(online.path)
+
+    tables = grid.jump_tables
+    assert tables is not None
+    up, down, left, right = tables
+    assert right[grid.index((0, 0))] == -1 and down[grid.index((0, 0))] == 3
+    assert left[grid.index((3, 3))] == 2 and up[grid.index((3, 0))] == -3
+
+    # Queries for other goals and weight changes keep the tables
+    grid.end = (0, 9)
+    PathFinder.find_path(grid, Search.JUMP_POINT_PLUS_SEARCH)
+    grid.set_cost((3, 0), 1)
+    assert grid.jump_tables is tables
+
+    grid.set_cost((0, 2), 1)
+    assert grid.jump_tables is None
+    solution = PathFinder.find_path(grid, Search.JUMP_POINT_PLUS_SEARCH)
+    expected = PathFinder.find_path(grid, Search.ASTAR_SEARCH)
+    assert solution.path_cost == expected.path_cost == 9
+
+
+def test_fringe_search_finds_shortest_paths():
+    for rows in (OPEN, WALLED, WEIGHTED):
+        grid = make_grid(rows)
+        expected = PathFinder.find_path(grid, Search.ASTAR_SEARCH)
+        solution = PathFinder.find_path(grid, Search.FRINGE_SEARCH)
+
+        assert solution.path_cost == expected.path_cost, rows
+
+    # Weighted cells raise the threshold many times and reopen cells
+    size = 30
+    costs = array("b", [(i * 7919) % 9 + 1 for i in range(size * size)])
+    for i in range(0, size * size, 11):
+        costs[i * 17 % (size * size)] = -1
+    costs[0] = 0
+    costs[-1] = 1
+    grid = Grid(size, size, costs, (0, 0), (size - 1, size - 1))
+    for goal in ((size - 1, size - 1), (12, 25), (27, 4)):
+        grid.end = goal
+        expected = PathFinder.find_path(grid, Search.ASTAR_SEARCH)
+        solution = PathFinder.find_path(grid, Search.FRINGE_SEARCH)
+        assert solution.path_cost == expected.path_cost, goal
+
+
+def test_memory_bounded_searches_find_shortest_paths():
+    size = 12
+    costs = array("b", [(i * 7919) % 9 + 1 for i in range(size * size)])
+    for i in range(0, size * size, 11):
+        costs[i * 17 % (size * size)] = -1
+    costs[0] = 0
+    costs[-1] = 1
+    weighted = Grid(size, size, costs, (0, 0), (7, 10))
+
+    # Options of each search, passed on to PathFinder.find_path
+    options: dict[str, Any]
+    for grid in (make_grid(OPEN), make_grid(WALLED), make_grid(WEIGHTED),
+                 weighted):
+        expected = PathFinder.find_path(grid, Search.ASTAR_SEARCH)
+        assert expected.peak_frontier is not None
+        for search, options in (
+            (Search.ITERATIVE_DEEPENING_ASTAR_SEARCH, {}),
+            (Search.ITERATIVE_DEEPENING_ASTAR_SEARCH, {"table_size": 4}),
+            (Search.SIMPLIFIED_MEMORY_BOUNDED_ASTAR_SEARCH, {}),
+            (Search.SIMPLIFIED_MEMORY_BOUNDED_ASTAR_SEARCH,
+             {"node_limit": expected.path_length + 2}),
+            (Search.PARTIAL_EXPANSION_ASTAR_SEARCH, {}),
+            (Search.PARTIAL_EXPANSION_ASTAR_SEARCH, {"cutoff": 2}),
+        ):
+            solution = PathFinder.find_path(grid, search, **options)
+            assert solution.path_cost == expected.path_cost, (search, options)
+            assert solution.peak_frontier is not None
+            assert solution.peak_frontier <= options.get(
+                "node_limit", solution.peak_frontier), options
+
+        # Children left out of the frontier are not queued meanwhile
+        partial = PathFinder.find_path(
+            grid, Search.PARTIAL_EXPANSION_ASTAR_SEARCH)
+        assert partial.peak_frontier is not None
+        assert partial.peak_frontier <= expected.peak_frontier
+
+    # Paths with more cells than the limit are not held
+    solution = PathFinder.find_path(
+        weighted, Search.SIMPLIFIED_MEMORY_BOUNDED_ASTAR_SEARCH, node_limit=10)
+    assert not solution.path and solution.peak_frontier is not None
+    assert solution.peak_frontier <= 10
+
+    with pytest.raises(ValueError):
+        PathFinder.find_path(
+            weighted, Search.SIMPLIFIED_MEMORY_BOUNDED_ASTAR_SEARCH,
+            node_limit=1)
+
+
+def test_unreachable_goal():
+    for search in Search:
+        solution = PathFinder.find_path(make_grid(BLOCKED), search)
+        assert solution.path_length == 0, search
+
+        # Searches from both ends stop once either tree runs out of cells
+        if search in BIDIRECTIONAL:
+            assert solution.explored_length < 4 + 9, search
+        elif search in JUMP_POINT:
+            assert solution.explored_length <= 4, search
+        elif search in MEMORY_BOUNDED:
+            assert len(set(solution.explored)) == 4, search
+        else:
+            assert solution.explored_length == 4, search
+
+
+def test_no_solution_repr_at_every_trace_level():
+    grid = make_grid(BLOCKED)
+    for search in (Search.ASTAR_SEARCH, Search.JUMP_POINT_SEARCH):
+        for trace in TraceLevel:
+            solution = PathFinder.find_path(grid, search, trace=trace)
+            text = repr(solution)
+
+            assert text.startswith("NoSolution([], {"), (search, trace)
+            assert f", {solution.explored_length}, " in text, (search, trace)
+            if trace is TraceLevel.FULL:
+                assert str(grid.start) in text, search
+            else:
+                assert str(grid.start) not in text, search